@@ -5,13 +5,15 @@ import sys
 import time
 from argparse import ArgumentParser, ArgumentTypeError, Namespace, BooleanOptionalAction
 from pathlib import Path
-from typing import Any, Union, Dict, Tuple, Sequence
+from typing import Any, Union, Dict, Tuple, Sequence, Optional, List
 
-from git import Repo, Commit
+from git import Repo, Commit, Blob
 
 from credsweeper import __version__
 from credsweeper.app import APP_PATH, CredSweeper
 from credsweeper.common.constants import ThresholdPreset, Severity, RuleType, DiffRowType, ML_HUNK
+from credsweeper.credentials.candidate import Candidate
+from credsweeper.credentials.candidates_cache import CandidatesCache
 from credsweeper.file_handler.abstract_provider import AbstractProvider
 from credsweeper.file_handler.byte_content_provider import ByteContentProvider
 from credsweeper.file_handler.files_provider import FilesProvider
@@ -126,6 +128,11 @@ def get_arguments() -> Namespace:
                         help="scan git repo from the ref, otherwise - all branches were scanned (slow)",
                         dest="ref",
                         type=str)
+    parser.add_argument("--blob_cache",
+                        help="file to keep scan results of git blobs between runs of --git scan. "
+                        "The file must be owned by current user and must not be writable by others",
+                        dest="blob_cache",
+                        metavar="PATH")
     parser.add_argument("--rules",
                         help="path of rule config file (default: credsweeper/rules/config.yaml). "
                         f"severity:{[i.value for i in Severity]} "
@@ -179,10 +186,10 @@ def get_arguments() -> Namespace:
                         metavar="FLOAT_OR_STR")
     parser.add_argument("--ml_batch_size",
                         "-b",
-                        help="batch size for model inference (default: 16)",
+                        help="batch size for model inference (default: selected by number of candidates)",
                         type=positive_int,
                         dest="ml_batch_size",
-                        default=16,
+                        default=None,
                         required=False,
                         metavar="POSITIVE_INT")
     parser.add_argument("--ml_config",
@@ -206,6 +213,20 @@ def get_arguments() -> Namespace:
                         dest="ml_providers",
                         required=False,
                         metavar="STR")
+    parser.add_argument("--ml_cache",
+                        help="database file to reuse ML probabilities of known candidates between runs",
+                        type=str,
+                        default=None,
+                        dest="ml_cache",
+                        required=False,
+                        metavar="PATH")
+    parser.add_argument("--ml_threads",
+                        help="number of threads for ml inference in main process (default: all cores)",
+                        type=positive_int,
+                        default=None,
+                        dest="ml_threads",
+                        required=False,
+                        metavar="POSITIVE_INT")
     parser.add_argument("--jobs",
                         "-j",
                         help="number of parallel processes to use (default: 1)",
@@ -217,6 +238,19 @@ def get_arguments() -> Namespace:
                         help="clear objects after scan to reduce memory consumption",
                         action=BooleanOptionalAction,
                         default=True)
+    parser.add_argument("--incremental",
+                        help="index file to rescan only new or changed files and reuse results for others. "
+                        "The file must be owned by current user and must not be writable by others",
+                        dest="incremental",
+                        metavar="PATH")
+    parser.add_argument("--filter_profile",
+                        help="file to save statistics and order of rule filters collected in single process scan",
+                        dest="filter_profile",
+                        metavar="PATH")
+    parser.add_argument("--filter_order",
+                        help="apply order of rule filters from the file saved with --filter_profile",
+                        dest="filter_order",
+                        metavar="PATH")
     parser.add_argument("--skip_ignored",
                         help="parse .gitignore files and skip credentials from ignored objects",
                         dest="skip_ignored",
@@ -298,6 +332,8 @@ def get_credsweeper(args: Namespace) -> CredSweeper:
                        ml_config=args.ml_config,
                        ml_model=args.ml_model,
                        ml_providers=args.ml_providers,
+                       ml_cache=args.ml_cache,
+                       ml_threads=args.ml_threads,
                        find_by_ext=args.find_by_ext,
                        depth=args.depth,
                        doc=args.doc,
@@ -306,7 +342,10 @@ def get_credsweeper(args: Namespace) -> CredSweeper:
                        exclude_lines=denylist,
                        exclude_values=denylist,
                        thrifty=args.thrifty,
-                       log_level=args.log)
+                       log_level=args.log,
+                       incremental=args.incremental,
+                       filter_profile=args.filter_profile,
+                       filter_order=args.filter_order)
 
 
 def scan(args: Namespace, content_provider: AbstractProvider) -> int:
@@ -332,22 +371,59 @@ def scan(args: Namespace, content_provider: AbstractProvider) -> int:
     return -1
 
 
-def get_commit_providers(commit: Commit, repo: Repo) -> Sequence[ByteContentProvider]:
-    """Process a commit and for providers"""
+def get_commit_blobs(commit: Commit, repo: Repo) -> Dict[str, Blob]:
+    """Process a commit and collect changed blobs by path"""
     result = {}
     ancestors = commit.parents or [repo.tree()]
     for parent in ancestors:
         for diff in parent.diff(commit):
             # only result files
             blob_b = diff.b_blob
-            if blob_b and blob_b.path not in result:
-                try:
-                    result[blob_b.path] = ByteContentProvider(content=blob_b.data_stream.read(),
-                                                              file_path=str(blob_b.path),
-                                                              info=DiffRowType.ADDED.value)
-                except Exception as exc:
-                    logger.warning(f"A submodule was not properly initialized or commit was removed: {exc}")
-    return list(result.values())
+            if blob_b and str(blob_b.path) not in result:
+                result[str(blob_b.path)] = blob_b
+    return result
+
+
+def get_blob_provider(blob: Blob) -> Optional[ByteContentProvider]:
+    """Reads data of the blob for provider"""
+    try:
+        return ByteContentProvider(content=blob.data_stream.read(),
+                                   file_path=str(blob.path),
+                                   info=DiffRowType.ADDED.value)
+    except Exception as exc:
+        logger.warning(f"A submodule was not properly initialized or commit was removed: {exc}")
+    return None
+
+
+def get_commit_providers(commit: Commit, repo: Repo) -> Sequence[ByteContentProvider]:
+    """Process a commit and for providers"""
+    result = []
+    for blob in get_commit_blobs(commit, repo).values():
+        if provider := get_blob_provider(blob):
+            result.append(provider)
+    return result
+
+
+def scan_commit_blobs(credsweeper: CredSweeper, blobs: Dict[str, Blob], blob_cache: CandidatesCache) -> None:
+    """Scans blobs which are not in the cache and replays candidates of known blobs.
+    The same blob may appear in many commits due cherry-picks, reverts and merges"""
+    # the path is a part of the key because file extension affects the scan
+    blobs_keys = {path: f"{blob.hexsha}:{path}" for path, blob in blobs.items()}
+    cached_keys = [x for x in blobs_keys.values() if x in blob_cache]
+    providers = []
+    for path, blob in blobs.items():
+        if blobs_keys[path] not in blob_cache and (provider := get_blob_provider(blob)):
+            providers.append(provider)
+    if providers:
+        credsweeper.scan(providers)
+        candidates_by_path: Dict[str, List[Candidate]] = {}
+        for candidate in credsweeper.credential_manager.get_credentials():
+            candidates_by_path.setdefault(candidate.line_data_list[0].path, []).append(candidate)
+        for provider in providers:
+            blob_cache.put(blobs_keys[provider.file_path], candidates_by_path.get(provider.file_path, []))
+    for blob_key in cached_keys:
+        if candidates := blob_cache.get(blob_key):
+            credsweeper.add_candidates(candidates)
 
 
 def drill(args: Namespace) -> Tuple[int, int]:
@@ -371,48 +447,54 @@ def drill(args: Namespace) -> Tuple[int, int]:
         logger.info(f"Git repository {args.git} with commits: {commits_sha1}")
         # then - credsweeper
         credsweeper = get_credsweeper(args)
-        # use flat iterations to avoid recursive limits
-        to_scan = list(commits_sha1)
-        # local speedup for already scanned commits - avoid file system interactive
-        scanned = set()
-        while to_scan:
-            commit_sha1 = to_scan.pop()
-            if commit_sha1 in scanned:
-                # the commit was scanned in this launch
-                continue
-            commit = repo.commit(commit_sha1)
-            if commit.parents:
-                # add parents anyway
-                to_scan.extend(x.hexsha for x in commit.parents)
-            # check whether the commit has been checked and the report is present
-            skip_already_scanned = False
-            if args.json_filename:
-                json_path = Path(args.json_filename)
-                json_path = json_path.with_suffix(f".{commit_sha1}{json_path.suffix}")
-                if json_path.exists():
-                    skip_already_scanned = True
-                else:
-                    credsweeper.json_filename = json_path
-            if args.xlsx_filename:
-                xlsx_path = Path(args.xlsx_filename)
-                xlsx_path = xlsx_path.with_suffix(f".{commit_sha1}{xlsx_path.suffix}")
-                if xlsx_path.exists():
-                    skip_already_scanned = True
-                else:
-                    credsweeper.xlsx_filename = xlsx_path
-            if skip_already_scanned:
-                logger.info("Skip already scanned commit: %s", commit_sha1)
-                continue
-            logger.info("Scan commit: %s", commit_sha1)
-            # prepare all files to scan in the commit with bytes->IO transformation to avoid a multiprocess issue
-            if providers := get_commit_providers(commit, repo):
-                credsweeper.credential_manager.candidates.clear()
-                credsweeper.scan(providers)
-                credsweeper.post_processing()
-                credsweeper.export_results()
-                total_credentials += credsweeper.credential_manager.len_credentials()
-            total_commits += 1
-            scanned.add(commit_sha1)
+        blob_cache = CandidatesCache(credsweeper.checksum)
+        if args.blob_cache:
+            blob_cache.load(args.blob_cache)
+        # the processes are started once for all commits
+        with credsweeper.persistent_pool():
+            # use flat iterations to avoid recursive limits
+            to_scan = list(commits_sha1)
+            # local speedup for already scanned commits - avoid file system interactive
+            scanned = set()
+            while to_scan:
+                commit_sha1 = to_scan.pop()
+                if commit_sha1 in scanned:
+                    # the commit was scanned in this launch
+                    continue
+                commit = repo.commit(commit_sha1)
+                if commit.parents:
+                    # add parents anyway
+                    to_scan.extend(x.hexsha for x in commit.parents)
+                # check whether the commit has been checked and the report is present
+                skip_already_scanned = False
+                if args.json_filename:
+                    json_path = Path(args.json_filename)
+                    json_path = json_path.with_suffix(f".{commit_sha1}{json_path.suffix}")
+                    if json_path.exists():
+                        skip_already_scanned = True
+                    else:
+                        credsweeper.json_filename = json_path
+                if args.xlsx_filename:
+                    xlsx_path = Path(args.xlsx_filename)
+                    xlsx_path = xlsx_path.with_suffix(f".{commit_sha1}{xlsx_path.suffix}")
+                    if xlsx_path.exists():
+                        skip_already_scanned = True
+                    else:
+                        credsweeper.xlsx_filename = xlsx_path
+                if skip_already_scanned:
+                    logger.info("Skip already scanned commit: %s", commit_sha1)
+                    continue
+                logger.info("Scan commit: %s", commit_sha1)
+                if blobs := get_commit_blobs(commit, repo):
+                    credsweeper.credential_manager.clear_credentials()
+                    scan_commit_blobs(credsweeper, blobs, blob_cache)
+                    credsweeper.post_processing()
+                    credsweeper.export_results()
+                    total_credentials += credsweeper.credential_manager.len_credentials()
+                total_commits += 1
+                scanned.add(commit_sha1)
+        if args.blob_cache:
+            blob_cache.save(args.blob_cache)
     except Exception as exc:
         logger.critical(exc, exc_info=True)
         return -1, total_commits
@@ -1,26 +1,40 @@
+import contextlib
+import functools
+import hashlib
+import itertools
 import json
 import logging
+import math
 import multiprocessing
+import multiprocessing.pool
+import os
 import signal
+import time
 from pathlib import Path
-from typing import Any, List, Optional, Union, Dict, Sequence, Tuple
+from typing import Any, List, Optional, Union, Dict, Sequence, Tuple, TextIO, Generator, Iterable, Iterator, Sized
 
+import numpy as np
 import pandas as pd
 from colorama import Style
 
 # Directory of credsweeper sources MUST be placed before imports to avoid circular import error
 APP_PATH = Path(__file__).resolve().parent
 
+from credsweeper.scanner.filter_profile import FilterProfile
 from credsweeper.scanner.scanner import Scanner
-from credsweeper.common.constants import Severity, ThresholdPreset, DiffRowType, DEFAULT_ENCODING
+from credsweeper.common.constants import Severity, ThresholdPreset, DiffRowType, DEFAULT_ENCODING, \
+    SCAN_BATCHES_PER_JOB, MAX_SCAN_BATCH_LEN, MIN_ML_GROUPS_PER_JOB
 from credsweeper.config.config import Config
 from credsweeper.credentials.candidate import Candidate
 from credsweeper.credentials.candidate_key import CandidateKey
+from credsweeper.credentials.candidates_index import CandidatesIndex
 from credsweeper.credentials.credential_manager import CredentialManager
 from credsweeper.deep_scanner.deep_scanner import DeepScanner
 from credsweeper.file_handler.content_provider import ContentProvider
 from credsweeper.file_handler.file_path_extractor import FilePathExtractor
 from credsweeper.file_handler.abstract_provider import AbstractProvider
+from credsweeper.file_handler.text_content_provider import TextContentProvider
+from credsweeper.ml_model.ml_cache import MlCache
 from credsweeper.ml_model.ml_validator import MlValidator
 from credsweeper.utils.util import Util
 
@@ -39,6 +53,9 @@ class CredSweeper:
 
     """
 
+    # the instance is set in a pool process by the initializer to avoid pickling for each batch
+    __pool_credsweeper: Optional["CredSweeper"] = None
+
     def __init__(self,
                  rule_path: Union[None, str, Path] = None,
                  config_path: Optional[str] = None,
@@ -56,6 +73,8 @@ class CredSweeper:
                  ml_config: Union[None, str, Path] = None,
                  ml_model: Union[None, str, Path] = None,
                  ml_providers: Optional[str] = None,
+                 ml_cache: Union[None, str, Path] = None,
+                 ml_threads: Optional[int] = None,
                  find_by_ext: bool = False,
                  depth: int = 0,
                  doc: bool = False,
@@ -64,7 +83,10 @@ class CredSweeper:
                  exclude_lines: Optional[List[str]] = None,
                  exclude_values: Optional[List[str]] = None,
                  thrifty: bool = False,
-                 log_level: Optional[str] = None) -> None:
+                 log_level: Optional[str] = None,
+                 incremental: Union[None, str, Path] = None,
+                 filter_profile: Union[None, str, Path] = None,
+                 filter_order: Union[None, str, Path] = None) -> None:
         """Initialize Advanced credential scanner.
 
         Args:
@@ -80,11 +102,13 @@ class CredSweeper:
             subtext: use subtext of line near variable-value like it performed in ML
             use_filters: boolean variable, specifying the need of rule filters
             pool_count: int value, number of parallel processes to use
-            ml_batch_size: int value, size of the batch for model inference
+            ml_batch_size: int value, size of the batch for model inference. Selected by number of candidates for None
             ml_threshold: float or string value to specify threshold for the ml model
             ml_config: str or Path to set custom config of ml model
             ml_model: str or Path to set custom ml model
             ml_providers: str - comma separated list with providers
+            ml_cache: optional path to database file to reuse ML probabilities of known candidates between runs
+            ml_threads: optional number of threads for ML inference in main process
             find_by_ext: boolean - files will be reported by extension
             depth: int - how deep container files will be scanned
             doc: boolean - document-specific scanning
@@ -94,6 +118,9 @@ class CredSweeper:
             exclude_values: values to omit in scan. Will be added to the values already in config
             thrifty: free provider resources after scan to reduce memory consumption
             log_level: str - level for pool initializer according logging levels (UPPERCASE)
+            incremental: optional path to index file to scan only new or changed files in run
+            filter_profile: optional path to save statistics and order of rule filters after run
+            filter_order: optional path of saved profile to apply order of rule filters
 
         """
         self.pool_count: int = max(1, int(pool_count))
@@ -111,6 +138,17 @@ class CredSweeper:
                                             exclude_values=exclude_values)
         self.config = Config(config_dict)
         self.scanner = Scanner(self.config, rule_path)
+        if filter_order:
+            FilterProfile.freeze(self.scanner, filter_order)
+        self.filter_profile = filter_profile
+        self.__filter_profile: Optional[FilterProfile] = None
+        if filter_profile:
+            self.__filter_profile = FilterProfile()
+            self.__filter_profile.instrument(self.scanner)
+            if 1 < self.pool_count:
+                logger.warning("Filters are profiled in single process scan")
+                self.pool_count = 1
+        self.__checksum = self._get_checksum(config_dict, rule_path)
         self.deep_scanner = DeepScanner(self.config, self.scanner)
         self.credential_manager = CredentialManager()
         self.json_filename: Union[None, str, Path] = json_filename
@@ -120,14 +158,36 @@ class CredSweeper:
         self.hashed = hashed
         self.subtext = subtext
         self.sort_output = sort_output
-        self.ml_batch_size = ml_batch_size if ml_batch_size and 0 < ml_batch_size else 16
+        self.ml_batch_size = ml_batch_size if ml_batch_size and 0 < ml_batch_size else None
         self.ml_threshold = ml_threshold
         self.ml_config = ml_config
         self.ml_model = ml_model
         self.ml_providers = ml_providers
+        self.ml_cache = ml_cache
+        self.ml_threads = ml_threads
         self.__thrifty = thrifty
         self.__log_level = log_level
+        self.incremental = incremental
         self.__ml_validator: Optional[MlValidator] = None
+        # JSON report which is written during scan
+        self.__json_stream: Optional[TextIO] = None
+        self.__json_stream_items = 0
+        # processes which are kept for several scans
+        self.__pool: Optional[multiprocessing.pool.Pool] = None
+        # number of the current scan to keep candidates of byte-identical members within the scan in each process
+        self.__scan_run = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # TypeError: cannot pickle '_io.TextIOWrapper' object - the report is written in main process only
+        # NotImplementedError: pool objects cannot be passed between processes or pickled
+        # ML validator keeps data of the model and is created again in other process when it is required
+        # candidates are collected in main process only - pool processes return results of batches and shards
+        state = self.__dict__.copy()
+        state["_CredSweeper__json_stream"] = None
+        state["_CredSweeper__pool"] = None
+        state["_CredSweeper__ml_validator"] = None
+        state["credential_manager"] = None
+        return state
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
@@ -168,6 +228,22 @@ class CredSweeper:
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    @staticmethod
+    def _get_checksum(config_dict: Dict[str, Any], rule_path: Union[None, str, Path]) -> str:
+        # the package imports the module, so the version is available only at runtime
+        from credsweeper import __version__
+        checksum = hashlib.md5(__version__.encode())
+        checksum.update(json.dumps(config_dict, sort_keys=True, default=str).encode())
+        checksum.update(Path(rule_path or APP_PATH / "rules" / "config.yaml").read_bytes())
+        return checksum.hexdigest()
+
+    @property
+    def checksum(self) -> str:
+        """md5 of version, config and rules which define results of scan before ML validation"""
+        return self.__checksum
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
     def _use_ml_validation(self) -> bool:
         if isinstance(self.ml_threshold, (float, int)) and 0 >= self.ml_threshold:
             logger.info("ML validation is disabled")
@@ -193,6 +269,7 @@ class CredSweeper:
                 ml_config=self.ml_config,  #
                 ml_model=self.ml_model,  #
                 ml_providers=self.ml_providers,  #
+                ml_threads=self.ml_threads,  #
             )
         if not self.__ml_validator:
             raise RuntimeError("MlValidator was not initialized!")
@@ -201,10 +278,81 @@ class CredSweeper:
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
     @staticmethod
-    def pool_initializer(log_kwargs) -> None:
-        """Ignore SIGINT in child processes."""
+    def pool_initializer(log_kwargs, credsweeper: Optional["CredSweeper"] = None) -> None:
+        """Ignore SIGINT in child processes. Keeps the instance for scan of batches."""
         logging.basicConfig(**log_kwargs)
         signal.signal(signal.SIGINT, signal.SIG_IGN)
+        if credsweeper is not None:
+            # each process of the pool is a job, so ML inference uses one thread to avoid oversubscription
+            credsweeper.ml_threads = 1
+        CredSweeper.__pool_credsweeper = credsweeper
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    @staticmethod
+    def pool_batch_scan(scan_run: int,
+                        content_providers: Sequence[ContentProvider]) -> Tuple[List[Candidate], str, float]:
+        """Scans a batch in a pool process with the instance from initializer.
+
+        Args:
+            scan_run: number of the scan in the main process, the process of persistent pool may serve several scans
+            content_providers: batch of providers to scan
+
+        Return:
+            candidates, name of the process and elapsed time for the batch
+
+        """
+        if CredSweeper.__pool_credsweeper is None:
+            raise RuntimeError("Pool process was not initialized with CredSweeper instance")
+        start_time = time.perf_counter()
+        CredSweeper.__pool_credsweeper.deep_scanner.digest_cache.start_run(scan_run)
+        candidates = CredSweeper.__pool_credsweeper.files_scan(content_providers)
+        return candidates, multiprocessing.current_process().name, time.perf_counter() - start_time
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    @staticmethod
+    def pool_ml_predict(groups: List[List[Candidate]], batch_size: Optional[int]) -> np.ndarray:
+        """Evaluates ML probabilities for a shard of groups in a pool process with the instance from initializer"""
+        if CredSweeper.__pool_credsweeper is None:
+            raise RuntimeError("Pool process was not initialized with CredSweeper instance")
+        return CredSweeper.__pool_credsweeper.ml_validator.predict(groups, batch_size)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    @staticmethod
+    def get_scan_batches(content_providers: Sequence[ContentProvider], pool_count: int) -> List[List[ContentProvider]]:
+        """Splits providers into batches of similar total size for parallel scan.
+
+        The largest providers are placed in first batches, so the tail of the scan consists of small batches.
+        Idle processes take next batch from the shared queue of the pool, so the load is balanced dynamically.
+
+        Args:
+            content_providers: providers to scan
+            pool_count: number of processes
+
+        Return:
+            list of batches in order of processing
+
+        """
+        batches_count = pool_count * SCAN_BATCHES_PER_JOB
+        sized_providers = sorted(((x.data_size, x) for x in content_providers), key=lambda x: x[0], reverse=True)
+        total_size = sum(x[0] for x in sized_providers)
+        batch_size_limit = max(1, math.ceil(total_size / batches_count))
+        batch_len_limit = min(MAX_SCAN_BATCH_LEN, max(1, math.ceil(len(sized_providers) / batches_count)))
+        batches: List[List[ContentProvider]] = []
+        batch: List[ContentProvider] = []
+        batch_size = 0
+        for size, provider in sized_providers:
+            batch.append(provider)
+            batch_size += size
+            if batch_size_limit <= batch_size or batch_len_limit <= len(batch):
+                batches.append(batch)
+                batch = []
+                batch_size = 0
+        if batch:
+            batches.append(batch)
+        return batches
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
@@ -216,43 +364,133 @@ class CredSweeper:
 
         """
         _empty_list: Sequence[ContentProvider] = []
-        file_extractors = content_provider.get_scannable_files(self.config) if content_provider else _empty_list
-        if not file_extractors:
+        providers: Iterator[ContentProvider] = content_provider.yield_scannable_files(self.config) \
+            if content_provider else iter(_empty_list)
+        # scan starts as soon as providers are found, the first one is taken to skip empty report
+        first_provider = next(providers, None)
+        if first_provider is None:
             logger.info(f"No scannable targets for {len(content_provider.paths)} paths")
             return 0
-        self.scan(file_extractors)
-        self.post_processing()
+        file_extractors = itertools.chain([first_provider], providers)
         # PatchesProvider has the attribute. Circular import error appears with using the isinstance
         change_type = content_provider.change_type if hasattr(content_provider, "change_type") else None
-        self.export_results(change_type)
+        with self.__json_report_stream(change_type):
+            if self.incremental:
+                self.__incremental_scan(list(file_extractors))
+            else:
+                self.scan(file_extractors)
+            self.post_processing()
+            self.export_results(change_type)
+        if self.__filter_profile is not None:
+            # statistics of all runs are saved after each run
+            self.__filter_profile.save(str(self.filter_profile))
         return self.credential_manager.len_credentials()
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
-    def scan(self, content_providers: Sequence[ContentProvider]) -> None:
+    def __is_json_streamable(self) -> bool:
+        """Candidates may be written to JSON report during scan when ML validation and sorting do not change them"""
+        return bool(self.json_filename) and not self.sort_output \
+            and isinstance(self.ml_threshold, (float, int)) and 0 >= self.ml_threshold
+
+    @contextlib.contextmanager
+    def __json_report_stream(self, change_type: Optional[DiffRowType]) -> Generator[None, None, None]:
+        """Opens JSON report to write candidates as soon as they are received from scan"""
+        if not self.__is_json_streamable():
+            yield
+            return
+        with open(self._get_json_path(change_type), 'w', encoding=DEFAULT_ENCODING) as f:
+            f.write('[\n')
+            self.__json_stream = f
+            self.__json_stream_items = 0
+            try:
+                yield
+            finally:
+                self.__json_stream = None
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def scan(self, content_providers: Iterable[ContentProvider]) -> None:
         """Run scanning of files from an argument "content_providers".
 
         Args:
-            content_providers: file objects to scan
+            content_providers: file objects to scan. Single job scan starts before all objects are received
 
         """
-        if 1 < self.pool_count and 1 < len(content_providers):
-            self.__multi_jobs_scan(content_providers)
-        else:
-            self.__single_job_scan(content_providers)
+        # candidates of byte-identical members are replayed within a scan only
+        self.__scan_run += 1
+        self.deep_scanner.digest_cache.start_run(self.__scan_run)
+        if 1 < self.pool_count:
+            # providers are balanced by size between processes, so all of them are received before scan
+            providers = content_providers if isinstance(content_providers, Sequence) else list(content_providers)
+            if self.config.depth:
+                providers = self.__fan_out(providers)
+            if 1 < len(providers):
+                self.__multi_jobs_scan(providers)
+                return
+            content_providers = providers
+        self.__single_job_scan(content_providers)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def __fan_out(self, content_providers: Sequence[ContentProvider]) -> Sequence[ContentProvider]:
+        """Replaces huge archive files with parts of their members, so the members are scanned in parallel"""
+        parts = self.pool_count * SCAN_BATCHES_PER_JOB
+        providers: List[ContentProvider] = []
+        for provider in content_providers:
+            member_providers = self.deep_scanner.get_member_providers(provider, self.config.depth, parts)
+            if member_providers:
+                providers.extend(member_providers)
+            else:
+                providers.append(provider)
+        return providers
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def __incremental_scan(self, content_providers: Sequence[ContentProvider]) -> None:
+        """Scans only new or changed files and replays stored candidates for others"""
+        # ML validation is performed for replayed candidates too, so ML model does not affect the index
+        with contextlib.closing(CandidatesIndex(str(self.incremental), self.checksum)) as index:
+            providers: List[ContentProvider] = []
+            indexed_providers: List[Tuple[ContentProvider, os.stat_result]] = []
+            replayed_candidates: List[Candidate] = []
+            for provider in content_providers:
+                if isinstance(provider, TextContentProvider) and provider.is_file \
+                        and (stat := index.get_stat(provider.file_path)):
+                    candidates = index.get_candidates(provider.file_path, stat)
+                    if candidates is not None:
+                        replayed_candidates.extend(candidates)
+                        continue
+                    indexed_providers.append((provider, stat))
+                providers.append(provider)
+            logger.info(f"Incremental scan: {len(content_providers) - len(providers)} providers are unchanged")
+            if providers:
+                self.scan(providers)
+            else:
+                self.credential_manager.set_credentials([])
+            candidates_by_path: Dict[str, List[Candidate]] = {}
+            for candidate in self.credential_manager.get_credentials():
+                candidates_by_path.setdefault(candidate.line_data_list[0].path, []).append(candidate)
+            for provider, stat in indexed_providers:
+                index.put_candidates(provider.file_path, stat, candidates_by_path.get(provider.file_path, []))
+            self.add_candidates(replayed_candidates)
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
-    def __single_job_scan(self, content_providers: Sequence[ContentProvider]) -> None:
+    def __single_job_scan(self, content_providers: Iterable[ContentProvider]) -> None:
         """Performs scan in main thread"""
-        logger.info(f"Scan for {len(content_providers)} providers")
+        if isinstance(content_providers, Sized):
+            logger.info(f"Scan for {len(content_providers)} providers")
+        else:
+            logger.info("Scan for providers as soon as they are found")
         all_cred = self.files_scan(content_providers)
-        self.credential_manager.set_credentials(all_cred)
+        self.credential_manager.set_credentials([])
+        self.add_candidates(all_cred)
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
-    def __multi_jobs_scan(self, content_providers: Sequence[ContentProvider]) -> None:
-        """Performs scan with multiple jobs"""
+    def __create_pool(self, pool_count: int) -> multiprocessing.pool.Pool:
+        """Creates pool of processes with the state of the instance"""
         # use this separation to satisfy YAPF formatter
         yapfix = "%(asctime)s | %(levelname)s | %(processName)s:%(threadName)s | %(filename)s:%(lineno)s | %(message)s"
         log_kwargs = {"format": yapfix}
@@ -261,16 +499,47 @@ class CredSweeper:
             if "SILENCE" == self.__log_level:
                 logging.addLevelName(60, "SILENCE")
             log_kwargs["level"] = self.__log_level
+        return multiprocessing.get_context("spawn").Pool(processes=pool_count,
+                                                         initializer=CredSweeper.pool_initializer,
+                                                         initargs=(log_kwargs, self))  # yapf: disable
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    @contextlib.contextmanager
+    def persistent_pool(self) -> Generator[None, None, None]:
+        """Keeps the processes for all scans in the context to avoid startup of a pool for each scan.
+
+        The processes receive the instance once at start, so config and rules must not be changed in the context.
+        Outputs like json_filename may be changed because they are used only in the main process.
+
+        """
+        if 1 >= self.pool_count or self.__pool is not None:
+            yield
+            return
+        logger.info(f"Start {self.pool_count} processes")
+        with self.__create_pool(self.pool_count) as pool:
+            self.__pool = pool
+            try:
+                yield
+            finally:
+                self.__pool = None
+            pool.close()
+            pool.join()
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def __multi_jobs_scan(self, content_providers: Sequence[ContentProvider]) -> None:
+        """Performs scan with multiple jobs"""
+        if self.__pool is not None:
+            logger.info(f"Scan in {self.pool_count} processes for {len(content_providers)} providers")
+            # termination of the pool on KeyboardInterrupt is performed with exit from persistent_pool
+            self.__pool_scan(self.__pool, self.pool_count, content_providers)
+            return
         pool_count = min(self.pool_count, len(content_providers))
         logger.info(f"Scan in {pool_count} processes for {len(content_providers)} providers")
-        with multiprocessing.get_context("spawn").Pool(processes=pool_count,
-                                                       initializer=CredSweeper.pool_initializer,
-                                                       initargs=(log_kwargs,)) as pool:  # yapf: disable
+        with self.__create_pool(pool_count) as pool:
             try:
-                for scan_results in pool.imap_unordered(self.files_scan,
-                                                        (content_providers[x::pool_count] for x in range(pool_count))):
-                    for cred in scan_results:
-                        self.credential_manager.add_credential(cred)
+                self.__pool_scan(pool, pool_count, content_providers)
             except KeyboardInterrupt:
                 pool.terminate()
                 pool.join()
@@ -280,15 +549,49 @@ class CredSweeper:
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
-    def files_scan(self, content_providers: Sequence[ContentProvider]) -> List[Candidate]:
+    def __pool_scan(self, pool: multiprocessing.pool.Pool, pool_count: int,
+                    content_providers: Sequence[ContentProvider]) -> None:
+        """Scans batches of providers in the pool and logs utilization of the processes"""
+        batches = self.get_scan_batches(content_providers, pool_count)
+        logger.debug(f"Providers were split into {len(batches)} batches")
+        # process name -> number of batches and busy time
+        utilization: Dict[str, Tuple[int, float]] = {}
+        start_time = time.perf_counter()
+        batch_scan = functools.partial(CredSweeper.pool_batch_scan, self.__scan_run)
+        for scan_results, process_name, elapsed in pool.imap_unordered(batch_scan, batches):
+            self.add_candidates(scan_results)
+            batches_done, busy_time = utilization.get(process_name, (0, 0.0))
+            utilization[process_name] = (1 + batches_done, busy_time + elapsed)
+        total_time = time.perf_counter() - start_time
+        for process_name, (batches_done, busy_time) in sorted(utilization.items()):
+            logger.debug(f"{process_name}: {batches_done} batches, busy {busy_time:.3f}s"
+                         f" of {total_time:.3f}s ({100 * busy_time / total_time if total_time else 0:.1f}%)")
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def add_candidates(self, candidates: List[Candidate]) -> None:
+        """Adds candidates from a scan step to the credential manager without duplicates.
+        New candidates are written to JSON report immediately if the report is streamed"""
+        for candidate in candidates:
+            if self.credential_manager.add_credential(candidate) and self.__json_stream is not None:
+                if self.__json_stream_items:
+                    self.__json_stream.write(",\n")
+                self.__json_stream.write(self.__json_item(candidate))
+                self.__json_stream_items += 1
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def files_scan(self, content_providers: Iterable[ContentProvider]) -> List[Candidate]:
         """Auxiliary method for scan one sequence"""
         all_cred: List[Candidate] = []
+        providers_count = 0
         for provider in content_providers:
             candidates = self.file_scan(provider)
             if self.__thrifty:
                 provider.free()
             all_cred.extend(candidates)
-        logger.info(f"Completed: processed {len(content_providers)} providers with {len(all_cred)} candidates")
+            providers_count += 1
+        logger.info(f"Completed: processed {providers_count} providers with {len(all_cred)} candidates")
         return all_cred
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
@@ -327,6 +630,32 @@ class CredSweeper:
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    def __parallel_predict(self, groups: List[List[Candidate]], batch_size: Optional[int]) -> np.ndarray:
+        """Evaluates ML probabilities in processes of the pool. Few groups are evaluated in main process"""
+        pool_count = min(self.pool_count, len(groups) // MIN_ML_GROUPS_PER_JOB)
+        if 1 >= pool_count:
+            return self.ml_validator.predict(groups, batch_size)
+        if not batch_size:
+            batch_size = self.ml_validator.get_batch_size(len(groups))
+        # shards consist of whole batches to get the same batches and results as in main process
+        shard_size = batch_size * math.ceil(len(groups) / (batch_size * pool_count))
+        shards = [(groups[i:i + shard_size], batch_size) for i in range(0, len(groups), shard_size)]
+        logger.info(f"Run ML Validation in {pool_count} processes for {len(groups)} groups")
+        probability: np.ndarray
+        if self.__pool is not None:
+            probability = np.concatenate(self.__pool.starmap(CredSweeper.pool_ml_predict, shards))
+            return probability
+        with self.__create_pool(pool_count) as pool:
+            try:
+                probability = np.concatenate(pool.starmap(CredSweeper.pool_ml_predict, shards))
+            except KeyboardInterrupt:
+                pool.terminate()
+                pool.join()
+                raise
+            pool.close()
+            pool.join()
+        return probability
+
     def post_processing(self) -> None:
         """Machine learning validation for received credential candidates."""
         if purged := self.credential_manager.purge_duplicates():
@@ -349,7 +678,14 @@ class CredSweeper:
             # prevent extra ml_validator creation if ml_cred_groups is empty
             if ml_cred_groups:
                 logger.info(f"Run ML Validation for {len(ml_cred_groups)} groups")
-                is_cred, probability = self.ml_validator.validate_groups(ml_cred_groups, self.ml_batch_size)
+                predictor = self.__parallel_predict if 1 < self.pool_count else None
+                if self.ml_cache:
+                    with contextlib.closing(MlCache(str(self.ml_cache), self.ml_validator.checksum)) as ml_cache:
+                        is_cred, probability = self.ml_validator.validate_groups(ml_cred_groups, self.ml_batch_size,
+                                                                                 ml_cache, predictor)
+                else:
+                    is_cred, probability = self.ml_validator.validate_groups(ml_cred_groups, self.ml_batch_size, None,
+                                                                             predictor)
                 for i, (_, group_candidates) in enumerate(ml_cred_groups):
                     for candidate in group_candidates:
                         if candidate.use_ml:
@@ -365,6 +701,18 @@ class CredSweeper:
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    def _get_json_path(self, change_type: Optional[DiffRowType]) -> Path:
+        json_path = Path(str(self.json_filename))
+        if isinstance(change_type, DiffRowType):
+            # add suffix for appropriated reports to create two files for the patch scan
+            json_path = json_path.with_suffix(f".{change_type.value}{json_path.suffix}")
+        return json_path
+
+    def __json_item(self, credential: Candidate) -> str:
+        return json.dumps(credential.to_json(hashed=self.hashed, subtext=self.subtext), indent=4)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
     def export_results(self, change_type: Optional[DiffRowType] = None) -> None:
         """
         Save credential candidates to json file or print them to a console.
@@ -387,12 +735,11 @@ class CredSweeper:
                 x.line_data_list[0].value_end  #
             ))
 
-        if self.json_filename:
-            json_path = Path(self.json_filename)
-            if isinstance(change_type, DiffRowType):
-                # add suffix for appropriated reports to create two files for the patch scan
-                json_path = json_path.with_suffix(f".{change_type.value}{json_path.suffix}")
-            with open(json_path, 'w', encoding=DEFAULT_ENCODING) as f:
+        if self.__json_stream is not None:
+            # all credentials were written during scan
+            self.__json_stream.write("\n]")
+        elif self.json_filename:
+            with open(self._get_json_path(change_type), 'w', encoding=DEFAULT_ENCODING) as f:
                 # use the approach to reduce total memory usage in case of huge data
                 first_item = True
                 f.write('[\n')
@@ -401,7 +748,7 @@ class CredSweeper:
                         first_item = False
                     else:
                         f.write(",\n")
-                    f.write(json.dumps(credential.to_json(hashed=self.hashed, subtext=self.subtext), indent=4))
+                    f.write(self.__json_item(credential))
                 f.write("\n]")
 
         if self.xlsx_filename:
@@ -159,12 +159,52 @@ AVAILABLE_ENCODINGS = [UTF_8, UTF_16, LATIN_1]
 # to limit memory usage in case of recursive scan
 RECURSIVE_SCAN_LIMITATION = 1 << 30
 
+# number of threads to list directories ahead of enumeration - listing is bound by latency of file system
+WALK_THREADS = 8
+
+# text files of the size and bigger are mapped to memory and lines are decoded on access
+MIN_MMAP_SIZE = 1 << 24
+# text files of the size and bigger are scanned with bounded window of lines which are read by blocks
+MIN_STREAM_SIZE = 1 << 30
+
+# default budget of each parser attempt to represent data as a structure - bigger data is not parsed
+PARSE_SIZE_BUDGET = 1 << 24
+# default time budget in seconds of each parser attempt which is checked during incremental parsing
+PARSE_TIME_BUDGET = 1.0
+
+# default size of data of a container member which is kept in memory - bigger members are spooled to temporary files
+SPOOL_SIZE = 1 << 26
+# size of blocks to copy oversize data to a temporary file
+SPOOL_BLOCK_SIZE = 1 << 20
+# default size of ZIP or TAR archive file which members are split into parts for parallel scan
+FANOUT_SIZE = 1 << 24
+# default capacity in bytes of the cache of candidates of byte-identical container members during deep scan
+DIGEST_CACHE_SIZE = 1 << 26
+# number of rows which are fetched at once from a table of sqlite3 database during deep scan
+SQLITE_BATCH_SIZE = 1 << 10
+
 # default value for config and ValuePatternCheck
 DEFAULT_PATTERN_LEN = 4
 
 # PEM x509 patterns
 PEM_BEGIN_PATTERN = "-----BEGIN"
 PEM_END_PATTERN = "-----END"
+# maximal number of lines of PEM key from the line with the begin pattern
+PEM_MAX_LINES = 200
+
+# number of lines around a line to search second part of multi pattern rule
+MULTI_PATTERN_SEARCH_MARGIN = 10
 
 # similar min_line_len in rule_template - no real credential in data less than 8 bytes
 MIN_DATA_LEN = 8
+
+# number of batches per process in parallel scan - more batches give better balance with extra overhead
+SCAN_BATCHES_PER_JOB = 8
+# maximal number of providers in a batch for parallel scan to amortize inter-process communication
+MAX_SCAN_BATCH_LEN = 256
+
+# range of automatic batch size for ML inference - bigger batch has less overhead per call but more memory
+MIN_ML_BATCH_SIZE = 16
+MAX_ML_BATCH_SIZE = 256
+# minimal number of candidate groups for each process to apply parallel ML validation - start of pool is expensive
+MIN_ML_GROUPS_PER_JOB = 256
@@ -1,9 +1,11 @@
 import re
-from typing import Dict, List, Optional, Set, Any
+from typing import Dict, List, Optional, Set, Any, Tuple
 
 from humanfriendly import parse_size
 
-from credsweeper.common.constants import Severity, DEFAULT_PATTERN_LEN
+from credsweeper.common.constants import Severity, DEFAULT_PATTERN_LEN, PARSE_SIZE_BUDGET, PARSE_TIME_BUDGET, \
+    SPOOL_SIZE, FANOUT_SIZE, DIGEST_CACHE_SIZE
+from credsweeper.config.exclude_matcher import ExcludeMatcher
 from credsweeper.utils.util import Util
 
 
@@ -16,11 +18,13 @@ class Config:
     ]
 
     def __init__(self, config: Dict[str, Any]) -> None:
-        self.exclude_patterns: List[re.Pattern] = [re.compile(pattern) for pattern in config["exclude"]["pattern"]]
-        self.exclude_paths: List[str] = config["exclude"]["path"]
-        self.exclude_containers: List[str] = config["exclude"]["containers"]
-        self.exclude_documents: List[str] = config["exclude"]["documents"]
-        self.exclude_extensions: List[str] = config["exclude"]["extension"]
+        # the exclude rules are immutable and compiled to the matcher - an attribute has to be replaced to change them
+        self.exclude_patterns: Tuple[re.Pattern,
+                                     ...] = tuple(re.compile(pattern) for pattern in config["exclude"]["pattern"])
+        self.exclude_paths: Tuple[str, ...] = tuple(config["exclude"]["path"])
+        self.exclude_containers: Tuple[str, ...] = tuple(config["exclude"]["containers"])
+        self.exclude_documents: Tuple[str, ...] = tuple(config["exclude"]["documents"])
+        self.exclude_extensions: Tuple[str, ...] = tuple(config["exclude"]["extension"])
         self.exclude_lines: Set[str] = set(config["exclude"].get("lines", []))
         self.exclude_values: Set[str] = set(config["exclude"].get("values", []))
         self.source_extensions: List[str] = config["source_ext"]
@@ -41,9 +45,23 @@ class Config:
 
         self.min_keyword_value_length: int = int(config["min_keyword_value_length"])
         self.min_pattern_value_length: int = int(config["min_pattern_value_length"])
+        self.parse_size_budget: int = int(config.get("parse_size_budget", PARSE_SIZE_BUDGET))
+        self.parse_time_budget: float = float(config.get("parse_time_budget", PARSE_TIME_BUDGET))
+        self.spool_size: int = int(config.get("spool_size", SPOOL_SIZE))
+        self.fanout_size: int = int(config.get("fanout_size", FANOUT_SIZE))
+        self.digest_cache_size: int = int(config.get("digest_cache_size", DIGEST_CACHE_SIZE))
 
         # Trim exclude patterns from space like characters
         self.exclude_lines = set(line.strip() for line in self.exclude_lines)
         self.exclude_values = set(line.strip() for line in self.exclude_values)
 
         self.pattern_len = config.get("pattern_len", DEFAULT_PATTERN_LEN)
+
+        self.__exclude_matcher = ExcludeMatcher(self)
+
+    @property
+    def exclude_matcher(self) -> ExcludeMatcher:
+        """Compiled exclude rules. The matcher is made again when any exclude attribute was replaced"""
+        if not self.__exclude_matcher.is_actual(self):
+            self.__exclude_matcher = ExcludeMatcher(self)
+        return self.__exclude_matcher
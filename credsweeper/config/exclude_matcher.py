@@ -0,0 +1,135 @@
+import re
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+from credsweeper.utils.util import Util
+
+
+class ExcludeMatcher:
+    """Compiled rules of config to exclude files by path.
+
+    Patterns are combined into single regex, excluded path substrings are arranged into a trie regex and extensions
+    are kept in sets, so the check does not depend on number of rules. Results for directories are cached because
+    files of a directory are checked one after another. Least recently used directories are evicted from the cache,
+    so results of often checked parent directories are kept. Config keeps own matcher which is made again when
+    any exclude attribute of the config was replaced.
+
+    Parameters:
+        config: Config or any object with the exclude attributes
+
+    """
+
+    ATTRIBUTES = ("not_allowed_path_pattern", "exclude_patterns", "exclude_paths", "exclude_extensions",
+                  "exclude_containers", "exclude_documents")
+    # a pattern with the tokens may not match a path when it matches the path of a parent directory
+    NOT_PREFIX_PATTERN_TOKENS = ("$", "\\Z", "\\b", "\\B", "(?=", "(?!")
+    DIR_CACHE_SIZE = 1 << 12
+
+    def __init__(self, config: Any) -> None:
+        # the objects are kept to detect replaced attributes of the config
+        self.__sources = tuple(getattr(config, x) for x in ExcludeMatcher.ATTRIBUTES)
+        not_allowed_path_pattern, exclude_patterns, exclude_paths, exclude_extensions, exclude_containers, \
+            exclude_documents = self.__sources
+        self.__not_allowed_path_pattern = not_allowed_path_pattern
+        self.__patterns_regex, self.__patterns = self.__combine(exclude_patterns)
+        # patterns which match all files in a directory when they match the directory
+        prefix_patterns = [
+            x for x in [not_allowed_path_pattern, *exclude_patterns]
+            if isinstance(x, re.Pattern) and not any(y in x.pattern for y in ExcludeMatcher.NOT_PREFIX_PATTERN_TOKENS)
+        ]
+        self.__prefix_patterns_regex, self.__prefix_patterns = self.__combine(prefix_patterns)
+        paths = list(exclude_paths)
+        self.__paths_regex = re.compile(Util.get_trie_regex(paths)) if paths else None
+        self.__extensions = set(exclude_extensions)
+        self.__containers = set(exclude_containers)
+        self.__documents = set(exclude_documents)
+        self.__dir_cache: OrderedDict[str, bool] = OrderedDict()
+
+    @staticmethod
+    def __combine(patterns: List[re.Pattern]) -> Tuple[Optional[re.Pattern], List[re.Pattern]]:
+        """Combines patterns for `match` in single regex. Patterns with own flags or groups are returned as is"""
+        default_flags = re.compile('').flags
+        combined: List[str] = []
+        others: List[re.Pattern] = []
+        for pattern in patterns:
+            if default_flags == pattern.flags and 0 == pattern.groups:
+                combined.append(f"(?:{pattern.pattern})")
+            else:
+                others.append(pattern)
+        return (re.compile('|'.join(combined)) if combined else None), others
+
+    def is_actual(self, config: Any) -> bool:
+        """Returns True when the matcher was made from current exclude attributes of the config"""
+        return all(x is getattr(config, y) for x, y in zip(self.__sources, ExcludeMatcher.ATTRIBUTES))
+
+    @staticmethod
+    def get(config: Any) -> "ExcludeMatcher":
+        """Returns the matcher which is kept by the config. Other objects with the exclude attributes
+        e.g. mocked configs get new matcher"""
+        matcher = getattr(config, "exclude_matcher", None)
+        return matcher if isinstance(matcher, ExcludeMatcher) else ExcludeMatcher(config)
+
+    def check_file(self, path: str, depth: int, doc: bool) -> bool:
+        """Checks whether the file should be excluded
+
+        Args:
+            path: full path preferred
+            depth: the containers are not excluded with depth
+            doc: the documents are not excluded with depth or doc
+
+        Return:
+            True when the file full path should be excluded
+        """
+        path = path.replace('\\', '/')
+        directory, _, _ = path.rpartition('/')
+        if directory and self.check_dir(directory):
+            return True
+        lower_path = path.lower()
+        if self.__not_allowed_path_pattern.match(lower_path):
+            return True
+        if self.__patterns_regex is not None and self.__patterns_regex.match(lower_path):
+            return True
+        for exclude_pattern in self.__patterns:
+            if exclude_pattern.match(lower_path):
+                return True
+        # must be case-sensitive
+        if self.__paths_regex is not None and self.__paths_regex.search(path):
+            return True
+        file_extension = Util.get_extension(lower_path, lower=False)
+        if file_extension in self.__extensions:
+            return True
+        if not depth and file_extension in self.__containers:
+            return True
+        # --depth or --doc enables scan for all documents extensions
+        if not (depth or doc) and file_extension in self.__documents:
+            return True
+        return False
+
+    def check_dir(self, path: str) -> bool:
+        """Checks whether all files in the directory should be excluded. Results are cached
+
+        Args:
+            path: full path of the directory preferred
+
+        Return:
+            True when any file path in the directory matches excluded path or pattern
+        """
+        if (result := self.__dir_cache.get(path)) is not None:
+            self.__dir_cache.move_to_end(path)
+            return result
+        result = self.__check_dir(path)
+        self.__dir_cache[path] = result
+        if ExcludeMatcher.DIR_CACHE_SIZE < len(self.__dir_cache):
+            self.__dir_cache.popitem(last=False)
+        return result
+
+    def __check_dir(self, path: str) -> bool:
+        path = path.replace('\\', '/').rstrip('/') + '/'
+        lower_path = path.lower()
+        if self.__prefix_patterns_regex is not None and self.__prefix_patterns_regex.match(lower_path):
+            return True
+        for exclude_pattern in self.__prefix_patterns:
+            if exclude_pattern.match(lower_path):
+                return True
+        # must be case-sensitive
+        return self.__paths_regex is not None and self.__paths_regex.search(path) is not None
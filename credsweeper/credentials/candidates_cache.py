@@ -0,0 +1,94 @@
+import copy
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from credsweeper.credentials.candidate import Candidate
+from credsweeper.utils.util import Util
+
+logger = logging.getLogger(__name__)
+
+
+class CandidatesCache:
+    """Stores candidates of scanned objects by a key to replay them without repeated reading and scan.
+
+    The key must identify the content and the scan conditions of an object e.g. git blob sha1 and the path.
+    Candidates are kept as they were received from scan - before ML validation.
+    The file is pickled, so it is trusted only when it is owned by current user and cannot be written by others.
+
+    Parameters:
+        checksum: identifier of scan conditions - version, rules, config. The cache file with another checksum
+          is not loaded
+
+    """
+
+    def __init__(self, checksum: str) -> None:
+        self.__checksum = checksum
+        self.__items: Dict[str, List[Candidate]] = {}
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__items
+
+    @staticmethod
+    def __copy(candidates: List[Candidate]) -> List[Candidate]:
+        """Shallow copies to keep the stored candidates unchanged with post processing"""
+        result = []
+        for candidate in candidates:
+            candidate_copy = copy.copy(candidate)
+            candidate_copy.ml_probability = None
+            result.append(candidate_copy)
+        return result
+
+    def get(self, key: str) -> Optional[List[Candidate]]:
+        """Returns copies of stored candidates or None if the key is unknown"""
+        if (candidates := self.__items.get(key)) is not None:
+            return self.__copy(candidates)
+        return None
+
+    def put(self, key: str, candidates: List[Candidate]) -> None:
+        """Stores copies of candidates for the key. Empty list is stored too to skip clean objects"""
+        self.__items[key] = self.__copy(candidates)
+
+    def load(self, path: Union[str, Path]) -> bool:
+        """Loads stored items from the file if the checksum matches
+
+        Args:
+            path: file which was saved previously
+
+        Return:
+            True if the items were loaded
+
+        """
+        try:
+            if not Util.is_trusted_file(path):
+                logger.warning(f"Cache {path} is not owned by current user or is writable by others and is not used")
+                return False
+            with open(path, "rb") as f:
+                checksum, items = pickle.load(f)
+        except FileNotFoundError:
+            logger.info(f"Cache {path} does not exist")
+            return False
+        except Exception as exc:
+            logger.warning(f"Cache {path} cannot be loaded: {exc}")
+            return False
+        if checksum != self.__checksum:
+            logger.info(f"Cache {path} was made with other rules or config and is not used")
+            return False
+        self.__items.update(items)
+        logger.info(f"Loaded {len(items)} items from cache {path}")
+        return True
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Saves all items with the checksum to the file. Temporary file is used to keep previous on failure"""
+        tmp_path = f"{path}.tmp"
+        # the file is not writable by other users to be trusted on load
+        with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as f:
+            # config and patterns are shared between the candidates and pickled once for all items
+            pickle.dump((self.__checksum, self.__items), f)
+        os.replace(tmp_path, path)
+        logger.info(f"Saved {len(self.__items)} items to cache {path}")
@@ -0,0 +1,134 @@
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+from pathlib import Path
+from typing import List, Optional, Union
+
+from credsweeper.credentials.candidate import Candidate
+from credsweeper.utils.util import Util
+
+logger = logging.getLogger(__name__)
+
+
+class CandidatesIndex:
+    """Persistent SQLite index of scanned files with their candidates for incremental scan.
+
+    A file is considered unchanged when size and modification time are the same as at scan. Content digest is
+    compared only for a file with the same size but another modification time, e.g. after checkout.
+    Candidates are kept as they were received from scan - before ML validation. They are pickled, so stored
+    candidates are used only when the index file is owned by current user and cannot be written by others.
+
+    Parameters:
+        path: database file
+        checksum: identifier of scan conditions - version, rules, config. All stored files are removed
+          from the index when the checksum differs
+
+    """
+
+    DIGEST_CHUNK_SIZE = 1 << 20
+
+    def __init__(self, path: Union[str, Path], checksum: str) -> None:
+        try:
+            self.__trusted = Util.is_trusted_file(path)
+        except FileNotFoundError:
+            # new file is created by current user
+            self.__trusted = True
+        if not self.__trusted:
+            logger.warning(f"Index {path} is not owned by current user or is writable by others."
+                           " Stored candidates are not used")
+        self.__connection = sqlite3.connect(path)
+        self.__connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.__connection.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER,"
+                                  " mtime_ns INTEGER, digest TEXT, candidates BLOB)")
+        row = self.__connection.execute("SELECT value FROM meta WHERE key='checksum'").fetchone()
+        if row is None or row[0] != checksum:
+            if row is not None:
+                logger.info(f"Index {path} was made with other rules or config and is cleared")
+            self.__connection.execute("DELETE FROM files")
+            self.__connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('checksum', ?)", (checksum, ))
+            self.__connection.commit()
+
+    def close(self) -> None:
+        """Commits changes and closes the database"""
+        self.__connection.commit()
+        self.__connection.close()
+
+    def __len__(self) -> int:
+        count: int = self.__connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        return count
+
+    @staticmethod
+    def get_stat(path: str) -> Optional[os.stat_result]:
+        """Returns stat of a regular file or None"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat if os.path.isfile(path) else None
+
+    @staticmethod
+    def get_digest(path: str) -> Optional[str]:
+        """Returns md5 of the file content or None if the file cannot be read"""
+        digest = hashlib.md5()
+        try:
+            with open(path, "rb") as f:
+                while chunk := f.read(CandidatesIndex.DIGEST_CHUNK_SIZE):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    def get_candidates(self, path: str, stat: os.stat_result) -> Optional[List[Candidate]]:
+        """Returns stored candidates if the file was not changed since scan
+
+        Args:
+            path: path of the file as it is used in candidates
+            stat: current stat of the file
+
+        Return:
+            list of candidates or None if the file has to be scanned
+
+        """
+        if not self.__trusted:
+            return None
+        row = self.__connection.execute("SELECT size, mtime_ns, digest, candidates FROM files WHERE path=?",
+                                        (path, )).fetchone()
+        if row is None:
+            return None
+        size, mtime_ns, digest, candidates = row
+        if size != stat.st_size:
+            return None
+        if mtime_ns != stat.st_mtime_ns:
+            if digest != self.get_digest(path):
+                return None
+            self.__connection.execute("UPDATE files SET mtime_ns=? WHERE path=?", (stat.st_mtime_ns, path))
+        try:
+            result: List[Candidate] = pickle.loads(candidates)
+            return result
+        except Exception as exc:
+            logger.warning(f"Stored candidates of {path} cannot be loaded: {exc}")
+        return None
+
+    def put_candidates(self, path: str, stat: os.stat_result, candidates: List[Candidate]) -> bool:
+        """Stores candidates of the file which was scanned
+
+        Args:
+            path: path of the file as it is used in candidates
+            stat: stat of the file before scan
+            candidates: candidates of the file from scan
+
+        Return:
+            True if the candidates were stored. The file which was changed during scan is not stored
+
+        """
+        digest = self.get_digest(path)
+        current_stat = self.get_stat(path)
+        if digest is None or current_stat is None \
+                or (stat.st_size, stat.st_mtime_ns) != (current_stat.st_size, current_stat.st_mtime_ns):
+            return False
+        self.__connection.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, digest, candidates) VALUES (?, ?, ?, ?, ?)",
+            (path, stat.st_size, stat.st_mtime_ns, digest, pickle.dumps(candidates)))
+        return True
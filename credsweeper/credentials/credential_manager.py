@@ -7,16 +7,43 @@ from credsweeper.credentials.candidate_group_generator import CandidateGroupGene
 
 logger = logging.getLogger(__name__)
 
+DuplicateKey = Tuple[str, str, str, int, int, int, int, int, int, int]
+
 
 class CredentialManager:
     """The manager allows you to store, add and delete separate credit candidates."""
 
     def __init__(self) -> None:
         self.candidates: List[Candidate] = list(Manager().list())
+        # the keys of stored candidates to drop duplicates during adding
+        self.__duplicate_keys: Dict[DuplicateKey, Candidate] = {}
+
+    @staticmethod
+    def get_duplicate_key(candidate: Candidate) -> DuplicateKey:
+        """Key to find duplicates which may appear in overlaps during long line scan"""
+        ld = candidate.line_data_list[0]
+        return (
+            candidate.rule_name,  #
+            ld.path,  #
+            ld.info,  #
+            ld.line_pos,  #
+            ld.variable_start,  #
+            ld.variable_end,  #
+            ld.separator_start,  #
+            ld.separator_end,  #
+            ld.value_start,  #
+            ld.value_end)
+
+    def __update_duplicate_keys(self) -> None:
+        """Rebuilds the keys after the candidates list was replaced. First candidate is kept for the key"""
+        self.__duplicate_keys = {}
+        for i in self.candidates:
+            self.__duplicate_keys.setdefault(self.get_duplicate_key(i), i)
 
     def clear_credentials(self) -> None:
         """Clear credential candidates stored in the manager."""
         self.candidates.clear()
+        self.__duplicate_keys.clear()
 
     def len_credentials(self) -> int:
         """Get number of credential candidates stored in the manager.
@@ -44,15 +71,25 @@ class CredentialManager:
 
         """
         self.candidates = candidates
+        self.__update_duplicate_keys()
 
-    def add_credential(self, candidate: Candidate) -> None:
-        """Add credential candidate to the manager.
+    def add_credential(self, candidate: Candidate) -> bool:
+        """Add credential candidate to the manager. Duplicates of stored candidates are omitted.
 
         Args:
             candidate: credential candidate to be added
 
+        Return:
+            True if the candidate was added, False for a duplicate
+
         """
+        candidate_key = self.get_duplicate_key(candidate)
+        if stored_candidate := self.__duplicate_keys.get(candidate_key):
+            self.__check_duplicate(stored_candidate, candidate)
+            return False
+        self.__duplicate_keys[candidate_key] = candidate
         self.candidates.append(candidate)
+        return True
 
     def remove_credential(self, candidate: Candidate) -> None:
         """Remove credential candidate from the manager.
@@ -62,36 +99,33 @@ class CredentialManager:
 
         """
         self.candidates.remove(candidate)
+        candidate_key = self.get_duplicate_key(candidate)
+        if self.__duplicate_keys.get(candidate_key) is candidate:
+            del self.__duplicate_keys[candidate_key]
+
+    @staticmethod
+    def __check_duplicate(stored_candidate: Candidate, candidate: Candidate) -> None:
+        """Check precisely - compare with the values"""
+        if not stored_candidate.compare(candidate):
+            ld_ = stored_candidate.line_data_list[0]
+            ld = candidate.line_data_list[0]
+            logger.warning(f"check {ld_.variable, ld_.value} and {ld.variable, ld.value}")
 
     def purge_duplicates(self) -> int:
         """Purge duplicates candidates which may appear in overlaps during long line scan.
 
         Returns: number of removed duplicates
         """
-        candidates_dict: Dict[Tuple[str, str, str, int, int, int, int, int, int, int], Candidate] = {}
+        candidates_dict: Dict[DuplicateKey, Candidate] = {}
         before = len(self.candidates)
         for i in self.candidates:
-            ld = i.line_data_list[0]
-            candidate_key = (
-                i.rule_name,  #
-                ld.path,  #
-                ld.info,  #
-                ld.line_pos,  #
-                ld.variable_start,  #
-                ld.variable_end,  #
-                ld.separator_start,  #
-                ld.separator_end,  #
-                ld.value_start,  #
-                ld.value_end)
+            candidate_key = self.get_duplicate_key(i)
             if candidate_key in candidates_dict:
-                # check precisely - compare with the values
-                candidate_dict = candidates_dict[candidate_key]
-                if not candidate_dict.compare(i):
-                    ld_ = candidate_dict.line_data_list[0]
-                    logger.warning(f"check {ld_.variable, ld_.value} and {ld.variable, ld.value}")
+                self.__check_duplicate(candidates_dict[candidate_key], i)
             else:
                 candidates_dict[candidate_key] = i
         self.candidates = list(candidates_dict.values())
+        self.__duplicate_keys = candidates_dict
         after = len(self.candidates)
         return before - after
 
@@ -0,0 +1,110 @@
+import copy
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from credsweeper.common.constants import MIN_DATA_LEN
+from credsweeper.credentials.candidate import Candidate
+from credsweeper.file_handler.descriptor import Descriptor
+
+
+class DigestCache:
+    """Stores candidates of scanned members of containers by digest of the content to replay them for
+    byte-identical members instead of repeated scan.
+
+    Scan of a member depends on the data, the extension of the member, the path of the file and remaining depth,
+    so all of them are parts of the key. The candidates are stored with info of the first member and replayed
+    with info of another one. Least recently used items are evicted when approximate size of the stored candidates
+    is over the capacity. The items are kept within a scan run only - processes of a persistent pool receive
+    the run with each batch and clear the items left from the previous run.
+
+    Parameters:
+        capacity: maximal approximate size of the stored items in bytes, 0 disables the cache
+
+    """
+
+    # approximate memory usage of an item and a line data without the strings
+    ITEM_SIZE = 256
+    LINE_DATA_SIZE = 1024
+
+    def __init__(self, capacity: int) -> None:
+        self.__capacity = capacity
+        # key -> descriptor of the scanned member, size limit of the scan, candidates, approximate size
+        self.__items: OrderedDict[bytes, Tuple[Descriptor, int, List[Candidate], int]] = OrderedDict()
+        self.__size = 0
+        self.__run = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # the items are not sent to processes of pool
+        state = self.__dict__.copy()
+        state["_DigestCache__items"] = OrderedDict()
+        state["_DigestCache__size"] = 0
+        return state
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    @property
+    def size(self) -> int:
+        """Approximate size of the stored items in bytes"""
+        return self.__size
+
+    def clear(self) -> None:
+        """Removes all items"""
+        self.__items.clear()
+        self.__size = 0
+
+    def start_run(self, run: int) -> None:
+        """Clears the items when the scan run differs from the run of the stored items"""
+        if self.__run != run:
+            self.clear()
+            self.__run = run
+
+    def get_key(self, data: Union[bytes, bytearray], descriptor: Descriptor, depth: int) -> Optional[bytes]:
+        """Returns the key for data of the member or None when the cache is not applicable"""
+        if 0 >= self.__capacity or MIN_DATA_LEN > len(data):
+            return None
+        digest = hashlib.blake2b(data, digest_size=32)
+        # the path of the file is used for paths and info of decompressed data and in filters
+        digest.update(f"\0{descriptor.extension}\0{depth}\0{descriptor.path}".encode())
+        return digest.digest()
+
+    @staticmethod
+    def __copy(candidates: List[Candidate], info: str, descriptor: Descriptor) -> List[Candidate]:
+        """Copies candidates and line data with info of the member instead of the stored one"""
+        result = []
+        for candidate in candidates:
+            candidate_copy = copy.copy(candidate)
+            candidate_copy.ml_probability = None
+            candidate_copy.line_data_list = []
+            for line_data in candidate.line_data_list:
+                line_data_copy = copy.copy(line_data)
+                if line_data.info.startswith(info):
+                    line_data_copy.info = f"{descriptor.info}{line_data.info[len(info):]}"
+                candidate_copy.line_data_list.append(line_data_copy)
+            result.append(candidate_copy)
+        return result
+
+    def get(self, key: bytes, descriptor: Descriptor, recursive_limit_size: int) -> Optional[List[Candidate]]:
+        """Returns candidates for the member or None when the member has to be scanned.
+        A scan with bigger size limit might find more candidates, so the stored ones are not used for it"""
+        item = self.__items.get(key)
+        if item is None or item[1] < recursive_limit_size:
+            return None
+        self.__items.move_to_end(key)
+        return self.__copy(item[2], item[0].info, descriptor)
+
+    def put(self, key: bytes, descriptor: Descriptor, recursive_limit_size: int, candidates: List[Candidate]) -> None:
+        """Stores copies of candidates of scanned member. Empty list is stored too to skip clean members"""
+        size = DigestCache.ITEM_SIZE + sum(DigestCache.LINE_DATA_SIZE + len(x.line) + len(x.info)
+                                           for candidate in candidates for x in candidate.line_data_list)
+        if self.__capacity < size:
+            return
+        if item := self.__items.pop(key, None):
+            self.__size -= item[3]
+        self.__items[key] = (descriptor, recursive_limit_size, self.__copy(candidates, descriptor.info,
+                                                                           descriptor), size)
+        self.__size += size
+        while self.__capacity < self.__size:
+            _, (_, _, _, evicted_size) = self.__items.popitem(last=False)
+            self.__size -= evicted_size
@@ -1,9 +1,7 @@
-import contextlib
 import hashlib
 import re
 import string
-from functools import cached_property
-from typing import Any, Dict, Optional, Tuple
+from typing import Dict, Optional
 
 from colorama import Fore, Style
 
@@ -15,6 +13,10 @@ from credsweeper.utils.util import Util
 class LineData:
     """Object to treat and store scanned line related data.
 
+    A line data is created for each match of a pattern and most of them are filtered, so slots are used instead of
+    instance dict. Groups of the match are extracted on creation, but value and variable are sanitized on first
+    access to them or to their positions.
+
     Parameters:
         key: Optional[str] = None
         line: string variable, line
@@ -48,6 +50,11 @@ class LineData:
     INITIAL_WRONG_POSITION = -3
     EXCEPTION_POSITION = -2
 
+    __slots__ = ("config", "__line", "line_pos", "line_num", "path", "file_type", "info", "pattern", "key", "separator",
+                 "separator_start", "separator_end", "value_leftquote", "value_rightquote", "wrap",
+                 "_3d_escaped_separator", "__value", "__value_start", "__value_end", "__variable", "__variable_start",
+                 "__variable_end", "__url_part", "__sanitized", "__is_well_quoted_value", "__is_quoted")
+
     def __init__(
             self,  #
             config: Config,  #
@@ -60,7 +67,7 @@ class LineData:
             pattern: re.Pattern,  #
             match_obj: Optional[re.Match] = None) -> None:
         self.config = config
-        self.line: str = line
+        self.__line: str = line
         self.line_pos: int = line_pos
         self.line_num: int = line_num
         self.path: str = path
@@ -70,22 +77,27 @@ class LineData:
         # do not store match object due it cannot be pickled with multiprocessing
 
         # start - end position of matched object
-        self.value_start = LineData.INITIAL_WRONG_POSITION
-        self.value_end = LineData.INITIAL_WRONG_POSITION
+        self.__value_start = LineData.INITIAL_WRONG_POSITION
+        self.__value_end = LineData.INITIAL_WRONG_POSITION
         self.key: Optional[str] = None
         self.separator: Optional[str] = None
         self.separator_start: int = LineData.INITIAL_WRONG_POSITION
         self.separator_end: int = LineData.INITIAL_WRONG_POSITION
-        self.value: Optional[str] = None
-        self.variable: Optional[str] = None
-        self.variable_start = LineData.INITIAL_WRONG_POSITION
-        self.variable_end = LineData.INITIAL_WRONG_POSITION
+        self.__value: Optional[str] = None
+        self.__variable: Optional[str] = None
+        self.__variable_start = LineData.INITIAL_WRONG_POSITION
+        self.__variable_end = LineData.INITIAL_WRONG_POSITION
         self.value_leftquote: Optional[str] = None
         self.value_rightquote: Optional[str] = None
         # is set when variable & value are in URL for any source type
-        self.url_part = False
-        self.wrap = None
+        self.__url_part = False
+        self.wrap: Optional[str] = None
         self._3d_escaped_separator = False
+        # the cached properties
+        self.__is_well_quoted_value: Optional[bool] = None
+        self.__is_quoted: Optional[bool] = None
+        # value and variable are sanitized on first access
+        self.__sanitized = True
         self.initialize(match_obj)
         # the line is very useful for debug breakpoint
         pass  # pylint: disable=W0107
@@ -109,31 +121,137 @@ class LineData:
         if match_obj is None:
             return
 
-        def get_group_from_match_obj(_match_obj: re.Match, group: str) -> Any:
-            with contextlib.suppress(Exception):
-                return _match_obj.group(group)
-            return None
-
-        def get_span_from_match_obj(_match_obj: re.Match, group: str) -> Tuple[int, int]:
-            with contextlib.suppress(Exception):
-                span = _match_obj.span(group)
-                return span[0], span[1]
-            return LineData.EXCEPTION_POSITION, LineData.EXCEPTION_POSITION
-
-        self.key = get_group_from_match_obj(match_obj, "keyword")
-        self.separator = get_group_from_match_obj(match_obj, "separator")
-        self.separator_start, self.separator_end = get_span_from_match_obj(match_obj, "separator")
-        self.value = get_group_from_match_obj(match_obj, "value")
-        self.value_start, self.value_end = get_span_from_match_obj(match_obj, "value")
-        self.variable = get_group_from_match_obj(match_obj, "variable")
-        self.variable_start, self.variable_end = get_span_from_match_obj(match_obj, "variable")
-        self.value_leftquote = get_group_from_match_obj(match_obj, "value_leftquote")
-        self.value_rightquote = get_group_from_match_obj(match_obj, "value_rightquote")
-        self.wrap = get_group_from_match_obj(match_obj, "wrap")
+        # missing groups are checked with the index of the pattern instead of exception handling for each group
+        group_index = match_obj.re.groupindex
+        no_span = (LineData.EXCEPTION_POSITION, LineData.EXCEPTION_POSITION)
+        self.__sanitized = False
+        if "keyword" in group_index:
+            self.key = match_obj.group("keyword")
+        if "separator" in group_index:
+            self.separator = match_obj.group("separator")
+            self.separator_start, self.separator_end = match_obj.span("separator")
+        else:
+            self.separator_start, self.separator_end = no_span
+        if "value" in group_index:
+            self.__value = match_obj.group("value")
+            self.__value_start, self.__value_end = match_obj.span("value")
+        else:
+            self.__value_start, self.__value_end = no_span
+        if "variable" in group_index:
+            self.__variable = match_obj.group("variable")
+            self.__variable_start, self.__variable_end = match_obj.span("variable")
+        else:
+            self.__variable_start, self.__variable_end = no_span
+        if "value_leftquote" in group_index:
+            self.value_leftquote = match_obj.group("value_leftquote")
+        if "value_rightquote" in group_index:
+            self.value_rightquote = match_obj.group("value_rightquote")
+        if "wrap" in group_index:
+            self.wrap = match_obj.group("wrap")
         # percent encoded '=' in url
         self._3d_escaped_separator = bool(self.separator) and "%3D" == self.separator.upper()
-        self.sanitize_value()
-        self.sanitize_variable()
+
+    def __sanitize(self) -> None:
+        """Sanitizes value and variable once. Properties return the fields as is during sanitization"""
+        if not self.__sanitized:
+            self.__sanitized = True
+            self.sanitize_value()
+            self.sanitize_variable()
+
+    @property
+    def line(self) -> str:
+        """line getter"""
+        return self.__line
+
+    @line.setter
+    def line(self, line: str) -> None:
+        """line setter - value and variable are sanitized with the line of the match"""
+        self.__sanitize()
+        self.__line = line
+
+    @property
+    def value(self) -> Optional[str]:
+        """value getter - the value is sanitized on first access"""
+        self.__sanitize()
+        return self.__value
+
+    @value.setter
+    def value(self, value: Optional[str]) -> None:
+        """value setter"""
+        self.__sanitize()
+        self.__value = value
+
+    @property
+    def value_start(self) -> int:
+        """value_start getter"""
+        self.__sanitize()
+        return self.__value_start
+
+    @value_start.setter
+    def value_start(self, value_start: int) -> None:
+        """value_start setter"""
+        self.__sanitize()
+        self.__value_start = value_start
+
+    @property
+    def value_end(self) -> int:
+        """value_end getter"""
+        self.__sanitize()
+        return self.__value_end
+
+    @value_end.setter
+    def value_end(self, value_end: int) -> None:
+        """value_end setter"""
+        self.__sanitize()
+        self.__value_end = value_end
+
+    @property
+    def variable(self) -> Optional[str]:
+        """variable getter - the variable is sanitized on first access"""
+        self.__sanitize()
+        return self.__variable
+
+    @variable.setter
+    def variable(self, variable: Optional[str]) -> None:
+        """variable setter"""
+        self.__sanitize()
+        self.__variable = variable
+
+    @property
+    def variable_start(self) -> int:
+        """variable_start getter"""
+        self.__sanitize()
+        return self.__variable_start
+
+    @variable_start.setter
+    def variable_start(self, variable_start: int) -> None:
+        """variable_start setter"""
+        self.__sanitize()
+        self.__variable_start = variable_start
+
+    @property
+    def variable_end(self) -> int:
+        """variable_end getter"""
+        self.__sanitize()
+        return self.__variable_end
+
+    @variable_end.setter
+    def variable_end(self, variable_end: int) -> None:
+        """variable_end setter"""
+        self.__sanitize()
+        self.__variable_end = variable_end
+
+    @property
+    def url_part(self) -> bool:
+        """url_part getter - is set during sanitization when variable & value are in URL"""
+        self.__sanitize()
+        return self.__url_part
+
+    @url_part.setter
+    def url_part(self, url_part: bool) -> None:
+        """url_part setter"""
+        self.__sanitize()
+        self.__url_part = url_part
 
     def sanitize_value(self):
         """Clean found value from extra artifacts. Correct positions if changed."""
@@ -242,9 +360,14 @@ class LineData:
                 return True
         return False
 
-    @cached_property
+    @property
     def is_well_quoted_value(self) -> bool:
-        """Well quoted value - means the value has been quoted or has line wrap"""
+        """Well quoted value - means the value has been quoted or has line wrap. Cached value"""
+        if self.__is_well_quoted_value is None:
+            self.__is_well_quoted_value = self.__get_well_quoted_value()
+        return self.__is_well_quoted_value
+
+    def __get_well_quoted_value(self) -> bool:
         result = False
         if self.value_leftquote and self.value_rightquote:
             if self.value_leftquote == self.value_rightquote:
@@ -284,14 +407,19 @@ class LineData:
 
         return result
 
-    @cached_property
+    @property
     def is_quoted(self) -> bool:
-        """Check if variable and value in a quoted string.
+        """Check if variable and value in a quoted string. Cached value
 
         Return:
             True if candidate in a quoted string, False otherwise
 
         """
+        if self.__is_quoted is None:
+            self.__is_quoted = self.__get_quoted()
+        return self.__is_quoted
+
+    def __get_quoted(self) -> bool:
         left_quote = None
         if 0 < self.variable_start:
             for i in self.line[:self.variable_start]:
@@ -1,24 +1,30 @@
 import contextlib
 import datetime
+import io
 import logging
+import os
+import tempfile
 from abc import abstractmethod, ABC
-from typing import List, Optional, Tuple, Any, Generator
+from typing import List, Optional, Tuple, Any, Generator, IO, Union, Iterable
 
 from credsweeper.common.constants import RECURSIVE_SCAN_LIMITATION, MIN_DATA_LEN, DEFAULT_ENCODING, UTF_8, \
-    MIN_VALUE_LENGTH
+    MIN_VALUE_LENGTH, MAX_LINE_LENGTH, SPOOL_BLOCK_SIZE
 from credsweeper.config.config import Config
 from credsweeper.credentials.augment_candidates import augment_candidates
 from credsweeper.credentials.candidate import Candidate
+from credsweeper.credentials.digest_cache import DigestCache
 from credsweeper.file_handler.byte_content_provider import ByteContentProvider
 from credsweeper.file_handler.content_provider import ContentProvider
 from credsweeper.file_handler.data_content_provider import DataContentProvider
 from credsweeper.file_handler.descriptor import Descriptor
 from credsweeper.file_handler.diff_content_provider import DiffContentProvider
 from credsweeper.file_handler.file_path_extractor import FilePathExtractor
+from credsweeper.file_handler.member_content_provider import MemberContentProvider
 from credsweeper.file_handler.string_content_provider import StringContentProvider
 from credsweeper.file_handler.struct_content_provider import StructContentProvider
 from credsweeper.file_handler.text_content_provider import TextContentProvider
 from credsweeper.scanner.scanner import Scanner
+from credsweeper.utils.util import Util
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +44,12 @@ class AbstractScanner(ABC):
         """Abstract property to be defined in DeepScanner"""
         raise NotImplementedError(__name__)
 
+    @property
+    @abstractmethod
+    def digest_cache(self) -> DigestCache:
+        """Abstract property to be defined in DeepScanner"""
+        raise NotImplementedError(__name__)
+
     @abstractmethod
     def data_scan(
             self,  #
@@ -52,6 +64,40 @@ class AbstractScanner(ABC):
     def get_deep_scanners(data: bytes, descriptor: Descriptor, depth: int) -> Tuple[List[Any], List[Any]]:
         """Returns possibly scan methods for the data depends on content and fallback scanners"""
 
+    @staticmethod
+    @abstractmethod
+    def is_spool_container(head: bytes, extension: str) -> bool:
+        """Returns True when the container might be scanned from a file with spool_scan"""
+
+    @abstractmethod
+    def spool_scan(
+            self,  #
+            spool_path: str,  #
+            descriptor: Descriptor,  #
+            depth: int,  #
+            recursive_limit_size: int) -> List[Candidate]:
+        """Abstract method to be defined in DeepScanner"""
+        raise NotImplementedError(__name__)
+
+    @abstractmethod
+    def sqlite_file_scan(
+            self,  #
+            path: str,  #
+            descriptor: Descriptor,  #
+            depth: int,  #
+            recursive_limit_size: int) -> Optional[List[Candidate]]:
+        """Abstract method to be defined in DeepScanner"""
+        raise NotImplementedError(__name__)
+
+    @abstractmethod
+    def reference_scan(
+            self,  #
+            member_provider: MemberContentProvider,  #
+            depth: int,  #
+            recursive_limit_size: int) -> List[Candidate]:
+        """Abstract method to be defined in DeepScanner"""
+        raise NotImplementedError(__name__)
+
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
     def recursive_scan(
@@ -94,6 +140,69 @@ class AbstractScanner(ABC):
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    def member_scan(
+            self,  #
+            stream: Union[IO[bytes], io.BufferedIOBase],  #
+            descriptor: Descriptor,  #
+            depth: int,  #
+            recursive_limit_size: int) -> List[Candidate]:
+        """Reads a member of container from the stream and scans it.
+        A member bigger than spool_size is copied by blocks to a temporary file and scanned with spool_scan,
+        so memory usage does not depend on size of the member.
+
+            Args:
+                stream: opened member of container
+                descriptor: path, extension and info of the member
+                depth: maximal level of recursion
+                recursive_limit_size: maximal bytes of opened files to prevent recursive zip-bomb attack
+        """
+        if 0 > depth:
+            # break recursion if maximal depth is reached
+            logger.debug("Bottom reached %s recursive_limit_size:%d", descriptor.path, recursive_limit_size)
+            return []
+        spool_size = self.config.spool_size
+        data = stream.read(spool_size + 1)
+        if spool_size >= len(data):
+            # nevertheless use extracted data size
+            new_limit = recursive_limit_size - len(data)
+            # byte-identical members are scanned once
+            key = self.digest_cache.get_key(data, descriptor, depth)
+            if key is not None and (candidates := self.digest_cache.get(key, descriptor, new_limit)) is not None:
+                return candidates
+            member_provider = DataContentProvider(data=data,
+                                                  file_path=descriptor.path,
+                                                  file_type=descriptor.extension,
+                                                  info=descriptor.info)
+            candidates = self.recursive_scan(member_provider, depth, new_limit)
+            if key is not None:
+                self.digest_cache.put(key, descriptor, new_limit, candidates)
+            return candidates
+        if FilePathExtractor.is_find_by_ext_file(self.config, descriptor.extension):
+            return [
+                Candidate.get_dummy_candidate(self.config, descriptor.path, descriptor.extension, descriptor.info,
+                                              FilePathExtractor.FIND_BY_EXT_RULE)
+            ]
+        # the extension of member is not used for the name - it may be too long for file system
+        spool_fd, spool_path = tempfile.mkstemp(prefix="credsweeper_")
+        try:
+            with open(spool_fd, "wb") as spool:
+                block = data
+                data = b""
+                while block:
+                    spool.write(block)
+                    if recursive_limit_size < spool.tell():
+                        logger.error(f"{descriptor.info}: size {spool.tell()}"
+                                     f" is over limit {recursive_limit_size} depth:{depth}")
+                        return []
+                    block = stream.read(SPOOL_BLOCK_SIZE)
+                new_limit = recursive_limit_size - spool.tell()
+            logger.debug("Spooled %s %s to %s", descriptor.path, descriptor.info, spool_path)
+            return self.spool_scan(spool_path, descriptor, depth - 1, new_limit)
+        finally:
+            os.remove(spool_path)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
     @staticmethod
     def key_value_combination(structure: dict) -> Generator[Tuple[Any, Any], None, None]:
         """Combine items by `key` and `value` from a dictionary for augmentation
@@ -170,27 +279,46 @@ class AbstractScanner(ABC):
             return candidates
 
         depth -= 1
+        # a keyword rule may be applicable for `key` (str only) and `value` (str, bytes)
+        items = ((key, value,
+                  bool(isinstance(key, str) and self.scanner.keywords_required_substrings_check(key.lower())))
+                 for key, value in AbstractScanner.structure_processing(struct_provider.struct))
+        return self.items_scan(items, struct_provider.descriptor, depth, recursive_limit_size)
 
-        augmented_lines_for_keyword_rules = []
-        for key, value in AbstractScanner.structure_processing(struct_provider.struct):
-            # a keyword rule may be applicable for `key` (str only) and `value` (str, bytes)
-            keyword_match = bool(isinstance(key, str) and self.scanner.keywords_required_substrings_check(key.lower()))
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    def items_scan(
+            self,  #
+            items: Iterable[Tuple[Any, Any, bool]],  #
+            descriptor: Descriptor,  #
+            depth: int,  #
+            recursive_limit_size: int) -> List[Candidate]:
+        """Scans values of a structure and augments lines for keyword rules
+
+            Args:
+                items: key, value and result of keyword check of the key
+                descriptor: path, extension and info of the structure
+                depth: maximal level of recursion for the values
+                recursive_limit_size: maximal bytes of opened files to prevent recursive zip-bomb attack
+        """
+        candidates: List[Candidate] = []
+        augmented_lines_for_keyword_rules = []
+        for key, value, keyword_match in items:
             if isinstance(value, (dict, list, tuple)) and value:
                 # recursive scan for not empty structured `value`
                 val_struct_provider = StructContentProvider(struct=value,
-                                                            file_path=struct_provider.file_path,
-                                                            file_type=struct_provider.file_type,
-                                                            info=f"{struct_provider.info}|STRUCT:{key}")
+                                                            file_path=descriptor.path,
+                                                            file_type=descriptor.extension,
+                                                            info=f"{descriptor.info}|STRUCT:{key}")
                 new_candidates = self.structure_scan(val_struct_provider, depth, recursive_limit_size)
                 candidates.extend(new_candidates)
             elif isinstance(value, bytes):
                 # recursive data scan
                 if MIN_DATA_LEN <= len(value):
                     bytes_struct_provider = DataContentProvider(data=value,
-                                                                file_path=struct_provider.file_path,
-                                                                file_type=struct_provider.file_type,
-                                                                info=f"{struct_provider.info}|BYTES:{key}")
+                                                                file_path=descriptor.path,
+                                                                file_type=descriptor.extension,
+                                                                info=f"{descriptor.info}|BYTES:{key}")
                     new_limit = recursive_limit_size - len(value)
                     new_candidates = self.recursive_scan(bytes_struct_provider, depth, new_limit)
                     candidates.extend(new_candidates)
@@ -204,9 +332,9 @@ class AbstractScanner(ABC):
                     with contextlib.suppress(UnicodeError):
                         data = stripped_value.encode(encoding=DEFAULT_ENCODING, errors='strict')
                         str_struct_provider = DataContentProvider(data=data,
-                                                                  file_path=struct_provider.file_path,
-                                                                  file_type=struct_provider.file_type,
-                                                                  info=f"{struct_provider.info}|STRING:{key}")
+                                                                  file_path=descriptor.path,
+                                                                  file_type=descriptor.extension,
+                                                                  info=f"{descriptor.info}|STRING:{key}")
                         new_limit = recursive_limit_size - len(str_struct_provider.data)
                         new_candidates = self.recursive_scan(str_struct_provider, depth, new_limit)
                         candidates.extend(new_candidates)
@@ -220,9 +348,9 @@ class AbstractScanner(ABC):
 
         if augmented_lines_for_keyword_rules:
             str_provider = StringContentProvider(augmented_lines_for_keyword_rules,
-                                                 file_path=struct_provider.file_path,
-                                                 file_type=struct_provider.file_type,
-                                                 info=f"{struct_provider.info}|KEYWORD")
+                                                 file_path=descriptor.path,
+                                                 file_type=descriptor.extension,
+                                                 info=f"{descriptor.info}|KEYWORD")
             new_candidates = self.scanner.scan(str_provider)
             augment_candidates(candidates, new_candidates)
 
@@ -278,8 +406,31 @@ class AbstractScanner(ABC):
         """
         recursive_limit_size = recursive_limit_size if isinstance(recursive_limit_size,
                                                                   int) else RECURSIVE_SCAN_LIMITATION
+        if isinstance(content_provider, MemberContentProvider):
+            # a part of members of huge archive is scanned in a pool process
+            return self.reference_scan(content_provider, depth, recursive_limit_size)
         candidates: List[Candidate] = []
         data: Optional[bytes] = None
+        if isinstance(content_provider, TextContentProvider) and content_provider.is_file and 0 < depth \
+                and self.config.spool_size < content_provider.data_size:
+            # only huge file is checked to be scanned without loading to memory, other files are sniffed in data
+            try:
+                with open(content_provider.file_path, "rb") as f:
+                    head = f.read(MAX_LINE_LENGTH)
+            except OSError as exc:
+                logger.warning(f"Cannot read file {content_provider.file_path} {exc}")
+                head = b""
+            info = content_provider.info or f"FILE:{content_provider.file_path}"
+            descriptor = Descriptor(content_provider.file_path, content_provider.file_type, info)
+            new_limit = recursive_limit_size - content_provider.data_size
+            if Util.is_sqlite3(head):
+                # database is queried in place without loading to memory
+                sqlite_candidates = self.sqlite_file_scan(content_provider.file_path, descriptor, depth, new_limit)
+                if sqlite_candidates is not None:
+                    return sqlite_candidates
+            elif self.is_spool_container(head, content_provider.file_type):
+                # huge container is read from the file by blocks without loading to memory
+                return self.spool_scan(content_provider.file_path, descriptor, depth, new_limit)
         if isinstance(content_provider, (TextContentProvider, ByteContentProvider)):
             # Feature to scan files which might be containers
             data = content_provider.data
@@ -1,4 +1,5 @@
 import bz2
+import io
 import logging
 from abc import ABC
 from pathlib import Path
@@ -7,6 +8,7 @@ from typing import List, Optional
 from credsweeper.credentials.candidate import Candidate
 from credsweeper.deep_scanner.abstract_scanner import AbstractScanner
 from credsweeper.file_handler.data_content_provider import DataContentProvider
+from credsweeper.file_handler.descriptor import Descriptor
 from credsweeper.utils.util import Util
 
 logger = logging.getLogger(__name__)
@@ -15,6 +17,20 @@ logger = logging.getLogger(__name__)
 class Bzip2Scanner(AbstractScanner, ABC):
     """Implements bzip2 scanning"""
 
+    def walk_bzip2(
+            self,  #
+            f: io.BufferedIOBase,  #
+            descriptor: Descriptor,  #
+            depth: int,  #
+            recursive_limit_size: int) -> List[Candidate]:
+        """Scans decompressed data from opened bzip2 archive with member_scan"""
+        file_path = Path(descriptor.path)
+        new_path = file_path.as_posix()
+        if ".bz2" == file_path.suffix:
+            new_path = new_path[:-4]
+        member_descriptor = Descriptor(new_path, Util.get_extension(new_path), f"{descriptor.info}|BZIP2:{file_path}")
+        return self.member_scan(f, member_descriptor, depth, recursive_limit_size)
+
     def data_scan(
             self,  #
             data_provider: DataContentProvider,  #
@@ -22,17 +38,8 @@ class Bzip2Scanner(AbstractScanner, ABC):
             recursive_limit_size: int) -> Optional[List[Candidate]]:
         """Extracts data from bzip2 archive and launches data_scan"""
         try:
-            file_path = Path(data_provider.file_path)
-            new_path = file_path.as_posix()
-            if ".bz2" == file_path.suffix:
-                new_path = new_path[:-4]
-            bzip2_content_provider = DataContentProvider(data=bz2.decompress(data_provider.data),
-                                                         file_path=new_path,
-                                                         file_type=Util.get_extension(new_path),
-                                                         info=f"{data_provider.info}|BZIP2:{file_path}")
-            new_limit = recursive_limit_size - len(bzip2_content_provider.data)
-            bzip2_candidates = self.recursive_scan(bzip2_content_provider, depth, new_limit)
-            return bzip2_candidates
+            with bz2.open(io.BytesIO(data_provider.data)) as f:
+                return self.walk_bzip2(f, data_provider.descriptor, depth, recursive_limit_size)
         except Exception as bzip2_exc:
             logger.error(f"{data_provider.file_path}:{bzip2_exc}")
         return None
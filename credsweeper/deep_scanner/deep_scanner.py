@@ -1,9 +1,28 @@
+import bz2
+import contextlib
+import gzip
+import io
 import logging
-from typing import List, Any, Tuple
+import lzma
+import math
+import os
+import sqlite3
+import tempfile
+from tarfile import TarFile
+from typing import List, Any, Tuple, Optional, Union, IO
+from zipfile import ZipFile
 
-from credsweeper.common.constants import MIN_DATA_LEN
+from credsweeper.common.constants import MIN_DATA_LEN, MAX_LINE_LENGTH, RECURSIVE_SCAN_LIMITATION, SPOOL_BLOCK_SIZE
 from credsweeper.config.config import Config
+from credsweeper.credentials.candidate import Candidate
+from credsweeper.credentials.digest_cache import DigestCache
+from credsweeper.file_handler.content_provider import ContentProvider
+from credsweeper.file_handler.file_path_extractor import FilePathExtractor
+from credsweeper.file_handler.member_content_provider import MemberContentProvider
+from credsweeper.file_handler.spooled_content_provider import SpooledContentProvider
+from credsweeper.file_handler.text_content_provider import TextContentProvider
 from credsweeper.scanner.scanner import Scanner
+from credsweeper.utils.sniffer import Sniffer
 from credsweeper.utils.util import Util
 from .byte_scanner import ByteScanner
 from .bzip2_scanner import Bzip2Scanner
@@ -68,6 +87,7 @@ class DeepScanner(
         """
         self.__config = config
         self.__scanner = scanner
+        self.__digest_cache = DigestCache(config.digest_cache_size)
 
     @property
     def config(self) -> Config:
@@ -77,6 +97,304 @@ class DeepScanner(
     def scanner(self) -> Scanner:
         return self.__scanner
 
+    @property
+    def digest_cache(self) -> DigestCache:
+        return self.__digest_cache
+
+    @staticmethod
+    def is_spool_container(head: bytes, extension: str) -> bool:
+        """Returns True for archives which members are extracted one by one without other representations"""
+        if Util.is_zip(head):
+            # office documents are scanned with third-party libraries which require all data
+            return extension not in (".xlsx", ".ods", ".docx", ".pptx")
+        return Util.is_bzip2(head) or Util.is_lzma(head) or Util.is_tar(head) or Util.is_gzip(head)
+
+    def spool_scan(
+            self,  #
+            spool_path: str,  #
+            descriptor: Descriptor,  #
+            depth: int,  #
+            recursive_limit_size: int) -> List[Candidate]:
+        """Scans oversize data from the file without loading to memory. Members of archives are extracted one by one,
+        sqlite3 database is queried in place, other data are scanned as text lines which are read by blocks.
+
+            Args:
+                spool_path: path to the file with the data
+                descriptor: path, extension and info of the data
+                depth: maximal level of recursion
+                recursive_limit_size: maximal bytes of opened files to prevent recursive zip-bomb attack
+        """
+        try:
+            with open(spool_path, "rb") as f:
+                head = f.read(MAX_LINE_LENGTH)
+            if 0 < depth and Util.is_sqlite3(head):
+                sqlite_candidates = self.sqlite_file_scan(spool_path, descriptor, depth, recursive_limit_size)
+                if sqlite_candidates is not None:
+                    return sqlite_candidates
+            if 0 < depth and self.is_spool_container(head, descriptor.extension):
+                if Util.is_zip(head):
+                    with ZipFile(spool_path) as zf:
+                        return self.walk_zip(zf, descriptor, depth, recursive_limit_size)
+                if Util.is_bzip2(head):
+                    with bz2.open(spool_path) as f:
+                        return self.walk_bzip2(f, descriptor, depth, recursive_limit_size)
+                if Util.is_lzma(head):
+                    with lzma.open(spool_path) as f:
+                        return self.walk_lzma(f, descriptor, depth, recursive_limit_size)
+                if Util.is_tar(head):
+                    with TarFile(spool_path) as tf:
+                        return self.walk_tar(tf, descriptor, depth, recursive_limit_size)
+                with gzip.open(spool_path) as f:
+                    return self.walk_gzip(f, descriptor, depth, recursive_limit_size)
+            logger.info(f"Oversize data {descriptor.path} {descriptor.info} are scanned as plain text only")
+            spooled_content_provider = SpooledContentProvider(spool_path=spool_path,
+                                                              file_path=descriptor.path,
+                                                              file_type=descriptor.extension,
+                                                              info=f"{descriptor.info}|RAW")
+            return self.scanner.scan(spooled_content_provider)
+        except Exception as exc:
+            logger.error(f"{descriptor.path}:{exc}")
+        return []
+
+    def sqlite_file_scan(
+            self,  #
+            path: str,  #
+            descriptor: Descriptor,  #
+            depth: int,  #
+            recursive_limit_size: int) -> Optional[List[Candidate]]:
+        """Scans sqlite3 database file in place without reading to memory.
+        Returns None when the file cannot be opened as a database"""
+        try:
+            sqlite3db = Sqlite3Scanner.connect_file(path)
+        except sqlite3.Error as exc:
+            logger.warning(f"{path} cannot be opened in place: {exc}")
+            return None
+        with contextlib.closing(sqlite3db):
+            try:
+                return self.sqlite_scan(sqlite3db, descriptor, depth, recursive_limit_size)
+            except sqlite3.Error as exc:
+                logger.error(f"{descriptor.path}:{exc}")
+        return None
+
+    @staticmethod
+    def get_split_container(head: bytes, extension: str) -> Optional[str]:
+        """Returns type of archive which members might be split into parts: "ZIP", "TAR" or "GZIP" for compressed
+        data which might be such archive. The same order of checks as in get_deep_scanners"""
+        if Util.is_zip(head):
+            return "ZIP" if DeepScanner.is_spool_container(head, extension) else None
+        if Util.is_bzip2(head) or Util.is_lzma(head):
+            return None
+        if Util.is_tar(head):
+            return "TAR"
+        if Util.is_gzip(head):
+            return "GZIP"
+        return None
+
+    @staticmethod
+    def extract_member(
+            stack: contextlib.ExitStack,  #
+            stream: Union[IO[bytes], io.BufferedIOBase],  #
+            recursive_limit_size: int) -> IO[bytes]:
+        """Copies the member by blocks to anonymous temporary file, so nested archive is opened with random access"""
+        spool = stack.enter_context(tempfile.TemporaryFile())
+        while block := stream.read(SPOOL_BLOCK_SIZE):
+            spool.write(block)
+            if recursive_limit_size < spool.tell():
+                raise ValueError(f"size {spool.tell()} is over limit {recursive_limit_size}")
+        spool.seek(0)
+        return spool
+
+    def open_member(
+            self,  #
+            stack: contextlib.ExitStack,  #
+            stream: IO[bytes],  #
+            container: str,  #
+            name: str,  #
+            descriptor: Descriptor,  #
+            recursive_limit_size: int) -> Tuple[IO[bytes], Descriptor, int]:
+        """Extracts a member of the container to temporary file as member_scan does during scan of whole file
+
+            Args:
+                stack: context for opened archives and temporary file
+                stream: opened container with random access
+                container: type of the container - "ZIP", "TAR" or "GZIP"
+                name: name of the member, decompressed path for GZIP
+                descriptor: path, extension and info of the container
+                recursive_limit_size: maximal bytes of opened files to prevent recursive zip-bomb attack
+
+            Return:
+                the extracted member, descriptor of the member and reduced limit
+        """
+        member_stream: Union[IO[bytes], io.BufferedIOBase]
+        if "ZIP" == container:
+            zf = stack.enter_context(ZipFile(stream))
+            member_stream = stack.enter_context(zf.open(name))
+            member_descriptor = Descriptor(descriptor.path, Util.get_extension(name), f"{descriptor.info}|ZIP:{name}")
+        elif "TAR" == container:
+            tf = stack.enter_context(TarFile(fileobj=stream))
+            if (tar_stream := tf.extractfile(name)) is None:
+                raise ValueError(f"{name} is not a regular file")
+            member_stream = stack.enter_context(tar_stream)
+            member_descriptor = Descriptor(descriptor.path, Util.get_extension(name), f"{descriptor.info}|TAR:{name}")
+        else:
+            member_stream = stack.enter_context(gzip.open(stream))
+            member_descriptor = self.get_gzip_descriptor(descriptor)
+        spool = self.extract_member(stack, member_stream, recursive_limit_size)
+        return spool, member_descriptor, recursive_limit_size - os.fstat(spool.fileno()).st_size
+
+    def list_members(
+            self,  #
+            stream: IO[bytes],  #
+            descriptor: Descriptor,  #
+            chain: Tuple[Tuple[str, str], ...],  #
+            depth: int,  #
+            recursive_limit_size: int) -> Optional[List[Tuple[Tuple[Tuple[str, str], ...], str, int, int]]]:
+        """Lists members of the archive for split. Members of nested archives of fanout_size bytes or more are listed
+        instead of the archives with the chain to them, so they are split too. Nested archives are extracted
+        to temporary files in the main process to read their directories.
+
+            Args:
+                stream: opened archive with random access
+                descriptor: path, extension and info of the archive
+                chain: types of containers and names of members from the file to the archive
+                depth: level of recursion of the members
+                recursive_limit_size: maximal bytes of opened files to prevent recursive zip-bomb attack
+
+            Return:
+                chain, type of container, index or offset and size of each member or None when the data is not
+                an archive which may be split
+        """
+        if 0 >= depth:
+            return None
+        head = stream.read(MAX_LINE_LENGTH)
+        stream.seek(0)
+        container = self.get_split_container(head, descriptor.extension)
+        if "GZIP" == container:
+            # decompressed data are walked on next level
+            with contextlib.ExitStack() as stack:
+                spool, member_descriptor, new_limit = self.open_member(stack, stream, "GZIP", "", descriptor,
+                                                                       recursive_limit_size)
+                if FilePathExtractor.is_find_by_ext_file(self.config, member_descriptor.extension):
+                    return None
+                return self.list_members(spool, member_descriptor, chain + (("GZIP", member_descriptor.path), ),
+                                         depth - 1, new_limit)
+        members: List[Tuple[int, str, int]] = []
+        if "ZIP" == container:
+            with ZipFile(stream) as zf:
+                members = [(i, x.filename, 0 if x.is_dir() else x.file_size) for i, x in enumerate(zf.infolist())]
+        elif "TAR" == container:
+            # only headers are read - data of members are skipped with seek
+            with TarFile(fileobj=stream) as tf:
+                members = [(x.offset, x.name, x.size if x.isreg() else 0) for x in tf.getmembers()]
+        else:
+            return None
+        result: List[Tuple[Tuple[Tuple[str, str], ...], str, int, int]] = []
+        for ref, name, size in members:
+            nested = None
+            if self.config.fanout_size <= size <= recursive_limit_size \
+                    and not FilePathExtractor.check_exclude_file(self.config, name) \
+                    and not FilePathExtractor.is_find_by_ext_file(self.config, Util.get_extension(name)):
+                try:
+                    with contextlib.ExitStack() as stack:
+                        stream.seek(0)
+                        spool, member_descriptor, new_limit = self.open_member(stack, stream, container, name,
+                                                                               descriptor, recursive_limit_size)
+                        nested = self.list_members(spool, member_descriptor, chain + ((container, name), ), depth - 1,
+                                                   new_limit)
+                except Exception as exc:
+                    # the member is scanned as a whole
+                    logger.debug(f"{descriptor.info}|{container}:{name}:{exc}")
+            if nested:
+                result.extend(nested)
+            else:
+                result.append((chain, container, ref, size))
+        return result
+
+    def get_member_providers(self, content_provider: ContentProvider, depth: int,
+                             parts: int) -> Optional[List[ContentProvider]]:
+        """Splits members of huge ZIP, TAR or gzipped archive file into parts of similar size for parallel scan.
+        Members of big nested archives are split too, so e.g. a jar inside of release zip does not pin one process.
+
+            Args:
+                content_provider: provider of a file
+                depth: maximal level of recursion
+                parts: number of parts for the members. Members of different containers are not mixed in a part,
+                    so there might be more parts for nested archives
+
+            Return:
+                providers which refer to the parts of members or None when the file is scanned as a whole
+        """
+        if not isinstance(content_provider, TextContentProvider) or not content_provider.is_file \
+                or 0 >= depth or 1 >= parts or self.config.fanout_size > content_provider.data_size \
+                or FilePathExtractor.is_find_by_ext_file(self.config, content_provider.file_type):
+            return None
+        info = content_provider.info or f"FILE:{content_provider.file_path}"
+        try:
+            with open(content_provider.file_path, "rb") as f:
+                members = self.list_members(f, Descriptor(content_provider.file_path, content_provider.file_type, info),
+                                            (), depth, RECURSIVE_SCAN_LIMITATION - content_provider.data_size)
+        except Exception as exc:
+            # the file is scanned as a whole with reporting of the issue
+            logger.debug(f"{content_provider.file_path}:{exc}")
+            return None
+        if not members or 1 >= len(members):
+            return None
+        part_size = max(1, math.ceil(sum(x[3] for x in members) / parts))
+        member_providers: List[ContentProvider] = []
+        start = 0
+        size = 0
+        for i, (chain, container, _, member_size) in enumerate(members, start=1):
+            size += member_size
+            # a part refers to members of one container
+            if part_size <= size or len(members) == i or chain != members[i][0]:
+                member_providers.append(
+                    MemberContentProvider(file_path=content_provider.file_path,
+                                          file_type=content_provider.file_type,
+                                          info=info,
+                                          chain=chain,
+                                          container=container,
+                                          members=tuple(x[2] for x in members[start:i]),
+                                          size=size))
+                start = i
+                size = 0
+        logger.info(
+            f"{content_provider.file_path}: {len(members)} members are split into {len(member_providers)} parts")
+        return member_providers
+
+    def reference_scan(
+            self,  #
+            member_provider: MemberContentProvider,  #
+            depth: int,  #
+            recursive_limit_size: int) -> List[Candidate]:
+        """Reopens the archive file, extracts nested archives along the chain and scans the referenced members.
+        Depth and limit are reduced on each level as in scan of the whole file.
+
+            Args:
+                member_provider: reference to the members
+                depth: maximal level of recursion
+                recursive_limit_size: maximal bytes of opened files to prevent recursive zip-bomb attack
+        """
+        try:
+            with contextlib.ExitStack() as stack:
+                stream: IO[bytes] = stack.enter_context(open(member_provider.file_path, "rb"))
+                recursive_limit_size -= os.path.getsize(member_provider.file_path)
+                descriptor = Descriptor(member_provider.file_path, member_provider.file_type, member_provider.info)
+                for container, name in member_provider.chain:
+                    stream, descriptor, recursive_limit_size = self.open_member(stack, stream, container, name,
+                                                                                descriptor, recursive_limit_size)
+                    depth -= 1
+                if 0 >= depth:
+                    # the archive is not scanned on the level
+                    return []
+                if "ZIP" == member_provider.container:
+                    zf = stack.enter_context(ZipFile(stream))
+                    return self.walk_zip(zf, descriptor, depth, recursive_limit_size, member_provider.members)
+                tf = stack.enter_context(TarFile(fileobj=stream))
+                return self.walk_tar(tf, descriptor, depth, recursive_limit_size, member_provider.members)
+        except Exception as exc:
+            logger.error(f"{member_provider.file_path}:{exc}")
+        return []
+
     @staticmethod
     def get_deep_scanners(data: bytes, descriptor: Descriptor, depth: int) -> Tuple[List[Any], List[Any]]:
         """Returns possibly scan methods for the data depends on content and fallback scanners"""
@@ -163,8 +481,11 @@ class DeepScanner(
             pass
         elif not Util.is_binary(data):
             if 0 < depth:
-                deep_scanners.append(PatchScanner)
-                deep_scanners.append(EncoderScanner)
+                # cheap sniffing skips the scanners which cannot recognize the data
+                if Sniffer.is_patch(data):
+                    deep_scanners.append(PatchScanner)
+                if Sniffer.is_base64(data):
+                    deep_scanners.append(EncoderScanner)
                 deep_scanners.append(LangScanner)
             deep_scanners.append(ByteScanner)
         else:
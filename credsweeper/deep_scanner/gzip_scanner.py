@@ -8,6 +8,7 @@ from typing import List, Optional
 from credsweeper.credentials.candidate import Candidate
 from credsweeper.deep_scanner.abstract_scanner import AbstractScanner
 from credsweeper.file_handler.data_content_provider import DataContentProvider
+from credsweeper.file_handler.descriptor import Descriptor
 from credsweeper.utils.util import Util
 
 logger = logging.getLogger(__name__)
@@ -16,6 +17,25 @@ logger = logging.getLogger(__name__)
 class GzipScanner(AbstractScanner, ABC):
     """Realises gzip scanning"""
 
+    @staticmethod
+    def get_gzip_descriptor(descriptor: Descriptor) -> Descriptor:
+        """Returns descriptor of decompressed data of gzip archive"""
+        file_path = Path(descriptor.path)
+        new_path = file_path.as_posix()
+        if ".gz" == file_path.suffix:
+            new_path = new_path[:-3]
+        return Descriptor(new_path, Util.get_extension(new_path), f"{descriptor.info}|GZIP:{new_path}")
+
+    def walk_gzip(
+            self,  #
+            f: io.BufferedIOBase,  #
+            descriptor: Descriptor,  #
+            depth: int,  #
+            recursive_limit_size: int) -> List[Candidate]:
+        """Scans decompressed data from opened gzip archive with member_scan"""
+        member_descriptor = self.get_gzip_descriptor(descriptor)
+        return self.member_scan(f, member_descriptor, depth, recursive_limit_size)
+
     def data_scan(
             self,  #
             data_provider: DataContentProvider,  #
@@ -24,17 +44,7 @@ class GzipScanner(AbstractScanner, ABC):
         """Extracts data from gzip archive and launches data_scan"""
         try:
             with gzip.open(io.BytesIO(data_provider.data)) as f:
-                file_path = Path(data_provider.file_path)
-                new_path = file_path.as_posix()
-                if ".gz" == file_path.suffix:
-                    new_path = new_path[:-3]
-                gzip_content_provider = DataContentProvider(data=f.read(),
-                                                            file_path=new_path,
-                                                            file_type=Util.get_extension(new_path),
-                                                            info=f"{data_provider.info}|GZIP:{new_path}")
-                new_limit = recursive_limit_size - len(gzip_content_provider.data)
-                gzip_candidates = self.recursive_scan(gzip_content_provider, depth, new_limit)
-                return gzip_candidates
+                return self.walk_gzip(f, data_provider.descriptor, depth, recursive_limit_size)
         except Exception as gzip_exc:
             logger.error(f"{data_provider.file_path}:{gzip_exc}")
         return None
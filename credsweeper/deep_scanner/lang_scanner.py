@@ -19,7 +19,7 @@ class LangScanner(AbstractScanner, ABC):
             depth: int,  #
             recursive_limit_size: int) -> Optional[List[Candidate]]:
         """Tries to represent data as markup language and scan as structure"""
-        if result := data_provider.represent_as_structure():
+        if result := data_provider.represent_as_structure(self.config.parse_size_budget, self.config.parse_time_budget):
             struct_data_provider = StructContentProvider(struct=data_provider.structure,
                                                          file_path=data_provider.file_path,
                                                          file_type=data_provider.file_type,
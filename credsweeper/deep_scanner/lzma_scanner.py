@@ -1,3 +1,4 @@
+import io
 import logging
 import lzma
 from abc import ABC
@@ -7,6 +8,7 @@ from typing import List, Optional
 from credsweeper.credentials.candidate import Candidate
 from credsweeper.deep_scanner.abstract_scanner import AbstractScanner
 from credsweeper.file_handler.data_content_provider import DataContentProvider
+from credsweeper.file_handler.descriptor import Descriptor
 from credsweeper.utils.util import Util
 
 logger = logging.getLogger(__name__)
@@ -15,6 +17,22 @@ logger = logging.getLogger(__name__)
 class LzmaScanner(AbstractScanner, ABC):
     """Implements lzma scanning"""
 
+    def walk_lzma(
+            self,  #
+            f: io.BufferedIOBase,  #
+            descriptor: Descriptor,  #
+            depth: int,  #
+            recursive_limit_size: int) -> List[Candidate]:
+        """Scans decompressed data from opened lzma archive with member_scan"""
+        file_path = Path(descriptor.path)
+        new_path = file_path.as_posix()
+        if ".xz" == file_path.suffix:
+            new_path = new_path[:-3]
+        elif ".lzma" == file_path.suffix:
+            new_path = new_path[:-5]
+        member_descriptor = Descriptor(new_path, Util.get_extension(new_path), f"{descriptor.info}|LZMA:{file_path}")
+        return self.member_scan(f, member_descriptor, depth, recursive_limit_size)
+
     def data_scan(
             self,  #
             data_provider: DataContentProvider,  #
@@ -22,19 +40,8 @@ class LzmaScanner(AbstractScanner, ABC):
             recursive_limit_size: int) -> Optional[List[Candidate]]:
         """Extracts data from lzma archive and launches data_scan"""
         try:
-            file_path = Path(data_provider.file_path)
-            new_path = file_path.as_posix()
-            if ".xz" == file_path.suffix:
-                new_path = new_path[:-3]
-            elif ".lzma" == file_path.suffix:
-                new_path = new_path[:-5]
-            lzma_content_provider = DataContentProvider(data=lzma.decompress(data_provider.data),
-                                                        file_path=new_path,
-                                                        file_type=Util.get_extension(new_path),
-                                                        info=f"{data_provider.info}|LZMA:{file_path}")
-            new_limit = recursive_limit_size - len(lzma_content_provider.data)
-            lzma_candidates = self.recursive_scan(lzma_content_provider, depth, new_limit)
-            return lzma_candidates
+            with lzma.open(io.BytesIO(data_provider.data)) as f:
+                return self.walk_lzma(f, data_provider.descriptor, depth, recursive_limit_size)
         except Exception as lzma_exc:
             logger.error(f"{data_provider.file_path}:{lzma_exc}")
         return None
@@ -1,15 +1,18 @@
+import contextlib
 import logging
 import os.path
 import sqlite3
 import sys
 import tempfile
 from abc import ABC
-from typing import List, Optional, Tuple, Any, Generator
+from pathlib import Path
+from typing import List, Optional, Tuple, Generator
 
+from credsweeper.common.constants import SQLITE_BATCH_SIZE
 from credsweeper.credentials.candidate import Candidate
 from credsweeper.deep_scanner.abstract_scanner import AbstractScanner
 from credsweeper.file_handler.data_content_provider import DataContentProvider
-from credsweeper.file_handler.struct_content_provider import StructContentProvider
+from credsweeper.file_handler.descriptor import Descriptor
 
 logger = logging.getLogger(__name__)
 
@@ -17,63 +20,141 @@ logger = logging.getLogger(__name__)
 class Sqlite3Scanner(AbstractScanner, ABC):
     """Implements SQLite3 database scanning"""
 
-    @staticmethod
-    def __walk(sqlite3db) -> Generator[Tuple[str, Any], None, None]:
-        sqlite3db.row_factory = sqlite3.Row
-        cursor = sqlite3db.cursor()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';")
-        for table in cursor.fetchall():
-            table_name = table[0]
-            try:
-                cursor.execute(f"SELECT * FROM {table_name}")
-                for row in cursor:
-                    yield table_name, dict(row)
-            except sqlite3.DatabaseError as exc:
-                print(f"Error reading table {table_name}: {exc}")
+    # values of the types might be scanned, other ones are skipped in structure scan
+    SCANNABLE_TYPES = "('text','blob')"
 
     @staticmethod
-    def walk_sqlite(data: bytes) -> Generator[Tuple[str, Any], None, None]:
-        """Yields data from sqlite3 database"""
+    @contextlib.contextmanager
+    def connect_data(data: bytes) -> Generator[sqlite3.Connection, None, None]:
+        """Opens sqlite3 database from the data"""
         if 10 < sys.version_info.minor:
             # Added in version 3.11
-            with sqlite3.connect(":memory:") as sqlite3db:
+            with contextlib.closing(sqlite3.connect(":memory:")) as sqlite3db:
                 sqlite3db.deserialize(data)  # type: ignore
-                yield from Sqlite3Scanner.__walk(sqlite3db)
+                yield sqlite3db
         elif "nt" != os.name:
             # a tmpfile has to be used. TODO: remove when 3.10 will deprecate
             with tempfile.NamedTemporaryFile(suffix=".sqlite") as t:
                 t.write(data)
                 t.flush()
-                with sqlite3.connect(t.name) as sqlite3db:
-                    yield from Sqlite3Scanner.__walk(sqlite3db)
-        elif "nt" == os.name:
+                with contextlib.closing(sqlite3.connect(t.name)) as sqlite3db:
+                    yield sqlite3db
+        else:
             # windows trick. TODO: remove when 3.10 will deprecate
             with tempfile.NamedTemporaryFile(delete=False, suffix=".sqlite") as t:
                 t.write(data)
                 t.flush()
-            sqlite3db = sqlite3.connect(t.name)
-            yield from Sqlite3Scanner.__walk(sqlite3db)
-            sqlite3db.close()
-            if os.path.exists(t.name):
-                os.remove(t.name)
+            try:
+                with contextlib.closing(sqlite3.connect(t.name)) as sqlite3db:
+                    yield sqlite3db
+            finally:
+                if os.path.exists(t.name):
+                    os.remove(t.name)
+
+    @staticmethod
+    def connect_file(path: str) -> sqlite3.Connection:
+        """Opens sqlite3 database file in place in read-only mode"""
+        return sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+
+    @staticmethod
+    def get_affinity(declared_type: Optional[str]) -> str:
+        """Returns type affinity of a column by the declared type according to SQLite rules"""
+        declared_type = declared_type.upper() if declared_type else ""
+        if "INT" in declared_type:
+            return "INTEGER"
+        if "CHAR" in declared_type or "CLOB" in declared_type or "TEXT" in declared_type:
+            return "TEXT"
+        if "BLOB" in declared_type or not declared_type:
+            return "BLOB"
+        if "REAL" in declared_type or "FLOA" in declared_type or "DOUB" in declared_type:
+            return "REAL"
+        return "NUMERIC"
+
+    @staticmethod
+    def quote(name: str) -> str:
+        """Returns quoted identifier for SQL query"""
+        return '"' + name.replace('"', '""') + '"'
+
+    @staticmethod
+    def get_select_query(table: str, columns: List[Tuple[str, Optional[str]]]) -> str:
+        """Returns query which selects only text and blob values of the columns.
+
+        Columns with TEXT affinity keep numbers as text, other columns may keep any types,
+        so their values are checked during the query without transfer of the numbers.
+
+        Args:
+            table: name of the table
+            columns: names and declared types of the columns
+
+        """
+        values = []
+        conditions = []
+        for name, declared_type in columns:
+            column = Sqlite3Scanner.quote(name)
+            if "TEXT" == Sqlite3Scanner.get_affinity(declared_type):
+                values.append(column)
+            else:
+                values.append(f"CASE WHEN typeof({column}) IN {Sqlite3Scanner.SCANNABLE_TYPES} THEN {column} END")
+            conditions.append(f"typeof({column}) IN {Sqlite3Scanner.SCANNABLE_TYPES}")
+        return f"SELECT {','.join(values)} FROM {Sqlite3Scanner.quote(table)} WHERE {' OR '.join(conditions)}"
+
+    def sqlite_scan(
+            self,  #
+            sqlite3db: sqlite3.Connection,  #
+            descriptor: Descriptor,  #
+            depth: int,  #
+            recursive_limit_size: int) -> List[Candidate]:
+        """Scans text and blob values of all tables in the database by batches of rows.
+        Each row is scanned as a structure with keyword check of the column names once per table.
+
+            Args:
+                sqlite3db: opened database
+                descriptor: path, extension and info of the database
+                depth: maximal level of recursion
+                recursive_limit_size: maximal bytes of opened files to prevent recursive zip-bomb attack
+        """
+        candidates: List[Candidate] = []
+        if 0 > depth:
+            # break recursion if maximal depth is reached
+            return candidates
+        cursor = sqlite3db.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';")
+        for table, in cursor.fetchall():
+            try:
+                cursor.execute(f"SELECT * FROM {self.quote(table)} LIMIT 0")
+                names = [x[0] for x in cursor.description]
+                declared_types = {x[1]: x[2] for x in cursor.execute(f"PRAGMA table_info({self.quote(table)})")}
+                columns = [(x, declared_types.get(x)) for x in names]
+                keyword_matches = [self.scanner.keywords_required_substrings_check(x.lower()) for x in names]
+                # rows with `key` and `value` columns are combined for keyword rules as in structure scan
+                key_value_table = bool(next(self.key_value_combination(dict.fromkeys(names, "key")), None))
+                table_descriptor = Descriptor(descriptor.path, descriptor.extension,
+                                              f"{descriptor.info}|SQLite3.{table}")
+                cursor.execute(self.get_select_query(table, columns))
+                while rows := cursor.fetchmany(SQLITE_BATCH_SIZE):
+                    for row in rows:
+                        items = [(name, value, keyword_match)
+                                 for name, value, keyword_match in zip(names, row, keyword_matches) if value]
+                        if key_value_table:
+                            for key, value in self.key_value_combination(dict(zip(names, row))):
+                                keyword_match = self.scanner.keywords_required_substrings_check(key.lower())
+                                items.append((key, value, keyword_match))
+                        if items:
+                            candidates.extend(self.items_scan(items, table_descriptor, depth - 1, recursive_limit_size))
+            except sqlite3.DatabaseError as exc:
+                logger.error(f"Error reading table {table}: {exc}")
+        return candidates
 
     def data_scan(
             self,  #
             data_provider: DataContentProvider,  #
             depth: int,  #
             recursive_limit_size: int) -> Optional[List[Candidate]]:
-        """Extracts data file from .ar (debian) archive and launches data_scan"""
+        """Opens sqlite3 database from the data and launches sqlite_scan"""
         try:
-            candidates: List[Candidate] = []
             new_limit = recursive_limit_size - len(data_provider.data)
-            for table, row in self.walk_sqlite(data_provider.data):
-                struct_content_provider = StructContentProvider(struct=row,
-                                                                file_path=data_provider.file_path,
-                                                                file_type=data_provider.file_type,
-                                                                info=f"{data_provider.info}|SQLite3.{table}")
-                if new_candidates := self.structure_scan(struct_content_provider, depth, new_limit):
-                    candidates.extend(new_candidates)
-            return candidates
+            with self.connect_data(data_provider.data) as sqlite3db:
+                return self.sqlite_scan(sqlite3db, data_provider.descriptor, depth, new_limit)
         except Exception as exc:
             logger.error(exc)
         return None
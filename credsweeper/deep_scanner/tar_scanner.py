@@ -1,12 +1,13 @@
 import io
 import logging
 from abc import ABC
-from tarfile import TarFile
-from typing import List, Optional
+from tarfile import TarFile, TarInfo
+from typing import List, Optional, Sequence, Iterable, Generator
 
 from credsweeper.credentials.candidate import Candidate
 from credsweeper.deep_scanner.abstract_scanner import AbstractScanner
 from credsweeper.file_handler.data_content_provider import DataContentProvider
+from credsweeper.file_handler.descriptor import Descriptor
 from credsweeper.file_handler.file_path_extractor import FilePathExtractor
 from credsweeper.utils.util import Util
 
@@ -16,6 +17,43 @@ logger = logging.getLogger(__name__)
 class TarScanner(AbstractScanner, ABC):
     """Implements tar scanning"""
 
+    @staticmethod
+    def read_tar_members(tf: TarFile, offsets: Sequence[int]) -> Generator[TarInfo, None, None]:
+        """Reads headers of tar members at the offsets without walk through all headers of the archive"""
+        if tf.fileobj is None:
+            raise ValueError("Tar archive is not opened from a file object")
+        for offset in offsets:
+            tf.fileobj.seek(offset)
+            yield TarInfo.fromtarfile(tf)
+
+    def walk_tar(
+            self,  #
+            tf: TarFile,  #
+            descriptor: Descriptor,  #
+            depth: int,  #
+            recursive_limit_size: int,  #
+            members: Optional[Sequence[int]] = None) -> List[Candidate]:
+        """Extracts files one by one from opened tar archive and launches member_scan.
+        Only the members with given offsets of headers are extracted when they are set"""
+        candidates = []
+        tar_members: Iterable[TarInfo] = tf.getmembers() if members is None else self.read_tar_members(tf, members)
+        for tfi in tar_members:
+            # skip directory
+            if not tfi.isreg():
+                continue
+            if FilePathExtractor.check_exclude_file(self.config, tfi.name):
+                continue
+            if 0 > recursive_limit_size - tfi.size:
+                logger.error(f"{tfi.name}: size {tfi.size}"
+                             f" is over limit {recursive_limit_size} depth:{depth}")
+                continue
+            with tf.extractfile(tfi) as f:
+                member_descriptor = Descriptor(descriptor.path, Util.get_extension(tfi.name),
+                                               f"{descriptor.info}|TAR:{tfi.name}")
+                tar_candidates = self.member_scan(f, member_descriptor, depth, recursive_limit_size)
+                candidates.extend(tar_candidates)
+        return candidates
+
     def data_scan(
             self,  #
             data_provider: DataContentProvider,  #
@@ -23,28 +61,8 @@ class TarScanner(AbstractScanner, ABC):
             recursive_limit_size: int) -> Optional[List[Candidate]]:
         """Extracts files one by one from tar archive and launches data_scan"""
         try:
-            candidates = []
             with TarFile(fileobj=io.BytesIO(data_provider.data)) as tf:
-                for tfi in tf.getmembers():
-                    # skip directory
-                    if not tfi.isreg():
-                        continue
-                    if FilePathExtractor.check_exclude_file(self.config, tfi.name):
-                        continue
-                    if 0 > recursive_limit_size - tfi.size:
-                        logger.error(f"{tfi.name}: size {tfi.size}"
-                                     f" is over limit {recursive_limit_size} depth:{depth}")
-                        continue
-                    with tf.extractfile(tfi) as f:
-                        tar_content_provider = DataContentProvider(data=f.read(),
-                                                                   file_path=data_provider.file_path,
-                                                                   file_type=Util.get_extension(tfi.name),
-                                                                   info=f"{data_provider.info}|TAR:{tfi.name}")
-                        # Nevertheless, use extracted data size
-                        new_limit = recursive_limit_size - len(tar_content_provider.data)
-                        tar_candidates = self.recursive_scan(tar_content_provider, depth, new_limit)
-                        candidates.extend(tar_candidates)
-            return candidates
+                return self.walk_tar(tf, data_provider.descriptor, depth, recursive_limit_size)
         except Exception as tar_exc:
             # too many exception types might be produced with broken tar
             logger.error(f"{data_provider.file_path}:{tar_exc}")
@@ -1,7 +1,7 @@
 import io
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Union, Tuple, Sequence
+from typing import Union, Tuple, Sequence, Generator
 
 from credsweeper.config.config import Config
 from credsweeper.file_handler.content_provider import ContentProvider
@@ -41,3 +41,15 @@ class AbstractProvider(ABC):
 
         """
         raise NotImplementedError()
+
+    def yield_scannable_files(self, config: Config) -> Generator[ContentProvider, None, None]:
+        """Yield file objects for analysis. Scan may start before all objects are found.
+
+        Args:
+            config: dict of credsweeper configuration
+
+        Return:
+            generator of file objects to analyse
+
+        """
+        yield from self.get_scannable_files(config)
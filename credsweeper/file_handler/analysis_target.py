@@ -1,110 +1,124 @@
-from functools import cached_property
-from typing import List, Optional
+from typing import Optional, Sequence
 
 from credsweeper.file_handler.descriptor import Descriptor
 
 
 class AnalysisTarget:
-    """AnalysisTarget"""
+    """AnalysisTarget
+
+    One target is created for each line, so slots are used instead of instance dict. Stripped and lowered forms
+    of the line are computed once on first access.
+
+    """
+
+    __slots__ = ("__line_pos", "__lines", "__line_nums", "__descriptor", "__line", "__offset", "__line_strip",
+                 "__line_lower", "__line_lower_strip")
 
     def __init__(
         self,
         line_pos: int,
-        lines: List[str],
-        line_nums: List[int],
+        lines: Sequence[str],
+        line_nums: Sequence[int],
         descriptor: Descriptor,
         line: Optional[str] = None,
         offset: Optional[int] = None,
+        line_strip: Optional[str] = None,
     ):
         self.__line_pos = line_pos
         self.__lines = lines
         self.__line_nums = line_nums
         self.__descriptor = descriptor
-        self.__line = line
+        # chunked target has own line, normal target uses the line from lines
+        self.__line = lines[line_pos] if line is None else line
         self.__offset = offset
+        # the stripped line may be known by content provider already
+        self.__line_strip = line_strip
+        self.__line_lower: Optional[str] = None
+        self.__line_lower_strip: Optional[str] = None
 
-    @cached_property
+    @property
     def offset(self) -> Optional[int]:
-        """cached value"""
+        """offset of chunk"""
         # when the offset is not None - it means that original line was split into chunks
         return self.__offset
 
-    @cached_property
+    @property
     def line(self) -> str:
-        """cached value"""
-        if self.__line is None:
-            # normal target
-            return self.__lines[self.__line_pos]
-        else:
-            # chunked target
-            return self.__line
-
-    @cached_property
+        """the line or the chunk"""
+        return self.__line
+
+    @property
     def line_len(self) -> int:
-        """cached value"""
-        return len(self.line)
+        """length of the line"""
+        return len(self.__line)
 
-    @cached_property
+    @property
     def line_strip(self) -> str:
         """cached value"""
-        return self.line.strip()
+        if self.__line_strip is None:
+            self.__line_strip = self.__line.strip()
+        return self.__line_strip
 
-    @cached_property
+    @property
     def line_strip_len(self) -> int:
-        """cached value"""
+        """length of stripped line"""
         return len(self.line_strip)
 
-    @cached_property
+    @property
     def line_lower(self) -> str:
         """cached value"""
-        return self.line.lower()
+        if self.__line_lower is None:
+            self.__line_lower = self.__line.lower()
+        return self.__line_lower
 
-    @cached_property
+    @property
     def line_lower_strip(self) -> str:
         """cached value"""
-        return self.line_lower.strip()
+        if self.__line_lower_strip is None:
+            self.__line_lower_strip = self.line_lower.strip()
+        return self.__line_lower_strip
 
-    @cached_property
-    def lines(self) -> List[str]:
-        """cached value"""
+    @property
+    def lines(self) -> Sequence[str]:
+        """all lines of the content"""
         return self.__lines
 
-    @cached_property
+    @property
     def lines_len(self) -> int:
-        """cached value"""
+        """number of all lines"""
         return len(self.__lines)
 
-    @cached_property
+    @property
     def line_pos(self) -> int:
-        """cached value"""
+        """position of the line in lines"""
         return self.__line_pos
 
-    @cached_property
+    @property
     def line_num(self) -> int:
-        """cached value"""
+        """number of the line"""
         return self.__line_nums[self.__line_pos]
 
-    @cached_property
-    def line_nums(self) -> List[int]:
-        """cached value"""
+    @property
+    def line_nums(self) -> Sequence[int]:
+        """numbers of all lines"""
         return self.__line_nums
 
-    @cached_property
+    @property
     def file_path(self) -> Optional[str]:
-        """cached value"""
+        """path from descriptor"""
         return self.__descriptor.path
 
-    @cached_property
+    @property
     def file_type(self) -> Optional[str]:
-        """cached value"""
+        """extension from descriptor"""
         return self.__descriptor.extension
 
-    @cached_property
+    @property
     def info(self) -> Optional[str]:
-        """cached value"""
+        """info from descriptor"""
         return self.__descriptor.info
 
-    @cached_property
+    @property
     def descriptor(self) -> Descriptor:
-        """cached value"""
+        """descriptor of the content"""
         return self.__descriptor
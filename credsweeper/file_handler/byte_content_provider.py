@@ -29,6 +29,11 @@ class ByteContentProvider(ContentProvider):
         """data RO getter for ByteContentProvider"""
         return self.__data
 
+    @property
+    def data_size(self) -> int:
+        """data_size getter for ByteContentProvider"""
+        return len(self.__data) if self.__data is not None else 0
+
     def free(self) -> None:
         """free data after scan to reduce memory usage"""
         self.__data = None
@@ -42,7 +47,7 @@ class ByteContentProvider(ContentProvider):
     def lines(self) -> List[str]:
         """lines RO getter for ByteContentProvider"""
         if self.__lines is None:
-            self.__lines = Util.decode_bytes(self.__data)
+            self.__lines = Util.decode_bytes(self.data)
         return self.__lines if self.__lines is not None else []
 
     def yield_analysis_target(self, min_len: int) -> Generator[AnalysisTarget, None, None]:
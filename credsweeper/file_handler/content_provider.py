@@ -1,11 +1,12 @@
 import logging
 from abc import ABC, abstractmethod
 from functools import cached_property
-from typing import List, Optional, Generator
+from typing import Optional, Generator, Sequence
 
 from credsweeper.common.constants import MAX_LINE_LENGTH
 from credsweeper.file_handler.analysis_target import AnalysisTarget
 from credsweeper.file_handler.descriptor import Descriptor
+from credsweeper.file_handler.mapped_lines import MappedLines
 from credsweeper.utils.util import Util
 
 logger = logging.getLogger(__name__)
@@ -70,6 +71,11 @@ class ContentProvider(ABC):
         """abstract data getter"""
         raise NotImplementedError(__name__)
 
+    @property
+    def data_size(self) -> int:
+        """Estimated size of data without loading. Used to balance parallel scan"""
+        return 0
+
     @abstractmethod
     def free(self) -> None:
         """free data after scan to reduce memory usage"""
@@ -78,19 +84,24 @@ class ContentProvider(ABC):
     def lines_to_targets(
             self,  #
             min_len: int,
-            lines: List[str],  #
-            line_nums: Optional[List[int]] = None) -> Generator[AnalysisTarget, None, None]:
+            lines: Sequence[str],  #
+            line_nums: Optional[Sequence[int]] = None) -> Generator[AnalysisTarget, None, None]:
         """Creates list of targets with multiline concatenation"""
         lines_range = range(len(lines))
         if line_nums is None or len(line_nums) != len(lines):
             if line_nums is not None:
                 logger.warning(
                     f"line numerations {len(line_nums)} does not match lines {len(lines)}. Plain numeration applied")
-            line_nums = [1 + x for x in lines_range]
+            line_nums = range(1, 1 + len(lines))
 
+        # mapped lines are decoded on access, so short lines are skipped by size in bytes which is not less than length
+        sizes = lines.sizes if isinstance(lines, MappedLines) else None
         for line_pos in lines_range:
+            if sizes is not None and min_len > sizes[line_pos]:
+                continue
             line = lines[line_pos]
-            if min_len > len(line.strip()):
+            line_strip = line.strip()
+            if min_len > len(line_strip):
                 # Ignore target if stripped part is too short for all types
                 continue
             if MAX_LINE_LENGTH < len(line):
@@ -104,5 +115,5 @@ class ContentProvider(ABC):
                         offset=chunk_start)
                     yield target
             else:
-                target = AnalysisTarget(line_pos, lines, line_nums, self.descriptor)
+                target = AnalysisTarget(line_pos, lines, line_nums, self.descriptor, line, line_strip=line_strip)
                 yield target
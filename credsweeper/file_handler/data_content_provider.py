@@ -1,5 +1,6 @@
 import json
 import logging
+import time
 import warnings
 from functools import cached_property
 from typing import List, Optional, Any, Generator, Callable, Tuple
@@ -7,9 +8,10 @@ from typing import List, Optional, Any, Generator, Callable, Tuple
 import yaml
 from bs4 import BeautifulSoup, Tag, XMLParsedAsHTMLWarning
 
-from credsweeper.common.constants import MIN_DATA_LEN
+from credsweeper.common.constants import MIN_DATA_LEN, PARSE_SIZE_BUDGET, PARSE_TIME_BUDGET
 from credsweeper.file_handler.analysis_target import AnalysisTarget
 from credsweeper.file_handler.content_provider import ContentProvider
+from credsweeper.utils.sniffer import Sniffer
 from credsweeper.utils.util import Util
 
 warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning, module='bs4')
@@ -22,6 +24,20 @@ MIN_ENCODED_DATA_LEN = 12
 MIN_XML_LEN = 16
 
 
+class _BudgetLoader(yaml.FullLoader):  # pylint: disable=too-many-ancestors
+    """YAML loader which stops parsing after the deadline"""
+
+    def __init__(self, stream: str, deadline: float) -> None:
+        super().__init__(stream)
+        self.__deadline = deadline
+
+    def get_event(self) -> Any:
+        """Checks the deadline before each event of the parser"""
+        if self.__deadline < time.perf_counter():
+            raise TimeoutError("Time budget of YAML parsing is exceeded")
+        return super().get_event()
+
+
 class DataContentProvider(ContentProvider):
     """Dummy raw provider to keep bytes"""
 
@@ -50,6 +66,11 @@ class DataContentProvider(ContentProvider):
         """data RO getter for DataContentProvider and the property is used in deep scan"""
         return self.__data
 
+    @property
+    def data_size(self) -> int:
+        """data_size getter for DataContentProvider"""
+        return len(self.__data) if self.__data is not None else 0
+
     def free(self) -> None:
         """free data after scan to reduce memory usage"""
         self.__data = None
@@ -75,8 +96,35 @@ class DataContentProvider(ContentProvider):
         return self.structure is not None and (isinstance(self.structure, dict) and 0 < len(self.structure.keys())
                                                or isinstance(self.structure, list) and 0 < len(self.structure))
 
-    def represent_as_structure(self) -> Optional[bool]:
-        """Tries to convert data with many parsers. Stores result to internal structure
+    @staticmethod
+    def _load_ndjson(text: str, deadline: float) -> List[Any]:
+        """Parses each line of text as json, the time budget is checked for each line"""
+        structure = []
+        for line in text.splitlines():
+            if deadline < time.perf_counter():
+                raise TimeoutError("Time budget of NDJSON parsing is exceeded")
+            # each line must be in json format, otherwise - exception rises
+            structure.append(json.loads(line))
+        return structure
+
+    @staticmethod
+    def _load_yaml(text: str, deadline: float) -> Any:
+        """Parses text as yaml, the time budget is checked for each parsed event"""
+        loader = _BudgetLoader(text, deadline)
+        try:
+            return loader.get_single_data()
+        finally:
+            loader.dispose()
+
+    def represent_as_structure(
+            self,  #
+            size_budget: int = PARSE_SIZE_BUDGET,  #
+            time_budget: float = PARSE_TIME_BUDGET) -> Optional[bool]:
+        """Tries to convert data with parsers which are selected by sniffing. Stores result to internal structure
+
+        Args:
+            size_budget: maximal size of text to be parsed
+            time_budget: time in seconds for each parser attempt, checked during incremental parsing only
 
         Return:
              True if some structure found
@@ -86,57 +134,29 @@ class DataContentProvider(ContentProvider):
         """
         if MIN_DATA_LEN > len(self.text):
             return False
-        # JSON & NDJSON
-        if '{' in self.text and '}' in self.text and '"' in self.text and ':' in self.text:
-            try:
-                self.structure = json.loads(self.text)
-                logger.debug("CONVERTED from json")
-            except Exception as exc:
-                logger.debug("Cannot parse as json:%s %s", exc, self.data)
-            else:
-                if self.__is_structure():
-                    return True
+        if size_budget < len(self.text):
+            logger.info("Oversize data %s %s (%d) are not parsed as structure with the parse budget %d", self.file_path,
+                        self.info, len(self.text), size_budget)
+            return None
+        # the formats are sorted by priority: JSON, NDJSON, Python, YAML - almost always recognized
+        for text_format in Sniffer.get_structure_formats(self.text):
+            deadline = time.perf_counter() + time_budget
             try:
-                self.structure = []
-                for line in self.text.splitlines():
-                    # each line must be in json format, otherwise - exception rises
-                    self.structure.append(json.loads(line))
-                logger.debug("CONVERTED from ndjson")
+                if Sniffer.JSON == text_format:
+                    self.structure = json.loads(self.text)
+                elif Sniffer.NDJSON == text_format:
+                    self.structure = self._load_ndjson(self.text, deadline)
+                elif Sniffer.PYTHON == text_format:
+                    self.structure = Util.parse_python(self.text)
+                else:
+                    self.structure = self._load_yaml(self.text, deadline)
+                logger.debug("CONVERTED from %s", text_format)
             except Exception as exc:
-                logger.debug("Cannot parse as ndjson:%s %s", exc, self.data)
+                logger.debug("Cannot parse as %s:%s %s", text_format, exc, self.data)
                 self.structure = None
             else:
                 if self.__is_structure():
                     return True
-        else:
-            logger.debug("Data do not contain { - weak JSON")
-
-        # # # Python
-        try:
-            # search only in sources with strings
-            if (';' in self.text or 2 < self.text.count('\n') or 2 < self.text.count('\r')) \
-                    and ('"' in self.text or "'" in self.text):
-                self.structure = Util.parse_python(self.text)
-                logger.debug("CONVERTED from Python")
-            else:
-                logger.debug("Data do not contain line feed - weak PYTHON")
-        except Exception as exc:
-            logger.debug("Cannot parse as Python:%s %s", exc, self.data)
-        else:
-            if self.__is_structure():
-                return True
-        # # # YAML - almost always recognized
-        try:
-            if ':' in self.text and (2 < self.text.count('\n') or 2 < self.text.count('\r')):
-                self.structure = yaml.load(self.text, Loader=yaml.FullLoader)
-                logger.debug("CONVERTED from yaml")
-            else:
-                logger.debug("Data do not contain colon mark - weak YAML")
-        except Exception as exc:
-            logger.debug("Cannot parse as yaml:%s %s", exc, self.data)
-        else:
-            if self.__is_structure():
-                return True
         # # # None of above
         return None
 
@@ -66,6 +66,11 @@ class DiffContentProvider(ContentProvider):
         """diff getter for DiffContentProvider"""
         return self.__diff
 
+    @property
+    def data_size(self) -> int:
+        """data_size getter for DiffContentProvider - total length of changed lines"""
+        return sum(len(x["line"]) for x in self.__diff)
+
     def free(self) -> None:
         """free data after scan to reduce memory usage"""
         self.__diff = []
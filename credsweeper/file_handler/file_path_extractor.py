@@ -1,14 +1,14 @@
 import io
 import logging
 import os
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Union, Tuple
+from typing import List, Dict, Union, Tuple, Generator, Optional, Set
 
-from git import InvalidGitRepositoryError, NoSuchPathError, Repo
-
-from credsweeper.common.constants import MIN_DATA_LEN
+from credsweeper.common.constants import MIN_DATA_LEN, WALK_THREADS
 from credsweeper.config.config import Config
-from credsweeper.utils.util import Util
+from credsweeper.config.exclude_matcher import ExcludeMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -17,12 +17,13 @@ class FilePathExtractor:
     """Util class to browse files in directories"""
 
     FIND_BY_EXT_RULE = "Suspicious File Extension"
-    located_repos: Dict[Path, Repo] = {}
 
     @staticmethod
     def apply_gitignore(detected_files: List[str]) -> List[str]:
         """Apply gitignore rules for each file.
 
+        Files are grouped by the nearest git repository and checked with single `git check-ignore` per repository.
+
         Args:
             detected_files: list of files to be checked
 
@@ -30,10 +31,79 @@ class FilePathExtractor:
             List of files with all files ignored by git removed
 
         """
-        filtered_files = [file_path for file_path in detected_files if FilePathExtractor.is_valid_path(file_path)]
+        repo_roots: Dict[str, Optional[str]] = {}
+        files_by_root: Dict[str, List[str]] = {}
+        for file_path in detected_files:
+            directory = os.path.dirname(os.path.abspath(file_path))
+            if repo_root := FilePathExtractor.get_repo_root(directory, repo_roots):
+                files_by_root.setdefault(repo_root, []).append(file_path)
+        ignored_files: Set[str] = set()
+        for repo_root, file_paths in files_by_root.items():
+            ignored_files.update(FilePathExtractor.get_ignored_files(repo_root, file_paths))
+        filtered_files = [file_path for file_path in detected_files if file_path not in ignored_files]
 
         return filtered_files
 
+    @staticmethod
+    def get_repo_root(directory: str, repo_roots: Dict[str, Optional[str]]) -> Optional[str]:
+        """Locate nearest directory with ".git" for the directory.
+
+        Args:
+            directory: absolute path of a directory
+            repo_roots: cache of located roots for directories which is updated for all passed directories
+
+        Return:
+            path of the repository root or None if the directory is not in a repository
+
+        """
+        passed_directories = []
+        repo_root: Optional[str] = None
+        while True:
+            if directory in repo_roots:
+                repo_root = repo_roots[directory]
+                break
+            passed_directories.append(directory)
+            if os.path.exists(os.path.join(directory, ".git")):
+                repo_root = directory
+                break
+            parent_directory = os.path.dirname(directory)
+            # If we encountered root and cannot move further: no .git directory located in the entire path
+            if parent_directory == directory:
+                break
+            directory = parent_directory
+        for passed_directory in passed_directories:
+            repo_roots[passed_directory] = repo_root
+        return repo_root
+
+    @staticmethod
+    def get_ignored_files(repo_root: str, file_paths: List[str]) -> List[str]:
+        """Checks files of the repository with single `git check-ignore --stdin` process.
+
+        Args:
+            repo_root: path of the repository root
+            file_paths: files in the repository
+
+        Return:
+            files which are ignored by git. Tracked files are not ignored
+
+        """
+        relative_paths = [os.path.relpath(os.path.abspath(x), repo_root) for x in file_paths]
+        stdin = b"".join(os.fsencode(x) + b"\0" for x in relative_paths)
+        try:
+            process = subprocess.run(["git", "-C", repo_root, "check-ignore", "--stdin", "-z"],
+                                     input=stdin,
+                                     capture_output=True,
+                                     check=False)
+        except OSError as exc:
+            logger.error(f"Cannot run git check-ignore in {repo_root}: {exc}")
+            return []
+        # exit status 1 means that none of the paths is ignored
+        if process.returncode not in (0, 1):
+            logger.error(f"Failed git check-ignore in {repo_root}: {process.stderr.decode(errors='replace')}")
+            return []
+        ignored_paths = set(os.fsdecode(x) for x in process.stdout.split(b"\0") if x)
+        return [x for x, y in zip(file_paths, relative_paths) if y in ignored_paths]
+
     @staticmethod
     def get_file_paths(config: Config, path: Union[str, Path]) -> List[str]:
         """Get all files in the directory. Automatically exclude files non-code or data files (such as .jpg).
@@ -45,61 +115,91 @@ class FilePathExtractor:
         Return:
             List all non-excluded files in the directory
 
+        """
+        return list(FilePathExtractor.yield_file_paths(config, path))
+
+    @staticmethod
+    def yield_file_paths(config: Config, path: Union[str, Path]) -> Generator[str, None, None]:
+        """Yields files in the directory in order of os.walk as soon as they are found.
+
+        Subdirectories are listed ahead in threads, excluded subdirectories are not listed at all.
+
+        Args:
+            config: credsweeper configuration
+            path: path to the file or directory to be scanned
+
+        Return:
+            generator of non-excluded files in the directory
+
         """
         path = os.path.expanduser(path)  # Replace ~ character with a full path to the home directory
         if not os.path.exists(path):
             logger.warning(f"'{path}' does not exist")
-        file_paths = []
         if os.path.isfile(path):
             # suppose, the file is located outside and should be scanned
             if not FilePathExtractor.check_exclude_file(config, path):
-                file_paths.append(path)
+                yield path
         elif os.path.isdir(path):
-            for dirpath, _, filenames in os.walk(path):
-                for filename in filenames:
-                    file_path = os.path.join(f"{dirpath}", f"{filename}")
-                    if FilePathExtractor.check_exclude_file(config, file_path) or os.path.islink(file_path):
-                        continue
-                    if os.path.isfile(file_path) and not FilePathExtractor.check_file_size(config, file_path):
-                        file_paths.append(file_path)
+            executor = ThreadPoolExecutor(max_workers=WALK_THREADS)
+            try:
+                # futures of listed directories - the last one is processed first like in recursion
+                stack: List[Future] = [executor.submit(FilePathExtractor.list_dir, config, path)]
+                while stack:
+                    file_paths, dir_paths = stack.pop().result()
+                    yield from file_paths
+                    stack.extend(executor.submit(FilePathExtractor.list_dir, config, x) for x in reversed(dir_paths))
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
         else:
             pass  # symbolic links and so on
-        return file_paths
 
-    @classmethod
-    def is_valid_path(cls, path: str) -> bool:
-        """Locate nearest .git directory to the path and check if path is ignored.
+    @staticmethod
+    def list_dir(config: Config, path: str) -> Tuple[List[str], List[str]]:
+        """Lists the directory with stat information of os.scandir like os.walk does without following symlinks
 
         Args:
-            path: path to the file or directory to check
+            config: credsweeper configuration
+            path: path to the directory
 
         Return:
-            False if file is ignored by git. True otherwise
+            non-excluded files and subdirectories to walk
 
         """
-        parent_directory = Path(path).parent
-
-        # Iterate over file path to find nearest ".git" directory
-        while True:
+        file_paths: List[str] = []
+        dir_paths: List[str] = []
+        try:
+            entries = list(os.scandir(path))
+        except OSError as exc:
+            logger.debug(f"Cannot list directory '{path}' {exc}")
+            return file_paths, dir_paths
+        for entry in entries:
             try:
-                if parent_directory in cls.located_repos:
-                    repo = cls.located_repos[parent_directory]
-                else:
-                    # The directory must have ".git" in it. If not it occurs error.
-                    repo = Repo(parent_directory)
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if not entry.is_symlink() and not FilePathExtractor.check_exclude_dir(config, entry.path):
+                    dir_paths.append(entry.path)
+            elif not FilePathExtractor.check_exclude_file(config, entry.path) and not entry.is_symlink():
+                try:
+                    if entry.is_file() and not FilePathExtractor.check_size(config, entry.stat().st_size, entry.path):
+                        file_paths.append(entry.path)
+                except OSError as exc:
+                    logger.debug(f"Cannot stat file '{entry.path}' {exc}")
+        return file_paths, dir_paths
 
-                    # Cache already located repositories, so we would not need to load it for each new file
-                    cls.located_repos[parent_directory] = repo
+    @staticmethod
+    def is_valid_path(path: str) -> bool:
+        """Locate nearest .git directory to the path and check if path is ignored.
 
-                # Return True if there is no ignored file in 'path' and False if any.
-                return len(repo.ignored(path)) == 0
+        Args:
+            path: path to the file or directory to check
 
-            except (InvalidGitRepositoryError, NoSuchPathError):
-                new_parent = parent_directory.parent
-                # If we encountered root and cannot move further: no .git directory located in the entire path
-                if new_parent == parent_directory:
-                    return True
-                parent_directory = new_parent
+        Return:
+            False if file is ignored by git. True otherwise
+
+        """
+        return bool(FilePathExtractor.apply_gitignore([path]))
 
     @staticmethod
     def is_find_by_ext_file(config: Config, extension: str) -> bool:
@@ -127,26 +227,21 @@ class FilePathExtractor:
         Return:
             True when the file full path should be excluded according config
         """
-        path = path.replace('\\', '/')
-        lower_path = path.lower()
-        if config.not_allowed_path_pattern.match(lower_path):
-            return True
-        for exclude_pattern in config.exclude_patterns:
-            if exclude_pattern.match(lower_path):
-                return True
-        for exclude_path in config.exclude_paths:
-            # must be case-sensitive
-            if exclude_path in path:
-                return True
-        file_extension = Util.get_extension(lower_path, lower=False)
-        if file_extension in config.exclude_extensions:
-            return True
-        if not config.depth and file_extension in config.exclude_containers:
-            return True
-        # --depth or --doc enables scan for all documents extensions
-        if not (config.depth or config.doc) and file_extension in config.exclude_documents:
-            return True
-        return False
+        return ExcludeMatcher.get(config).check_file(path, config.depth, config.doc)
+
+    @staticmethod
+    def check_exclude_dir(config: Config, path: str) -> bool:
+        """
+        Checks whether all files in the directory should be excluded, so the directory may be skipped
+
+        Args:
+            config: Config
+            path: str - full path of the directory preferred
+
+        Return:
+            True when any file path in the directory matches excluded path or pattern from config
+        """
+        return ExcludeMatcher.get(config).check_dir(path)
 
     @staticmethod
     def check_file_size(config: Config, reference: Union[str, Path, io.BytesIO, Tuple[Union[str, Path],
@@ -172,7 +267,21 @@ class FilePathExtractor:
         else:
             logger.error(f"Unknown path type: {path}")
             return True
+        return FilePathExtractor.check_size(config, file_size, path)
 
+    @staticmethod
+    def check_size(config: Config, file_size: int, path: Union[str, Path, io.BytesIO]) -> bool:
+        """
+        Checks whether the size is over the size limit from configuration or less MIN_DATA_LEN
+
+        Args:
+            config: Config
+            file_size: size of the file
+            path: reference of the file for logging
+
+        Return:
+            True when the size is oversize or less than MIN_DATA_LEN
+        """
         if MIN_DATA_LEN > file_size:
             logger.debug(f"Size ({file_size}) of the file '{path}' is too small")
             return True
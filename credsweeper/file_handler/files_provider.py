@@ -1,7 +1,7 @@
 import io
 import logging
 from pathlib import Path
-from typing import List, Optional, Union, Tuple, Sequence
+from typing import Optional, Union, Tuple, Sequence, Generator, Iterable
 
 from credsweeper.config.config import Config
 from credsweeper.file_handler.abstract_provider import AbstractProvider
@@ -40,20 +40,29 @@ class FilesProvider(AbstractProvider):
             preprocessed file objects for analysis
 
         """
-        text_content_provider_list: List[ContentProvider] = []
+        return list(self.yield_scannable_files(config))
+
+    def yield_scannable_files(self, config: Config) -> Generator[ContentProvider, None, None]:
+        """Yield full text file objects for analysis as soon as files are found in parent paths from "paths".
+
+        Args:
+            config: dict of credsweeper configuration
+
+        Return:
+            generator of preprocessed file objects for analysis
+
+        """
         for path in self.paths:
             if isinstance(path, (str, Path)):
-                new_files = FilePathExtractor.get_file_paths(config, path)
+                new_files: Iterable[str] = FilePathExtractor.yield_file_paths(config, path)
                 if self.skip_ignored:
-                    new_files = FilePathExtractor.apply_gitignore(new_files)
+                    new_files = FilePathExtractor.apply_gitignore(list(new_files))
                 for _file in new_files:
-                    text_content_provider_list.append(TextContentProvider(_file))
+                    yield TextContentProvider(_file)
             elif isinstance(path, io.BytesIO):
-                text_content_provider_list.append(TextContentProvider((":memory:", path)))
+                yield TextContentProvider((":memory:", path))
             elif isinstance(path, tuple) and (isinstance(path[0], (str, Path))) and isinstance(path[1], io.BytesIO):
                 # suppose, all the files must be scanned
-                text_content_provider_list.append(TextContentProvider(path))
+                yield TextContentProvider(path)
             else:
                 logger.error(f"Unknown path type: {path}")
-
-        return text_content_provider_list
@@ -0,0 +1,53 @@
+from functools import cached_property
+from pathlib import Path
+from typing import Optional, Union
+
+from credsweeper.file_handler.byte_content_provider import ByteContentProvider
+from credsweeper.file_handler.git_cat_file import GitCatFile
+
+
+class GitBlobContentProvider(ByteContentProvider):
+    """Provides content of git blob which is read on demand with `git cat-file --batch` process.
+
+    Only the repository path and sha1 are kept before scan, so the provider is cheap to pass to pool processes.
+
+    Parameters:
+        repo_path: path of git repository
+        blob_sha1: name of the blob object
+        blob_size: size of the blob content
+        file_path: path of the blob in a tree
+
+    """
+
+    def __init__(
+            self,  #
+            repo_path: Union[str, Path],  #
+            blob_sha1: str,  #
+            blob_size: int,  #
+            file_path: str,  #
+            info: Optional[str] = None) -> None:
+        super().__init__(content=b'', file_path=file_path, info=info or f"BLOB:{blob_sha1}")
+        self.__repo_path = str(repo_path)
+        self.__blob_sha1 = blob_sha1
+        self.__blob_size = blob_size
+
+    @cached_property
+    def blob_sha1(self) -> str:
+        """blob_sha1 getter"""
+        return self.__blob_sha1
+
+    @cached_property
+    def data(self) -> Optional[bytes]:
+        """data RO getter for GitBlobContentProvider - the blob is read on first access"""
+        return GitCatFile.get(self.__repo_path).read(self.__blob_sha1)
+
+    @property
+    def data_size(self) -> int:
+        """data_size getter for GitBlobContentProvider"""
+        return self.__blob_size
+
+    def free(self) -> None:
+        """free the blob which was read with `git cat-file` after scan to reduce memory usage"""
+        super().free()
+        # the cached blob of this class is dropped explicitly - base class keeps its own data field
+        self.__dict__.pop("data", None)
@@ -0,0 +1,95 @@
+import atexit
+import logging
+import subprocess
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class GitCatFile:
+    """Long-running `git cat-file --batch` process to read objects of a repository by sha1.
+
+    One process per repository is kept in each python process, so content providers may be passed to
+    multiprocessing pool with the repository path and blob sha1 only.
+
+    Parameters:
+        repo_path: path of git repository
+
+    """
+
+    __instances: Dict[str, "GitCatFile"] = {}
+
+    def __init__(self, repo_path: Union[str, Path]) -> None:
+        self.__repo_path = str(repo_path)
+        self.__process = subprocess.Popen(["git", "-C", str(repo_path), "cat-file", "--batch"],
+                                          stdin=subprocess.PIPE,
+                                          stdout=subprocess.PIPE)
+
+    @staticmethod
+    def get(repo_path: Union[str, Path]) -> "GitCatFile":
+        """Returns the process for the repository in current python process. It is started on first use"""
+        key = str(repo_path)
+        if not (instance := GitCatFile.__instances.get(key)):
+            instance = GitCatFile(key)
+            GitCatFile.__instances[key] = instance
+        return instance
+
+    @staticmethod
+    def close_all() -> None:
+        """Stops all started processes"""
+        while GitCatFile.__instances:
+            _, instance = GitCatFile.__instances.popitem()
+            instance.close()
+
+    def close(self) -> None:
+        """Stops the process"""
+        if self.__process.stdin and not self.__process.stdin.closed:
+            try:
+                self.__process.stdin.close()
+            except OSError as exc:
+                logger.debug(f"{self.__repo_path}:{exc}")
+        self.__process.wait()
+
+    def __drop(self) -> None:
+        """Removes the instance with broken process, so next read for the repository starts new one"""
+        if GitCatFile.__instances.get(self.__repo_path) is self:
+            del GitCatFile.__instances[self.__repo_path]
+        self.__process.kill()
+        self.close()
+
+    def read(self, sha1: str) -> Optional[bytes]:
+        """Reads content of the object
+
+        Args:
+            sha1: object name
+
+        Return:
+            content of the object or None if the object is missing
+
+        """
+        if self.__process.stdin is None or self.__process.stdout is None:
+            return None
+        try:
+            self.__process.stdin.write(f"{sha1}\n".encode())
+            self.__process.stdin.flush()
+            # <sha1> SP <type> SP <size> LF <contents> LF or <object> SP missing LF
+            header = self.__process.stdout.readline().split()
+            if not header:
+                raise EOFError("git cat-file process exited")
+            if 3 != len(header):
+                logger.warning(f"Object {sha1} cannot be read: {header!r}")
+                return None
+            size = int(header[2])
+            data = self.__process.stdout.read(size)
+            if size != len(data) or b"\n" != self.__process.stdout.read(1):
+                raise EOFError("git cat-file process exited")
+            return data
+        except (OSError, ValueError, EOFError) as exc:
+            # broken pipe or closed stream of the exited process
+            logger.warning(f"Object {sha1} cannot be read from {self.__repo_path}: {exc}")
+        self.__drop()
+        return None
+
+
+atexit.register(GitCatFile.close_all)
@@ -0,0 +1,97 @@
+import logging
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Union, Sequence, Dict
+
+from credsweeper.common.constants import MIN_DATA_LEN
+from credsweeper.config.config import Config
+from credsweeper.file_handler.abstract_provider import AbstractProvider
+from credsweeper.file_handler.content_provider import ContentProvider
+from credsweeper.file_handler.file_path_extractor import FilePathExtractor
+from credsweeper.file_handler.git_blob_content_provider import GitBlobContentProvider
+
+logger = logging.getLogger(__name__)
+
+
+class GitHistoryProvider(AbstractProvider):
+    """Provider of unique blobs from history of git repositories.
+
+    All objects reachable from the refs are enumerated with single `git rev-list --objects` and the blobs are
+    filtered by path and size with single `git cat-file --batch-check`. So each blob is scanned once regardless
+    of number of commits and branches where it appears. The path of the blob is taken from the first tree
+    where the blob was found.
+
+    The provider is a library API for `CredSweeper.run`. The `--git` option of the command line keeps
+    the per-commit reports of drill mode.
+
+    """
+
+    def __init__(self, paths: Sequence[Union[str, Path]], refs: Optional[Sequence[str]] = None) -> None:
+        """Initialize Git History Provider for repositories from 'paths'.
+
+        Args:
+            paths: list of git repositories paths
+            refs: optional list of refs or commits to walk from, otherwise - all refs
+
+        """
+        super().__init__(paths)
+        self.refs = list(refs) if refs else ["--all"]
+
+    @staticmethod
+    def _run_git(repo_path: Union[str, Path], args: List[str], stdin: Optional[bytes] = None) -> List[bytes]:
+        """Runs git command in the repository and returns lines of output"""
+        result = subprocess.run(["git", "-C", str(repo_path), *args], input=stdin, capture_output=True, check=True)
+        return result.stdout.splitlines()
+
+    def get_blobs_paths(self, repo_path: Union[str, Path]) -> Dict[str, str]:
+        """Returns paths of reachable objects by sha1. Commits and root trees without path are omitted"""
+        objects: Dict[str, str] = {}
+        for line in self._run_git(repo_path, ["rev-list", "--objects", *self.refs]):
+            sha1_path = line.decode(errors="replace").split(' ', 1)
+            if 2 == len(sha1_path) and sha1_path[1] and sha1_path[0] not in objects:
+                objects[sha1_path[0]] = sha1_path[1]
+        return objects
+
+    def get_repo_providers(self, config: Config, repo_path: Union[str, Path]) -> List[ContentProvider]:
+        """Get providers for blobs of a repository which are not excluded by config"""
+        objects = {
+            sha1: path
+            for sha1, path in self.get_blobs_paths(repo_path).items()
+            if not FilePathExtractor.check_exclude_file(config, path)
+        }
+        if not objects:
+            return []
+        providers: List[ContentProvider] = []
+        stdin = ''.join(f"{x}\n" for x in objects.keys()).encode()
+        # <sha1> SP <type> SP <size>
+        for line in self._run_git(repo_path, ["cat-file", "--batch-check"], stdin):
+            header = line.decode().split()
+            if 3 != len(header) or "blob" != header[1]:
+                continue
+            sha1, size = header[0], int(header[2])
+            if MIN_DATA_LEN > size or config.size_limit is not None and config.size_limit < size:
+                logger.debug(f"Blob {sha1} {objects[sha1]} size {size} is out of limits")
+                continue
+            providers.append(GitBlobContentProvider(repo_path, sha1, size, objects[sha1]))
+        return providers
+
+    def get_scannable_files(self, config: Config) -> Sequence[ContentProvider]:
+        """Get blobs providers for analysis from all repositories in "paths".
+
+        Args:
+            config: dict of credsweeper configuration
+
+        Return:
+            content providers of unique blobs
+
+        """
+        providers: List[ContentProvider] = []
+        for repo_path in self.paths:
+            if not isinstance(repo_path, (str, Path)):
+                logger.error(f"Unknown path type: {repo_path}")
+                continue
+            try:
+                providers.extend(self.get_repo_providers(config, repo_path))
+            except subprocess.CalledProcessError as exc:
+                logger.error(f"Git repository {repo_path} cannot be walked: {exc.stderr!r}")
+        return providers
@@ -0,0 +1,173 @@
+import codecs
+import logging
+import mmap
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union, overload
+
+import numpy as np
+
+from credsweeper.common.constants import LATIN_1, MAX_LINE_LENGTH, UTF_8
+from credsweeper.utils.util import Util
+
+logger = logging.getLogger(__name__)
+
+
+class MappedLines(Sequence[str]):
+    """Lines of a memory-mapped text file which are decoded on access.
+
+    Only offsets of the lines are kept in memory, so a huge file does not occupy decoded text for all lines.
+    Line breaks are the same as in Util.decode_bytes: CRLF, CR and LF. Recently decoded lines are cached
+    for neighbour lines access of multiline patterns.
+
+    Parameters:
+        mapped: read-only mapped file
+        encoding: UTF-8 or LATIN-1 - line breaks are never a part of multibyte sequence in the encodings
+
+    """
+
+    CHUNK_SIZE = 1 << 24
+    CACHE_SIZE = 256
+
+    def __init__(self, mapped: mmap.mmap, encoding: str) -> None:
+        self.__mapped = mapped
+        self.__encoding = encoding
+        self.__starts, self.__ends = self.get_line_bounds(mapped)
+        self.__cache: Dict[int, str] = {}
+
+    @staticmethod
+    def open_file(path: Union[str, Path]) -> Optional[Sequence[str]]:
+        """Maps the file and detects encoding like Util.decode_text does
+
+        Args:
+            path: path to the file
+
+        Return:
+            lines of the file, empty list for binary file
+            or None when the file has to be read and decoded with Util.decode_bytes
+
+        """
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Cannot map file {path} {exc}")
+            return None
+        head = mapped[:MAX_LINE_LENGTH]
+        if MappedLines.is_utf8(mapped):
+            return MappedLines(mapped, UTF_8)
+        if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            # UTF-16 is decoded only with BOM
+            mapped.close()
+            return None
+        if Util.is_binary(head) or not Util.is_latin1(head):
+            logger.warning("Binary file detected %s", repr(head[:8]))
+            mapped.close()
+            return []
+        return MappedLines(mapped, LATIN_1)
+
+    @staticmethod
+    def is_utf8(mapped: mmap.mmap) -> bool:
+        """Validates UTF-8 by chunks to avoid decoding of whole file at once"""
+        decoder = codecs.getincrementaldecoder(UTF_8)(errors="strict")
+        size = len(mapped)
+        try:
+            for offset in range(0, size, MappedLines.CHUNK_SIZE):
+                decoder.decode(mapped[offset:offset + MappedLines.CHUNK_SIZE], final=False)
+            decoder.decode(b"", final=True)
+        except UnicodeError:
+            logger.info(f"UnicodeError: Can't decode content as {UTF_8}.")
+            return False
+        return True
+
+    @staticmethod
+    def get_line_bounds(mapped: mmap.mmap) -> Tuple[np.ndarray, np.ndarray]:
+        """Finds starts and ends of all lines without line breaks
+
+        Args:
+            mapped: read-only mapped file
+
+        Return:
+            arrays of offsets where lines start and end
+
+        """
+        size = len(mapped)
+        cr_list: List[np.ndarray] = [np.empty(0, dtype=np.int64)]
+        lf_list: List[np.ndarray] = [np.empty(0, dtype=np.int64)]
+        for offset in range(0, size, MappedLines.CHUNK_SIZE):
+            # zero copy view must be released before the mapped file is closed
+            count = min(MappedLines.CHUNK_SIZE, size - offset)
+            chunk = np.frombuffer(mapped, dtype=np.uint8, count=count, offset=offset)
+            cr_list.append(np.flatnonzero(0x0D == chunk) + offset)
+            lf_list.append(np.flatnonzero(0x0A == chunk) + offset)
+            del chunk
+        cr = np.concatenate(cr_list)
+        lf = np.concatenate(lf_list)
+        # LF after CR is a part of CRLF line break
+        single_lf = lf[~np.isin(lf - 1, cr, assume_unique=True)]
+        breaks = np.concatenate([cr, single_lf])
+        break_sizes = np.concatenate([1 + np.isin(cr + 1, lf, assume_unique=True), np.ones_like(single_lf)])
+        order = np.argsort(breaks, kind="stable")
+        breaks = breaks[order]
+        dtype = np.uint32 if size < (1 << 32) else np.int64
+        starts = np.concatenate([[0], breaks + break_sizes[order]]).astype(dtype)
+        ends = np.concatenate([breaks, [size]]).astype(dtype)
+        return starts, ends
+
+    @property
+    def encoding(self) -> str:
+        """Encoding of the text"""
+        return self.__encoding
+
+    @property
+    def sizes(self) -> np.ndarray:
+        """Sizes of lines in bytes - the upper limit of length of decoded lines"""
+        sizes: np.ndarray = self.__ends - self.__starts
+        return sizes
+
+    def close(self) -> None:
+        """Unmaps the file. The lines cannot be accessed after"""
+        self.__cache.clear()
+        self.__mapped.close()
+
+    def __len__(self) -> int:
+        return len(self.__starts)
+
+    @overload
+    def __getitem__(self, index: int) -> str:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if 0 > index:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("line index out of range")
+        line = self.__cache.get(index)
+        if line is None:
+            line = self.__mapped[int(self.__starts[index]):int(self.__ends[index])].decode(self.__encoding)
+            if MappedLines.CACHE_SIZE <= len(self.__cache):
+                # drop the oldest decoded line
+                del self.__cache[next(iter(self.__cache))]
+            self.__cache[index] = line
+        return line
+
+    def index(self, value: str, start: int = 0, stop: Optional[int] = None) -> int:
+        """Finds the line by comparison of encoded bytes for lines with the same size only"""
+        try:
+            encoded = value.encode(self.__encoding)
+        except UnicodeError as exc:
+            raise ValueError(f"{value!r} is not in lines") from exc
+        begin, end, _ = slice(start, stop).indices(len(self))
+        for i in begin + np.flatnonzero(len(encoded) == self.sizes[begin:end]):
+            if encoded == self.__mapped[int(self.__starts[i]):int(self.__ends[i])]:
+                return int(i)
+        raise ValueError(f"{value!r} is not in lines")
+
+    def __reduce__(self):
+        # mapped file cannot be pickled, so plain list of lines is restored
+        return list, (list(self), )
@@ -0,0 +1,80 @@
+from functools import cached_property
+from typing import Optional, Generator, Sequence, Tuple
+
+from credsweeper.file_handler.analysis_target import AnalysisTarget
+from credsweeper.file_handler.content_provider import ContentProvider
+
+
+class MemberContentProvider(ContentProvider):
+    """Provide a part of members of an archive file by reference, so the part may be scanned in another process.
+
+    The provider does not keep data. Deep scan reopens the file and extracts the members one by one,
+    so info of the members is the same as in scan of the whole file.
+
+    Parameters:
+        chain: types of containers and names of the members from the file to the nested archive
+            e.g. (("ZIP", "lib/app.jar"),) or (("TAR", "layer.tar.gz"), ("GZIP", "layer.tar")). Empty for members
+            of the file itself
+        container: type of the archive with the members - "ZIP" or "TAR"
+        members: indexes of the members in the central directory of ZIP or offsets of headers of TAR members,
+            so TAR members are read without walk through all headers of the archive
+        size: total size of the members to balance parallel scan
+
+    """
+
+    def __init__(
+            self,  #
+            file_path: str,  #
+            file_type: Optional[str] = None,  #
+            info: Optional[str] = None,  #
+            chain: Sequence[Tuple[str, str]] = (),  #
+            container: str = "ZIP",  #
+            members: Sequence[int] = (),  #
+            size: int = 0) -> None:
+        super().__init__(file_path=file_path, file_type=file_type, info=info)
+        self.__chain = tuple(chain)
+        self.__container = container
+        self.__members = members
+        self.__size = size
+
+    @property
+    def chain(self) -> Tuple[Tuple[str, str], ...]:
+        """chain RO getter"""
+        return self.__chain
+
+    @property
+    def container(self) -> str:
+        """container RO getter"""
+        return self.__container
+
+    @property
+    def members(self) -> Sequence[int]:
+        """members RO getter"""
+        return self.__members
+
+    @cached_property
+    def data(self) -> Optional[bytes]:
+        """data RO getter for MemberContentProvider. The members are extracted during deep scan only"""
+        return None
+
+    @property
+    def data_size(self) -> int:
+        """Total size of the members"""
+        return self.__size
+
+    def free(self) -> None:
+        """free data after scan to reduce memory usage"""
+        if "data" in self.__dict__:
+            delattr(self, "data")
+
+    def yield_analysis_target(self, min_len: int) -> Generator[AnalysisTarget, None, None]:
+        """The members are not text lines, so they are scanned with deep scan only
+
+        Args:
+            min_len: minimal line length to scan
+
+        Return:
+            no analysis targets
+
+        """
+        yield from ()
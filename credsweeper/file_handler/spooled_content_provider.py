@@ -0,0 +1,66 @@
+import contextlib
+import logging
+import os
+from functools import cached_property
+from pathlib import Path
+from typing import Optional, Generator, Union
+
+from credsweeper.file_handler.analysis_target import AnalysisTarget
+from credsweeper.file_handler.content_provider import ContentProvider
+from credsweeper.file_handler.stream_lines import StreamLines
+from credsweeper.utils.util import Util
+
+logger = logging.getLogger(__name__)
+
+
+class SpooledContentProvider(ContentProvider):
+    """Provide lines of oversize data from a file which is read by blocks, e.g. an extracted member of archive.
+
+    Parameters:
+        spool_path: path to the file with the data. file_path and info describe origin of the data
+
+    """
+
+    def __init__(
+            self,  #
+            spool_path: Union[str, Path],  #
+            file_path: Optional[str] = None,  #
+            file_type: Optional[str] = None,  #
+            info: Optional[str] = None) -> None:
+        super().__init__(file_path=file_path, file_type=file_type, info=info)
+        self.__spool_path = spool_path
+
+    @cached_property
+    def data(self) -> Optional[bytes]:
+        """data RO getter for SpooledContentProvider. The scan does not use it to keep memory usage bounded"""
+        return Util.read_data(self.__spool_path)
+
+    @property
+    def data_size(self) -> int:
+        """Size of the spooled data without reading"""
+        try:
+            return os.path.getsize(self.__spool_path)
+        except OSError:
+            return 0
+
+    def free(self) -> None:
+        """free data after scan to reduce memory usage"""
+        if "data" in self.__dict__:
+            delattr(self, "data")
+
+    def yield_analysis_target(self, min_len: int) -> Generator[AnalysisTarget, None, None]:
+        """Yields targets of lines which are read from the file by blocks
+
+        Args:
+            min_len: minimal line length to scan
+
+        Return:
+            analysis targets based on every row in the file
+
+        """
+        lines = StreamLines.open_file(self.__spool_path)
+        if isinstance(lines, StreamLines):
+            with contextlib.closing(lines):
+                yield from self.lines_to_targets(min_len, lines)
+        elif lines is None:
+            logger.warning(f"Spooled data of {self.file_path} {self.info} cannot be streamed")
@@ -0,0 +1,156 @@
+import codecs
+import logging
+from collections import deque
+from pathlib import Path
+from typing import Deque, List, Optional, Sequence, Union, overload
+
+from credsweeper.common.constants import LATIN_1, MAX_LINE_LENGTH, UTF_8, MULTI_PATTERN_SEARCH_MARGIN, PEM_MAX_LINES
+from credsweeper.utils.util import Util
+
+logger = logging.getLogger(__name__)
+
+
+class StreamLines(Sequence[str]):
+    """Bounded window of lines of a huge text file which is read by blocks.
+
+    Lines are read on access ahead of the window and the oldest lines are dropped, so memory usage does not depend
+    on the file size. The window keeps lines which are accessed around a scanned line: MultiPattern looks behind and
+    ahead for MULTI_PATTERN_SEARCH_MARGIN lines, PemKeyDetector looks ahead for PEM_MAX_LINES. Lines must be
+    accessed in ascending order of scanned lines, so access to a dropped line raises IndexError.
+
+    A line is read with LINE_LIMIT characters at most, the rest of a longer line is skipped with a warning.
+    Note: open_file reads the whole file once beforehand to count lines and detect encoding, so a huge file is read
+    twice from the disk.
+
+    Parameters:
+        path: path to the file
+        encoding: encoding of the file
+        lines_count: number of lines in the file
+
+    """
+
+    BLOCK_SIZE = 1 << 20
+    LINE_LIMIT = BLOCK_SIZE
+    LOOK_BEHIND = MULTI_PATTERN_SEARCH_MARGIN
+    LOOK_AHEAD = max(MULTI_PATTERN_SEARCH_MARGIN, PEM_MAX_LINES)
+
+    def __init__(self, path: Union[str, Path], encoding: str, lines_count: int) -> None:
+        # universal newlines mode splits lines with CRLF, CR and LF like Util.decode_bytes
+        self.__stream = open(path, "r", encoding=encoding, errors="strict", newline=None)
+        self.__lines_count = lines_count
+        self.__lines: Deque[str] = deque(maxlen=1 + StreamLines.LOOK_BEHIND + StreamLines.LOOK_AHEAD)
+        # position of the first line in the window
+        self.__first = 0
+
+    @staticmethod
+    def open_file(path: Union[str, Path]) -> Optional[Sequence[str]]:
+        """Reads the file to count lines and detects encoding like Util.decode_text does
+
+        Args:
+            path: path to the file
+
+        Return:
+            lines of the file, empty list for binary file
+            or None when the file has to be read and decoded with Util.decode_bytes
+
+        """
+        head = b""
+        decoder = codecs.getincrementaldecoder(UTF_8)(errors="strict")
+        is_utf8 = True
+        lines_count = 1
+        try:
+            with open(path, "rb") as f:
+                last_block = b""
+                while block := f.read(StreamLines.BLOCK_SIZE):
+                    if not head:
+                        head = block[:MAX_LINE_LENGTH]
+                    if is_utf8:
+                        try:
+                            decoder.decode(block, final=False)
+                        except UnicodeError:
+                            logger.info(f"UnicodeError: Can't decode content as {UTF_8}.")
+                            is_utf8 = False
+                    lines_count += block.count(b'\n') + block.count(b'\r') - block.count(b"\r\n")
+                    if last_block.endswith(b'\r') and block.startswith(b'\n'):
+                        # CRLF is split between blocks
+                        lines_count -= 1
+                    last_block = block
+        except OSError as exc:
+            logger.warning(f"Cannot read file {path} {exc}")
+            return None
+        if not head:
+            return []
+        if is_utf8:
+            try:
+                decoder.decode(b"", final=True)
+                return StreamLines(path, UTF_8, lines_count)
+            except UnicodeError:
+                logger.info(f"UnicodeError: Can't decode content as {UTF_8}.")
+        if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            # UTF-16 is decoded only with BOM
+            return None
+        if Util.is_binary(head) or not Util.is_latin1(head):
+            logger.warning("Binary file detected %s", repr(head[:8]))
+            return []
+        return StreamLines(path, LATIN_1, lines_count)
+
+    def close(self) -> None:
+        """Closes the file. The lines cannot be accessed after"""
+        self.__lines.clear()
+        self.__stream.close()
+
+    def __len__(self) -> int:
+        return self.__lines_count
+
+    @overload
+    def __getitem__(self, index: int) -> str:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if 0 > index:
+            index += self.__lines_count
+        if not 0 <= index < self.__lines_count:
+            raise IndexError("line index out of range")
+        while self.__first + len(self.__lines) <= index:
+            line = self.__stream.readline(StreamLines.LINE_LIMIT)
+            if line.endswith('\n'):
+                line = line[:-1]
+            elif StreamLines.LINE_LIMIT == len(line):
+                self.__skip_rest(self.__first + len(self.__lines))
+            if len(self.__lines) == self.__lines.maxlen:
+                self.__first += 1
+            self.__lines.append(line)
+        if index < self.__first:
+            raise IndexError(f"line {index} was dropped from the window {self.__first}")
+        return self.__lines[index - self.__first]
+
+    def __skip_rest(self, line_num: int) -> None:
+        """Skips the rest of the line which is longer than LINE_LIMIT to keep the line numeration
+
+        Args:
+            line_num: number of the line from zero for logging
+
+        """
+        skipped = 0
+        while rest := self.__stream.readline(StreamLines.LINE_LIMIT):
+            if rest.endswith('\n'):
+                skipped += len(rest) - 1
+                break
+            skipped += len(rest)
+        if skipped:
+            logger.warning(f"Line {1 + line_num} in {self.__stream.name} is cut to {StreamLines.LINE_LIMIT} characters,"
+                           f" {skipped} characters are skipped")
+
+    def index(self, value: str, start: int = 0, stop: Optional[int] = None) -> int:
+        """Finds the line in the window only"""
+        begin, end, _ = slice(start, stop).indices(self.__lines_count)
+        for i in range(max(begin, self.__first), min(end, self.__first + len(self.__lines))):
+            if value == self.__lines[i - self.__first]:
+                return i
+        raise ValueError(f"{value!r} is not in the window of lines")
@@ -35,6 +35,11 @@ class StringContentProvider(ContentProvider):
         """data getter for StringContentProvider"""
         raise NotImplementedError(__name__)
 
+    @property
+    def data_size(self) -> int:
+        """data_size getter for StringContentProvider - total length of lines"""
+        return sum(len(x) for x in self.__lines)
+
     def free(self) -> None:
         """free data after scan to reduce memory usage"""
         self.__lines = []
@@ -1,11 +1,16 @@
+import contextlib
 import io
 import logging
+import os
 from functools import cached_property
 from pathlib import Path
-from typing import List, Optional, Union, Tuple, Generator
+from typing import List, Optional, Union, Tuple, Generator, Sequence
 
+from credsweeper.common.constants import MIN_MMAP_SIZE, MIN_STREAM_SIZE
 from credsweeper.file_handler.analysis_target import AnalysisTarget
 from credsweeper.file_handler.content_provider import ContentProvider
+from credsweeper.file_handler.mapped_lines import MappedLines
+from credsweeper.file_handler.stream_lines import StreamLines
 from credsweeper.utils.util import Util
 
 logger = logging.getLogger(__name__)
@@ -26,7 +31,7 @@ class TextContentProvider(ContentProvider):
         _path = str(file_path[0]) if isinstance(file_path, tuple) else str(file_path)
         self.__io = file_path[1] if isinstance(file_path, tuple) else None
         self.__data: Optional[bytes] = None
-        self.__lines: Optional[List[str]] = None
+        self.__lines: Optional[Sequence[str]] = None
         super().__init__(file_path=_path, file_type=file_type, info=info)
 
     @cached_property
@@ -39,11 +44,33 @@ class TextContentProvider(ContentProvider):
                 self.__data = Util.read_data(self.file_path)
         return self.__data
 
+    @property
+    def is_file(self) -> bool:
+        """True if data are read from file_path, False for data from the stream"""
+        return self.__io is None
+
+    @property
+    def data_size(self) -> int:
+        """Size of data from the stream or the file without reading"""
+        if self.__data is not None:
+            return len(self.__data)
+        if isinstance(self.__io, io.BytesIO) and self.__io:
+            if self.__io.closed:
+                return 0
+            with self.__io.getbuffer() as buffer:
+                return buffer.nbytes - self.__io.tell()
+        try:
+            return os.path.getsize(self.file_path)
+        except OSError:
+            return 0
+
     def free(self) -> None:
         """free data after scan to reduce memory usage"""
         self.__data = None
         if "data" in self.__dict__:
             delattr(self, "data")
+        if isinstance(self.__lines, MappedLines):
+            self.__lines.close()
         self.__lines = None
         if "lines" in self.__dict__:
             delattr(self, "lines")
@@ -51,10 +78,14 @@ class TextContentProvider(ContentProvider):
             self.__io.close()
 
     @cached_property
-    def lines(self) -> Optional[List[str]]:
+    def lines(self) -> Sequence[str]:
         """lines getter for TextContentProvider"""
         if self.__lines is None:
-            self.__lines = Util.decode_bytes(self.data)
+            if self.__data is None and self.is_file and MIN_MMAP_SIZE <= self.data_size:
+                # huge file is mapped to memory to decode only scanned lines
+                self.__lines = MappedLines.open_file(self.file_path)
+            if self.__lines is None:
+                self.__lines = Util.decode_bytes(self.data)
         return self.__lines if self.__lines is not None else []
 
     def yield_analysis_target(self, min_len: int) -> Generator[AnalysisTarget, None, None]:
@@ -67,7 +98,7 @@ class TextContentProvider(ContentProvider):
             list of analysis targets based on every row in file
 
         """
-        lines: Optional[List[str]] = None
+        lines: Optional[Sequence[str]] = None
         line_nums: Optional[List[int]] = None
 
         if Util.get_extension(self.file_path) == ".xml":
@@ -77,8 +108,19 @@ class TextContentProvider(ContentProvider):
                 lines, line_nums = Util.get_xml_from_lines(xml_lines)
             except Exception as exc:
                 logger.error(f"Cannot parse to xml {exc}")
+        elif self.__data is None and "lines" not in self.__dict__ and self.is_file \
+                and MIN_STREAM_SIZE <= self.data_size:
+            # huge file is read by blocks and only a window of lines is kept in memory
+            lines = StreamLines.open_file(self.file_path)
+            if isinstance(lines, StreamLines):
+                return self.__yield_stream_targets(min_len, lines)
 
         if lines is None:
             lines = self.lines
 
         return self.lines_to_targets(min_len, lines, line_nums)
+
+    def __yield_stream_targets(self, min_len: int, lines: StreamLines) -> Generator[AnalysisTarget, None, None]:
+        """Yields targets of streamed lines and closes the file after all"""
+        with contextlib.closing(lines):
+            yield from self.lines_to_targets(min_len, lines)
@@ -9,7 +9,7 @@ from credsweeper.credentials.line_data import LineData
 from credsweeper.file_handler.analysis_target import AnalysisTarget
 from credsweeper.filters.filter import Filter
 from credsweeper.filters.value_entropy_base64_check import ValueEntropyBase64Check
-from credsweeper.utils.util import Util
+from credsweeper.utils.entropy import Entropy
 
 
 class ValueBase64PartCheck(Filter):
@@ -78,11 +78,9 @@ class ValueBase64PartCheck(Filter):
 
                 min_entropy_value = ValueEntropyBase64Check.get_min_data_entropy(len_value)
 
-                left_entropy = Util.get_shannon_entropy(left_part)
-                value_entropy = Util.get_shannon_entropy(value)
-                right_entropy = Util.get_shannon_entropy(right_part)
                 common = left_part + value + right_part
-                common_entropy = Util.get_shannon_entropy(common)
+                left_entropy, value_entropy, right_entropy, common_entropy = Entropy.get_shannon_entropy_many(
+                    (left_part, value, right_part, common))
                 min_entropy_common = ValueEntropyBase64Check.get_min_data_entropy(len(common))
                 if min_entropy_common < common_entropy:
                     return True
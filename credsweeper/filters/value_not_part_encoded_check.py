@@ -66,19 +66,20 @@ class ValueNotPartEncodedCheck(Filter):
                 if result is not None:
                     return result
         else:
-            # otherwise - need to iterate for all lines
-            for i in range(target.lines_len):
-                if line_data.line == target.lines[i]:
-                    if 0 < i:
-                        result = ValueNotPartEncodedCheck.check_val(
-                            target.lines[i - 1], ValueNotPartEncodedCheck.BASE64_ENCODED_DATA_PATTERN_BEFORE)
-                        if result is not None:
-                            return result
-                    i += 1
-                    if target.lines_len > i:
-                        result = ValueNotPartEncodedCheck.check_val(
-                            target.lines[i], ValueNotPartEncodedCheck.BASE64_ENCODED_DATA_PATTERN_AFTER)
-                        if result is not None:
-                            return result
-                    break
+            # otherwise - need to find the line in all lines
+            try:
+                i = target.lines.index(line_data.line)
+            except ValueError:
+                return False
+            if 0 < i:
+                result = ValueNotPartEncodedCheck.check_val(target.lines[i - 1],
+                                                            ValueNotPartEncodedCheck.BASE64_ENCODED_DATA_PATTERN_BEFORE)
+                if result is not None:
+                    return result
+            i += 1
+            if target.lines_len > i:
+                result = ValueNotPartEncodedCheck.check_val(target.lines[i],
+                                                            ValueNotPartEncodedCheck.BASE64_ENCODED_DATA_PATTERN_AFTER)
+                if result is not None:
+                    return result
         return False
@@ -1,5 +1,5 @@
-import math
-from typing import Dict, List, Set
+from collections import Counter
+from typing import List, Set
 
 import numpy as np
 
@@ -7,6 +7,7 @@ from credsweeper.common.constants import Chars, ML_HUNK
 from credsweeper.credentials.candidate import Candidate
 from credsweeper.file_handler.data_content_provider import MIN_DATA_LEN
 from credsweeper.ml_model.features.feature import Feature
+from credsweeper.utils.entropy import Entropy
 
 
 class EntropyEvaluation(Feature):
@@ -25,7 +26,6 @@ class EntropyEvaluation(Feature):
         super().__init__()
         # Max size of ML analyzed value is ML_HUNK but value may be bigger
         self.hunk_size = 4 * ML_HUNK
-        self.log2_cache: Dict[int, float] = {x: math.log2(x) for x in range(4, self.hunk_size + 1)}
         self.char_sets: List[Set[str]] = [set(x.value) for x in Chars]
 
     def extract(self, candidate: Candidate) -> np.ndarray:
@@ -34,31 +34,24 @@ class EntropyEvaluation(Feature):
         result: np.ndarray = np.zeros(shape=3 + len(self.char_sets), dtype=np.float32)
         value = candidate.line_data_list[0].value[:self.hunk_size]
         size = len(value)
-        uniq, counts = np.unique(list(value), return_counts=True)
+        counter = Counter(value)
         if MIN_DATA_LEN <= size:
             # evaluate the entropy for a value of at least 4
-            probabilities = counts / size
-            hartley_entropy = self.log2_cache.get(size, -1.0)
-            assert hartley_entropy, str(candidate)
+            counts = counter.values()
+            hartley_entropy = Entropy.log2(size)
 
             # renyi_entropy alpha=0.5
-            sum_prob_05 = np.sum(probabilities**0.5)
-            renyi_entropy_05 = 2 * np.log2(sum_prob_05)
-            result[0] = renyi_entropy_05 / hartley_entropy
+            result[0] = Entropy.get_renyi_entropy_by_counts(counts, size, 0.5) / hartley_entropy
 
             # shannon_entropy or renyi_entropy alpha=1
-            shannon_entropy = -np.sum(probabilities * np.log2(probabilities))
-            result[1] = shannon_entropy / hartley_entropy
+            result[1] = Entropy.get_shannon_entropy_by_counts(counts, size) / hartley_entropy
 
             # renyi_entropy alpha=2
-            sum_prob_2 = np.sum(probabilities**2)
-            renyi_entropy_2 = -1 * np.log2(sum_prob_2)
-            result[2] = renyi_entropy_2 / hartley_entropy
+            result[2] = Entropy.get_renyi_entropy_by_counts(counts, size, 2) / hartley_entropy
 
         if 0 < size:
             # check charset for non-zero value
-            # use the new variable to deal with mypy
-            uniq_set = set(uniq)
+            uniq_set = set(counter)
             for n, i in enumerate(self.char_sets, start=3):
                 if not uniq_set.difference(i):
                     result[n] = 1.0
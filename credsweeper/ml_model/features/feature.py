@@ -26,6 +26,18 @@ class Feature(ABC):
         """Abstract method of base class"""
         raise NotImplementedError
 
+    def extract_many(self, candidates: List[Candidate]) -> np.ndarray:
+        """Extracts the feature for each candidate separately.
+
+        Args:
+            candidates: list of candidates to extract features
+
+        Return:
+            2D array with row of the feature values for each candidate
+
+        """
+        return np.array([np.ravel(self.extract(candidate)) for candidate in candidates])
+
     @property
     def words(self) -> List[str]:
         """getter"""
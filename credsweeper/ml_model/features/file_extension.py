@@ -21,5 +21,8 @@ class FileExtension(WordIn):
         extension_set = set(candidate.line_data_list[0].file_type.lower() for candidate in candidates)
         return self.word_in_set(extension_set)
 
+    def extract_many(self, candidates: List[Candidate]) -> np.ndarray:
+        return self.word_in_list([candidate.line_data_list[0].file_type.lower() for candidate in candidates])
+
     def extract(self, candidate: Candidate) -> Any:
         raise NotImplementedError
@@ -1,3 +1,5 @@
+from typing import List
+
 import numpy as np
 
 from credsweeper.common.constants import ML_HUNK
@@ -29,3 +31,9 @@ class LengthOfAttribute(Feature):
                 return np.array([1.0])
         # the attribute is empty
         return np.array([0.0])
+
+    def extract_many(self, candidates: List[Candidate]) -> np.ndarray:
+        """Returns column of normalized lengths for first LineData of the candidates"""
+        lengths = np.array([len(getattr(x.line_data_list[0], self.attribute, None) or '') for x in candidates],
+                           dtype=np.float64)
+        return np.where(lengths < self.hunk_plus, lengths / self.hunk_plus, 1.0).reshape(-1, 1)
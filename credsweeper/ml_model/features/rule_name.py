@@ -21,5 +21,8 @@ class RuleName(WordIn):
         candidate_rule_set = set(x.rule_name for x in candidates)
         return self.word_in_set(candidate_rule_set)
 
+    def extract_many(self, candidates: List[Candidate]) -> np.ndarray:
+        return self.word_in_list([candidate.rule_name for candidate in candidates])
+
     def extract(self, candidate: Candidate) -> Any:
         raise NotImplementedError
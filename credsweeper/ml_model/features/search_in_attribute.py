@@ -7,9 +7,12 @@ from credsweeper.ml_model.features.feature import Feature
 class SearchInAttribute(Feature):
     """Abstract feature returns boolean for matched pattern in member of first LineData"""
 
+    # leading greedy dot star does not change result of search but makes it quadratic for long values
+    LEADING_DOT_STAR = re.compile(r"^\.\*(?![*+?{])")
+
     def __init__(self, pattern: str, attribute: str):
         super().__init__()
-        self.pattern = re.compile(pattern)
+        self.pattern = re.compile(self.LEADING_DOT_STAR.sub('', pattern))
         self.attribute = attribute
 
     def extract(self, candidate: Candidate) -> bool:
@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import List, Any, Tuple, Set
+from typing import List, Any, Tuple, Set, Dict
 
 import numpy as np
 
@@ -15,6 +15,7 @@ class WordIn(Feature):
         self.dimension = len(words)
         self.words = sorted(list(set(words)))
         self.enumerated_words = list(enumerate(self.words))
+        self.words_index: Dict[str, int] = {word: i for i, word in self.enumerated_words}
         if len(self.enumerated_words) != self.dimension:
             raise RuntimeError(f"Check duplicates:{words}")
 
@@ -57,3 +58,12 @@ class WordIn(Feature):
             if word in a_strings_set:
                 result[i] = 1
         return np.array([result])
+
+    def word_in_list(self, a_strings: List[str]) -> np.ndarray:
+        """Returns 2D array with row of the matched word for each string of the list"""
+        result: np.ndarray = np.zeros(shape=[len(a_strings), self.dimension], dtype=np.int8)
+        for n, a_string in enumerate(a_strings):
+            i = self.words_index.get(a_string)
+            if i is not None:
+                result[n, i] = 1
+        return result
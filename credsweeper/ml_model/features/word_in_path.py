@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import List, Any
+from typing import List, Any, Dict
 
 import numpy as np
 
@@ -20,5 +20,18 @@ class WordInPath(WordIn):
         else:
             return np.array([np.zeros(shape=[self.dimension], dtype=np.int8)])
 
+    def extract_many(self, candidates: List[Candidate]) -> np.ndarray:
+        # candidates of a batch are often from the same file
+        path_rows: Dict[str, np.ndarray] = {}
+        result: np.ndarray = np.zeros(shape=[len(candidates), self.dimension], dtype=np.int8)
+        for n, candidate in enumerate(candidates):
+            file_path = candidate.line_data_list[0].path
+            row = path_rows.get(file_path)
+            if row is None:
+                row = self([candidate])[0]
+                path_rows[file_path] = row
+            result[n] = row
+        return result
+
     def extract(self, candidate: Candidate) -> Any:
         raise NotImplementedError
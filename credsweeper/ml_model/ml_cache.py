@@ -0,0 +1,55 @@
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, Union
+
+logger = logging.getLogger(__name__)
+
+
+class MlCache:
+    """Persistent SQLite memo of ML probabilities to skip feature extraction and inference for known groups.
+
+    A group of candidates is identified with digest of all values which are used for the model inputs,
+    so the same line in another run, commit or vendored copy of a file gets the probability without inference.
+    Probability is stored instead of decision to apply any threshold.
+
+    Parameters:
+        path: database file
+        checksum: identifier of ML model and config. All stored probabilities are removed when the checksum differs
+
+    """
+
+    def __init__(self, path: Union[str, Path], checksum: str) -> None:
+        self.__connection = sqlite3.connect(path)
+        self.__connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.__connection.execute("CREATE TABLE IF NOT EXISTS probabilities (key TEXT PRIMARY KEY, probability REAL)")
+        row = self.__connection.execute("SELECT value FROM meta WHERE key='checksum'").fetchone()
+        if row is None or row[0] != checksum:
+            if row is not None:
+                logger.info(f"ML cache {path} was made with other model or config and is cleared")
+            self.__connection.execute("DELETE FROM probabilities")
+            self.__connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('checksum', ?)", (checksum, ))
+            self.__connection.commit()
+
+    def close(self) -> None:
+        """Commits changes and closes the database"""
+        self.__connection.commit()
+        self.__connection.close()
+
+    def __len__(self) -> int:
+        count: int = self.__connection.execute("SELECT COUNT(*) FROM probabilities").fetchone()[0]
+        return count
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, float]:
+        """Returns stored probabilities for known keys only"""
+        result: Dict[str, float] = {}
+        for key in keys:
+            row = self.__connection.execute("SELECT probability FROM probabilities WHERE key=?", (key, )).fetchone()
+            if row is not None:
+                result[key] = row[0]
+        return result
+
+    def put_many(self, probabilities: Dict[str, float]) -> None:
+        """Stores probabilities by the keys"""
+        self.__connection.executemany("INSERT OR REPLACE INTO probabilities (key, probability) VALUES (?, ?)",
+                                      ((key, float(value)) for key, value in probabilities.items()))
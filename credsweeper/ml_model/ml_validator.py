@@ -1,16 +1,18 @@
 import hashlib
 import json
 import logging
+import math
 from pathlib import Path
-from typing import List, Tuple, Union, Optional, Dict
+from typing import List, Tuple, Union, Optional, Dict, Callable
 
 import numpy as np
-from onnxruntime import InferenceSession
+from onnxruntime import InferenceSession, SessionOptions
 
 import credsweeper.ml_model.features as features
-from credsweeper.common.constants import ThresholdPreset, ML_HUNK
+from credsweeper.common.constants import ThresholdPreset, ML_HUNK, MIN_ML_BATCH_SIZE, MAX_ML_BATCH_SIZE
 from credsweeper.credentials.candidate import Candidate
 from credsweeper.credentials.candidate_key import CandidateKey
+from credsweeper.ml_model.ml_cache import MlCache
 from credsweeper.utils.util import Util
 
 logger = logging.getLogger(__name__)
@@ -31,7 +33,8 @@ class MlValidator:
             threshold: Union[float, ThresholdPreset],  #
             ml_config: Union[None, str, Path] = None,  #
             ml_model: Union[None, str, Path] = None,  #
-            ml_providers: Optional[str] = None) -> None:
+            ml_providers: Optional[str] = None,  #
+            ml_threads: Optional[int] = None) -> None:
         """Init
 
         Args:
@@ -39,8 +42,10 @@ class MlValidator:
             ml_config: path to ml config
             ml_model: path to ml model
             ml_providers: coma separated list of providers https://onnxruntime.ai/docs/execution-providers/
+            ml_threads: number of threads for an inference. Default of onnxruntime is used for None
         """
         self.__session: Optional[InferenceSession] = None
+        self.ml_threads = ml_threads
 
         if ml_config:
             ml_config_path = Path(ml_config)
@@ -82,13 +87,22 @@ class MlValidator:
             for index, char in enumerate(sorted(list(char_set)), start=len(self.char_dict))
         })
         self.num_classes = len(self.char_dict)
+        # lookup table of code points to the indexes. The last item is used for all characters above
+        self.__char_table: np.ndarray = np.full(shape=max(ord(x) for x in self.char_dict) + 2,
+                                                fill_value=self.char_dict[self.FAKE_CHAR],
+                                                dtype=np.int32)
+        for char, index in self.char_dict.items():
+            self.__char_table[ord(char)] = index
+        # one-hot rows for the indexes and additional zero row (index num_classes) for padding
+        self.__one_hot_table: np.ndarray = np.eye(self.num_classes + 1, self.num_classes, dtype=np.float32)
 
         self.common_feature_list = []
         self.unique_feature_list = []
+        config_md5 = hashlib.md5(__ml_config_data).hexdigest()
+        model_md5 = hashlib.md5(self.__ml_model_data).hexdigest()
+        self.__checksum = f"{model_md5}:{config_md5}"
         if logger.isEnabledFor(logging.INFO):
             config_dbg = str(model_config) if logger.isEnabledFor(logging.DEBUG) else ''
-            config_md5 = hashlib.md5(__ml_config_data).hexdigest()
-            model_md5 = hashlib.md5(self.__ml_model_data).hexdigest()
             logger.info("Init ML validator with providers: '%s' ; model:'%s' md5:%s ; config:'%s' md5:%s ; %s",
                         self.providers, ml_config_path, config_md5, ml_model_path, model_md5, config_dbg)
         for feature_definition in model_config["features"]:
@@ -114,42 +128,81 @@ class MlValidator:
         self.__session = None
         return super().__reduce__()
 
+    @property
+    def checksum(self) -> str:
+        """md5 of the model and the config to identify stored probabilities"""
+        return self.__checksum
+
     @property
     def session(self) -> InferenceSession:
         """session getter to prevent pickle error"""
         if not self.__session:
-            self.__session = InferenceSession(self.__ml_model_data, providers=self.providers)
+            session_options = SessionOptions()
+            if self.ml_threads:
+                # operators of the model are executed sequentially, so only intra-op threads are used
+                session_options.intra_op_num_threads = self.ml_threads
+                session_options.inter_op_num_threads = 1
+            self.__session = InferenceSession(self.__ml_model_data,
+                                              sess_options=session_options,
+                                              providers=self.providers)
         if not self.__session:
             raise RuntimeError("InferenceSession was not initialized!")
         return self.__session
 
     def encode(self, text: str, limit: int) -> np.ndarray:
         """Encodes prepared text to array"""
-        result_array: np.ndarray = np.zeros(shape=(limit, self.num_classes), dtype=np.float32)
-        if text is None:
-            return result_array
-        for i, c in enumerate(text):
-            if i >= limit:
-                break
-            if c in self.char_dict:
-                result_array[i, self.char_dict[c]] = 1.0
-            else:
-                result_array[i, self.char_dict[MlValidator.FAKE_CHAR]] = 1.0
-        return result_array
+        result: np.ndarray = self.encode_many([text], limit)[0]
+        return result
 
-    def encode_line(self, text: str, position: int):
-        """Encodes line with balancing for position"""
+    def encode_many(self, texts: List[Optional[str]], limit: int) -> np.ndarray:
+        """Encodes prepared texts to 3D array at once with the lookup table of code points
+
+        Args:
+            texts: list of prepared texts. None is encoded as empty text
+            limit: maximal length of text to encode
+
+        Return:
+            array of shape (len(texts), limit, num_classes) with one-hot row for each character
+
+        """
+        indexes: np.ndarray = np.full(shape=(len(texts), limit), fill_value=self.num_classes, dtype=np.int32)
+        if 0 < limit:
+            trimmed = [text[:limit] if text else '' for text in texts]
+            lengths = np.fromiter((len(x) for x in trimmed), dtype=np.int64, count=len(trimmed))
+            if total := int(lengths.sum()):
+                # surrogates may appear in text after decoding with errors handler
+                code_points = np.frombuffer(''.join(trimmed).encode("utf-32-le", errors="surrogatepass"),
+                                            dtype=np.uint32)
+                rows = np.repeat(np.arange(len(trimmed)), lengths)
+                columns = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+                last_index = len(self.__char_table) - 1
+                indexes[rows, columns] = self.__char_table[np.minimum(code_points, last_index)]
+        result: np.ndarray = self.__one_hot_table[indexes]
+        return result
+
+    @staticmethod
+    def prepare_line(text: str, position: int) -> str:
+        """Strips line and cuts it with balancing for position"""
         offset = len(text) - len(text.lstrip())
         pos = position - offset
         stripped = text.strip()
         if MlValidator.MAX_LEN < len(stripped):
             stripped = Util.subtext(stripped, pos, ML_HUNK)
-        return self.encode(stripped, MlValidator.MAX_LEN)
+        return stripped
+
+    @staticmethod
+    def prepare_value(text: str) -> str:
+        """Strips value and cuts it to the hunk size"""
+        stripped = text.strip()
+        return stripped[:ML_HUNK]
+
+    def encode_line(self, text: str, position: int):
+        """Encodes line with balancing for position"""
+        return self.encode(self.prepare_line(text, position), MlValidator.MAX_LEN)
 
     def encode_value(self, text: str) -> np.ndarray:
         """Encodes line with balancing for position"""
-        stripped = text.strip()
-        return self.encode(stripped[:ML_HUNK], ML_HUNK)
+        return self.encode(self.prepare_value(text), ML_HUNK)
 
     def _call_model(self, line_input: np.ndarray, variable_input: np.ndarray, value_input: np.ndarray,
                     feature_input: np.ndarray) -> np.ndarray:
@@ -164,114 +217,158 @@ class MlValidator:
             return result[0]
         raise RuntimeError(f"Unexpected type {type(result[0])}")
 
-    def extract_common_features(self, candidates: List[Candidate]) -> np.ndarray:
-        """Extract features that are guaranteed to be the same for all candidates on the same line with same value."""
-        feature_array: np.ndarray = np.array([], dtype=np.float32)
-        # Extract features from credential candidate
-        default_candidate = candidates[0]
-        for feature in self.common_feature_list:
-            new_feature = feature([default_candidate])[0]
-            if not isinstance(new_feature, np.ndarray):
-                new_feature = np.array([new_feature])
-            feature_array = np.append(feature_array, new_feature)
-        return feature_array
-
-    def extract_unique_features(self, candidates: List[Candidate]) -> np.ndarray:
-        """Extract features that can be different between candidates. Join them with or operator."""
-        feature_array: np.ndarray = np.array([], dtype=np.int8)
-        default_candidate = candidates[0]
-        for feature in self.unique_feature_list:
-            new_feature = feature([default_candidate])[0]
-            if not isinstance(new_feature, np.ndarray):
-                new_feature = np.array([new_feature])
-            feature_array = np.append(feature_array, new_feature)
-        for candidate in candidates[1:]:
+    def extract_features_many(self, groups: List[List[Candidate]]) -> np.ndarray:
+        """Extracts common and unique features for each group of candidates.
+
+        Common features are guaranteed to be the same for all candidates on the same line with same value,
+        so they are extracted from first candidate of a group. Unique features can be different between candidates
+        and are joined with or operator.
+
+        Args:
+            groups: list of candidates groups
+
+        Return:
+            2D array with row of features for each group
+
+        """
+        default_candidates = [candidates[0] for candidates in groups]
+        feature_columns = [feature.extract_many(default_candidates) for feature in self.common_feature_list]
+        if self.unique_feature_list:
+            all_candidates = [candidate for candidates in groups for candidate in candidates]
+            offsets = np.cumsum([0] + [len(candidates) for candidates in groups[:-1]])
             for feature in self.unique_feature_list:
-                new_feature = feature([candidate])[0]
-                if not isinstance(new_feature, np.ndarray):
-                    new_feature = np.array([new_feature])
-                feature_array = feature_array | new_feature
-        return feature_array
+                feature_columns.append(np.bitwise_or.reduceat(feature.extract_many(all_candidates), offsets, axis=0))
+        return np.hstack(feature_columns).astype(np.float32)
+
+    def extract_features(self, candidates: List[Candidate]) -> np.ndarray:
+        """extracts common and unique features from list of candidates"""
+        return self.extract_features_many([candidates])
+
+    def get_batch_features(self,
+                           groups: List[List[Candidate]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Extracts all inputs of ML model for the groups of candidates at once
+
+        Args:
+            groups: list of candidates groups. All candidates of a group are from the same line
+
+        Return:
+            line, variable, value inputs and features with first dimension of the groups number
+
+        """
+        lines = []
+        variables = []
+        values = []
+        for candidates in groups:
+            default_line_data = candidates[0].line_data_list[0]
+            lines.append(self.prepare_line(default_line_data.line, default_line_data.value_start))
+            variable = ''
+            value = ''
+            for candidate in candidates:
+                if not variable and candidate.line_data_list[0].variable:
+                    variable = candidate.line_data_list[0].variable
+                if not value and candidate.line_data_list[0].value:
+                    value = candidate.line_data_list[0].value
+                if variable and value:
+                    break
+            variables.append(self.prepare_value(variable))
+            values.append(self.prepare_value(value))
+        line_input = self.encode_many(lines, MlValidator.MAX_LEN)
+        variable_input = self.encode_many(variables, ML_HUNK)
+        value_input = self.encode_many(values, ML_HUNK)
+        feature_array = self.extract_features_many(groups)
+        return line_input, variable_input, value_input, feature_array
 
     def get_group_features(self, candidates: List[Candidate]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
         """
-        `np.newaxis` used to add new dimension if front, so input will be treated as a batch
+        Inputs are extracted as a batch of one group
         """
-        # all candidates are from the same line
-        default_candidate = candidates[0]
-        line_input = self.encode_line(default_candidate.line_data_list[0].line,
-                                      default_candidate.line_data_list[0].value_start)[np.newaxis]
-        variable = ''
-        value = ''
-        for candidate in candidates:
-            if not variable and candidate.line_data_list[0].variable:
-                variable = candidate.line_data_list[0].variable
-            if not value and candidate.line_data_list[0].value:
-                value = candidate.line_data_list[0].value
-            if variable and value:
-                break
-        variable_input = self.encode_value(variable)[np.newaxis]
-        value_input = self.encode_value(value)[np.newaxis]
-        feature_array = self.extract_features(candidates)
-        return line_input, variable_input, value_input, feature_array
+        return self.get_batch_features([candidates])
 
-    def extract_features(self, candidates: List[Candidate]) -> np.ndarray:
-        """extracts common and unique features from list of candidates"""
-        common_features = self.extract_common_features(candidates)
-        unique_features = self.extract_unique_features(candidates)
-        feature_hstack = np.hstack([common_features, unique_features])
-        feature_array = np.array([feature_hstack])
-        return feature_array
-
-    def _batch_call_model(self, line_input_list, variable_input_list, value_input_list, features_list) -> np.ndarray:
-        """auxiliary method to invoke twice"""
-        line_inputs_vstack = np.vstack(line_input_list)
-        variable_inputs_vstack = np.vstack(variable_input_list)
-        value_inputs_vstack = np.vstack(value_input_list)
-        feature_array_vstack = np.vstack(features_list)
-        result_call = self._call_model(line_inputs_vstack, variable_inputs_vstack, value_inputs_vstack,
-                                       feature_array_vstack)
-        result = result_call[:, 0]
-        return result
+    def get_group_key(self, candidates: List[Candidate]) -> str:
+        """Returns digest of all values which are used for model inputs of the group.
+
+        Path is represented with path features only, so the same line in other directory has the same key.
+        """
+        default_line_data = candidates[0].line_data_list[0]
+        variable = next((x.line_data_list[0].variable for x in candidates if x.line_data_list[0].variable), '')
+        value = next((x.line_data_list[0].value for x in candidates if x.line_data_list[0].value), '')
+        path_features = [
+            feature.extract_many([candidates[0]]).tolist() for feature in self.common_feature_list
+            if isinstance(feature, features.WordInPath)
+        ]
+        key_data = [
+            default_line_data.line, default_line_data.variable, default_line_data.variable_start,
+            default_line_data.variable_end, default_line_data.value, default_line_data.value_start,
+            default_line_data.value_end, default_line_data.file_type, variable, value, path_features,
+            sorted(set(x.rule_name for x in candidates))
+        ]
+        return hashlib.md5(json.dumps(key_data).encode()).hexdigest()
+
+    @staticmethod
+    def get_batch_size(groups_count: int) -> int:
+        """Returns batch size for the number of groups: few groups do not need a huge batch"""
+        return min(MAX_ML_BATCH_SIZE, max(MIN_ML_BATCH_SIZE, math.ceil(groups_count / 8)))
+
+    def predict(self, groups: List[List[Candidate]], batch_size: Optional[int] = None) -> np.ndarray:
+        """Evaluates probabilities for the groups of candidates with the model
+
+        Args:
+            groups: list of candidates groups
+            batch_size: ML model batch. Selected by number of groups for None
+
+        Return:
+            numpy array with probability predicted by the model for each group
+
+        """
+        if not batch_size:
+            batch_size = self.get_batch_size(len(groups))
+        probability: np.ndarray = np.zeros(len(groups), dtype=np.float32)
+        for head in range(0, len(groups), batch_size):
+            # use the approach to reduce memory consumption for huge candidates list
+            batch_groups = groups[head:head + batch_size]
+            line_input, variable_input, value_input, feature_array = self.get_batch_features(batch_groups)
+            result_call = self._call_model(line_input, variable_input, value_input, feature_array)
+            probability[head:head + len(batch_groups)] = result_call[:, 0]
+        return probability
 
-    def validate_groups(self, group_list: List[Tuple[CandidateKey, List[Candidate]]],
-                        batch_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    def validate_groups(
+        self,
+        group_list: List[Tuple[CandidateKey, List[Candidate]]],
+        batch_size: Optional[int],
+        ml_cache: Optional[MlCache] = None,
+        predictor: Optional[Callable[[List[List[Candidate]], Optional[int]], np.ndarray]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """Use ml model on list of candidate groups.
 
         Args:
             group_list: List of tuples (value, group)
-            batch_size: ML model batch
+            batch_size: ML model batch. Selected by number of groups for None
+            ml_cache: optional memo of probabilities. Only unknown groups are processed with the model
+            predictor: optional replacement of `predict` e.g. to run the model in other processes
 
         Return:
             Boolean numpy array with decision based on the threshold,
             and numpy array with probability predicted by the model
 
         """
-        line_input_list = []
-        variable_input_list = []
-        value_input_list = []
-        features_list = []
         probability: np.ndarray = np.zeros(len(group_list), dtype=np.float32)
-        head = tail = 0
-        for _group_key, candidates in group_list:
-            line_input, variable_input, value_input, feature_array = self.get_group_features(candidates)
-            line_input_list.append(line_input)
-            variable_input_list.append(variable_input)
-            value_input_list.append(value_input)
-            features_list.append(feature_array)
-            tail += 1
-            if 0 == tail % batch_size:
-                # use the approach to reduce memory consumption for huge candidates list
-                probability[head:tail] = self._batch_call_model(line_input_list, variable_input_list, value_input_list,
-                                                                features_list)
-                head = tail
-                line_input_list.clear()
-                variable_input_list.clear()
-                value_input_list.clear()
-                features_list.clear()
-        if head != tail:
-            probability[head:tail] = self._batch_call_model(line_input_list, variable_input_list, value_input_list,
-                                                            features_list)
+        todo_indexes = list(range(len(group_list)))
+        group_keys: List[str] = []
+        if ml_cache is not None:
+            group_keys = [self.get_group_key(candidates) for _group_key, candidates in group_list]
+            cached = ml_cache.get_many(group_keys)
+            todo_indexes.clear()
+            for i, key in enumerate(group_keys):
+                if key in cached:
+                    probability[i] = cached[key]
+                else:
+                    todo_indexes.append(i)
+            logger.info(f"ML cache hits: {len(group_list) - len(todo_indexes)} of {len(group_list)} groups")
+        if todo_indexes:
+            predict = predictor if predictor is not None else self.predict
+            probability[todo_indexes] = predict([group_list[i][1] for i in todo_indexes], batch_size)
+        if ml_cache is not None:
+            ml_cache.put_many({group_keys[i]: probability[i] for i in todo_indexes})
         is_cred = probability > self.threshold
         if logger.isEnabledFor(logging.DEBUG):
             for i, decision in enumerate(is_cred):
@@ -0,0 +1,130 @@
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+from credsweeper.credentials.line_data import LineData
+from credsweeper.file_handler.analysis_target import AnalysisTarget
+from credsweeper.filters.filter import Filter
+from credsweeper.rules.rule import Rule
+from credsweeper.scanner.scanner import Scanner
+from credsweeper.utils.util import Util
+
+logger = logging.getLogger(__name__)
+
+
+class ProfiledFilter(Filter):
+    """Proxy of a filter which counts calls, rejections and time of the checks
+
+    Parameters:
+        filter_: the profiled filter
+        stats: list of calls, rejections and time in nanoseconds which is updated in place
+
+    """
+
+    def __init__(self, filter_: Filter, stats: List[int]) -> None:  # pylint: disable=super-init-not-called
+        self.filter = filter_
+        self.stats = stats
+
+    def run(self, line_data: LineData, target: AnalysisTarget) -> bool:
+        """Runs the profiled filter and updates the statistics"""
+        start_time = time.perf_counter_ns()
+        result = self.filter.run(line_data, target)
+        self.stats[2] += time.perf_counter_ns() - start_time
+        self.stats[0] += 1
+        if result:
+            self.stats[1] += 1
+        return result
+
+
+class FilterProfile:
+    """Statistics of rule filters to run cheap and selective filters first.
+
+    A filter which removes a candidate stops the chain, so expected cost of the chain is minimal when filters are
+    sorted by average time divided by rejection rate. Filters do not change candidates, so the order does not
+    change scan results. The profile is collected in one run and the order is frozen from the file in next runs.
+
+    """
+
+    CALLS = "calls"
+    REJECTIONS = "rejections"
+    TIME_NS = "time_ns"
+    FILTERS = "filters"
+    ORDER = "order"
+
+    def __init__(self) -> None:
+        # rule name -> filter name -> calls, rejections, time in nanoseconds
+        self.__stats: Dict[str, Dict[str, List[int]]] = {}
+
+    @staticmethod
+    def get_filter_name(filter_: Filter) -> str:
+        """Returns name of the filter or the profiled filter"""
+        if isinstance(filter_, ProfiledFilter):
+            filter_ = filter_.filter
+        return filter_.__class__.__name__
+
+    def instrument(self, scanner: Scanner) -> None:
+        """Replaces filters of all rules with profiled proxies"""
+        for rule, _ in scanner.rules_scanners:
+            rule_stats = self.__stats.setdefault(rule.rule_name, {})
+            profiled_filters: List[Filter] = []
+            for filter_ in rule.filters:
+                if not isinstance(filter_, ProfiledFilter):
+                    stats = rule_stats.setdefault(self.get_filter_name(filter_), [0, 0, 0])
+                    filter_ = ProfiledFilter(filter_, stats)
+                profiled_filters.append(filter_)
+            # the rule keeps the list of filters without setter, so it is changed in place
+            rule.filters[:] = profiled_filters
+
+    def get_order(self, rule_name: str) -> List[str]:
+        """Returns names of the filters of the rule from the cheapest per rejection"""
+        rule_stats = self.__stats.get(rule_name, {})
+
+        def expected_cost(name: str) -> float:
+            _, rejections, time_ns = rule_stats[name]
+            if not rejections:
+                # the filter never stops the chain and is placed after filters which do
+                return float("inf")
+            return time_ns / rejections
+
+        # stable sort keeps original order for filters without statistics
+        return sorted(rule_stats.keys(), key=expected_cost)
+
+    @staticmethod
+    def apply_order(rule: Rule, order: List[str]) -> None:
+        """Sorts filters of the rule with the order of names. Unknown filters are placed at the end"""
+        positions = {name: i for i, name in enumerate(order)}
+        sorted_filters = sorted(rule.filters,
+                                key=lambda x: positions.get(FilterProfile.get_filter_name(x), len(positions)))
+        rule.filters[:] = sorted_filters
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Saves statistics and computed order of filters for each rule"""
+        profile: Dict[str, Any] = {}
+        for rule_name, rule_stats in sorted(self.__stats.items()):
+            profile[rule_name] = {
+                FilterProfile.ORDER: self.get_order(rule_name),
+                FilterProfile.FILTERS: {
+                    name: {
+                        FilterProfile.CALLS: calls,
+                        FilterProfile.REJECTIONS: rejections,
+                        FilterProfile.TIME_NS: time_ns
+                    }
+                    for name, (calls, rejections, time_ns) in rule_stats.items()
+                }
+            }
+        Util.json_dump(profile, path)
+        logger.info(f"Saved profile of filters for {len(profile)} rules to {path}")
+
+    @staticmethod
+    def freeze(scanner: Scanner, path: Union[str, Path]) -> None:
+        """Applies the order of filters from the saved profile to the rules of the scanner"""
+        profile = Util.json_load(path)
+        if not isinstance(profile, dict):
+            raise RuntimeError(f"Wrong profile of filters was read from '{path}'")
+        applied = 0
+        for rule, _ in scanner.rules_scanners:
+            if rule_profile := profile.get(rule.rule_name):
+                FilterProfile.apply_order(rule, rule_profile[FilterProfile.ORDER])
+                applied += 1
+        logger.info(f"Applied order of filters for {applied} rules from {path}")
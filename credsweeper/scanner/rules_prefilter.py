@@ -0,0 +1,76 @@
+import re
+from typing import Dict, List, Optional, Set, FrozenSet, Iterable
+
+from credsweeper.rules.rule import Rule
+from credsweeper.utils.util import Util
+
+
+class RulesPrefilter:
+    """Combined check of required substrings for all rules in single pass over a line.
+
+    The substrings are arranged into a trie which is transformed into one regex. The regex is wrapped in lookahead,
+    so `finditer` returns the longest substring which starts at each position of a line. Any other substring
+    at the position is a prefix of the longest one, so the output of each substring is precalculated with rules
+    of all its prefixes - like the output function of Aho-Corasick automaton.
+
+    Parameters:
+        rules: list of rules. Positions of the rules in the list are used as identifiers
+
+    """
+
+    def __init__(self, rules: Iterable[Rule]) -> None:
+        substring_rules: Dict[str, Set[int]] = {}
+        rules_without_substrings: Set[int] = set()
+        for index, rule in enumerate(rules):
+            if rule.has_required_substrings:
+                for substring in rule.required_substrings:
+                    substring_rules.setdefault(substring, set()).add(index)
+            else:
+                rules_without_substrings.add(index)
+        self.__rules_without_substrings: FrozenSet[int] = frozenset(rules_without_substrings)
+        self.__outputs: Dict[str, FrozenSet[int]] = {}
+        for substring in substring_rules:
+            output: Set[int] = set()
+            for prefix, indexes in substring_rules.items():
+                if substring.startswith(prefix):
+                    output.update(indexes)
+            self.__outputs[substring] = frozenset(output)
+        self.__pattern: Optional[re.Pattern] = None
+        if substring_rules:
+            self.__pattern = re.compile(f"(?=({self.get_trie_regex(substring_rules.keys())}))")
+
+    @staticmethod
+    def get_trie_regex(words: Iterable[str]) -> str:
+        """Builds regex from trie of the words. Greedy quantifiers provide the longest match at a position"""
+        return Util.get_trie_regex(words)
+
+    @property
+    def rules_without_substrings(self) -> FrozenSet[int]:
+        """Indexes of rules which have to be checked for any line"""
+        return self.__rules_without_substrings
+
+    def get_substrings(self, text: str) -> Set[str]:
+        """Returns set of the longest required substrings found at each position of the text"""
+        if self.__pattern is None:
+            return set()
+        # findall returns the only group of lookahead for each position
+        return set(self.__pattern.findall(text))
+
+    def has_substring(self, text: str) -> bool:
+        """Checks whether the text has any required substring"""
+        return self.__pattern is not None and self.__pattern.search(text) is not None
+
+    def get_rules(self, text: str) -> List[int]:
+        """Returns sorted indexes of rules which required substrings are present in the text or not required
+
+        Args:
+            text: line in lower case
+
+        Return:
+            list of the rules indexes in original order
+
+        """
+        result = set(self.__rules_without_substrings)
+        for substring in self.get_substrings(text):
+            result.update(self.__outputs[substring])
+        return sorted(result)
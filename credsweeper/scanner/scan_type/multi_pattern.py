@@ -1,6 +1,6 @@
 from typing import List
 
-from credsweeper.common.constants import RuleType
+from credsweeper.common.constants import RuleType, MULTI_PATTERN_SEARCH_MARGIN
 from credsweeper.config.config import Config
 from credsweeper.credentials.candidate import Candidate
 from credsweeper.file_handler.analysis_target import AnalysisTarget
@@ -16,7 +16,7 @@ class MultiPattern(ScanType):
 
     """
 
-    MAX_SEARCH_MARGIN = 10
+    MAX_SEARCH_MARGIN = MULTI_PATTERN_SEARCH_MARGIN
 
     @classmethod
     def run(cls, config: Config, rule: Rule, target: AnalysisTarget) -> List[Candidate]:
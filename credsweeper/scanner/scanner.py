@@ -1,7 +1,7 @@
 import logging
 import re
 from pathlib import Path
-from typing import List, Type, Tuple, Union, Dict, Generator, Set
+from typing import List, Type, Tuple, Union, Dict, Generator, Iterable
 
 from credsweeper.app import APP_PATH
 from credsweeper.common.constants import RuleType, MIN_VARIABLE_LENGTH, MIN_SEPARATOR_LENGTH, MIN_VALUE_LENGTH, \
@@ -11,6 +11,7 @@ from credsweeper.credentials.candidate import Candidate
 from credsweeper.file_handler.analysis_target import AnalysisTarget
 from credsweeper.file_handler.content_provider import ContentProvider
 from credsweeper.rules.rule import Rule
+from credsweeper.scanner.rules_prefilter import RulesPrefilter
 from credsweeper.scanner.scan_type.multi_pattern import MultiPattern
 from credsweeper.scanner.scan_type.pem_key_pattern import PemKeyPattern
 from credsweeper.scanner.scan_type.scan_type import ScanType
@@ -41,30 +42,29 @@ class Scanner:
         self.min_pattern_len = MAX_LINE_LENGTH
         self.min_pem_key_len = MAX_LINE_LENGTH
         self.min_multi_len = MAX_LINE_LENGTH
-        self.rules_scanners: List[Tuple[Rule, Type[ScanType]]] = []
+        self.__rules_scanners: List[Tuple[Rule, Type[ScanType]]] = []
+        self.__rules_prefilter = RulesPrefilter([])
+        self.__keyword_rules_prefilter = RulesPrefilter([])
         self._set_rules_scanners(rule_path)
         self.min_len = min(self.min_pattern_len, self.min_keyword_len, self.min_pem_key_len, self.min_multi_len,
                            MIN_VARIABLE_LENGTH + MIN_SEPARATOR_LENGTH + MIN_VALUE_LENGTH)
-        self.__keyword_rules_required_substrings = self._get_required_substrings(RuleType.KEYWORD)
 
-    def keywords_required_substrings_check(self, text: str) -> bool:
-        """check whether `text` has any required substring for all keyword type rules"""
-        return self._substring_check(self.__keyword_rules_required_substrings, text)
+    @property
+    def rules_scanners(self) -> List[Tuple[Rule, Type[ScanType]]]:
+        """rules_scanners getter"""
+        return self.__rules_scanners
 
-    def _get_required_substrings(self, rule_type: RuleType) -> Set[str]:
-        """init set of required substrings for custom rule type"""
-        required_substrings: Set[str] = set()
-        for rule in (x[0] for x in self.rules_scanners if rule_type == x[0].rule_type):
-            required_substrings.update(set(rule.required_substrings))
-        return required_substrings
+    @rules_scanners.setter
+    def rules_scanners(self, rules_scanners: List[Tuple[Rule, Type[ScanType]]]) -> None:
+        """rules_scanners setter rebuilds prefilters of required substrings"""
+        self.__rules_scanners = rules_scanners
+        self.__rules_prefilter = RulesPrefilter(x[0] for x in rules_scanners)
+        self.__keyword_rules_prefilter = RulesPrefilter(x[0] for x in rules_scanners
+                                                        if RuleType.KEYWORD == x[0].rule_type)
 
-    @staticmethod
-    def _substring_check(substrings: Set[str], text: str) -> bool:
-        """checks whether `text` has any required substring. Set is used to reduce extra transformations"""
-        for substring in substrings:
-            if substring in text:
-                return True
-        return False
+    def keywords_required_substrings_check(self, text: str) -> bool:
+        """check whether `text` has any required substring for all keyword type rules"""
+        return self.__keyword_rules_prefilter.has_substring(text)
 
     def _set_rules_scanners(self, rule_path: Union[None, str, Path]) -> None:
         """Auxiliary method to fill rules, determine min_pattern_len and set scanners"""
@@ -72,6 +72,7 @@ class Scanner:
             rule_path = APP_PATH / "rules" / "config.yaml"
         rule_templates = Util.yaml_load(rule_path)
         if rule_templates and isinstance(rule_templates, list):
+            rules_scanners: List[Tuple[Rule, Type[ScanType]]] = []
             rule_names = set()
             for rule_template in rule_templates:
                 try:
@@ -96,7 +97,8 @@ class Scanner:
                         self.min_multi_len = min(self.min_multi_len, rule.min_line_len)
                     else:
                         logger.warning(f"Unknown rule type:{rule.rule_type}")
-                self.rules_scanners.append((rule, self.get_scanner(rule)))
+                rules_scanners.append((rule, self.get_scanner(rule)))
+            self.rules_scanners = rules_scanners
         else:
             raise RuntimeError(f"Wrong rules '{rule_templates}' were read from '{rule_path}'")
 
@@ -118,9 +120,11 @@ class Scanner:
             matched_pattern: bool,  #
             matched_keyword: bool,  #
             matched_pem_key: bool,  #
-            matched_multi: bool) -> Generator[Tuple[Rule, Type[ScanType]], None, None]:
-        """returns generator for rules and according scanner"""
-        for rule, scanner in self.rules_scanners:
+            matched_multi: bool,  #
+            rules_indexes: Iterable[int]) -> Generator[Tuple[Rule, Type[ScanType]], None, None]:
+        """returns generator for rules and according scanner from preselected rules indexes"""
+        for index in rules_indexes:
+            rule, scanner = self.__rules_scanners[index]
             if line_len >= rule.min_line_len \
                     and (RuleType.PATTERN == rule.rule_type and matched_pattern
                          or RuleType.KEYWORD == rule.rule_type and matched_keyword
@@ -168,17 +172,13 @@ class Scanner:
                              target.line_num)
                 continue
 
-            # use lower case for required substring
-            target_line_stripped_lower = target.line_lower_strip
+            # use lower case for required substring - all rules are selected in single pass
+            rules_indexes = self.__rules_prefilter.get_rules(target.line_lower_strip)
             # cached value to skip the same regex verifying
             matched_regex: Dict[re.Pattern, bool] = {}
 
             for rule, scanner in self.yield_rule_scanner(target_line_stripped_len, matched_pattern, matched_keyword,
-                                                         matched_pem_key, matched_multi):
-                if rule.has_required_substrings \
-                        and not self._substring_check(rule.required_substrings, target_line_stripped_lower):
-                    continue
-
+                                                         matched_pem_key, matched_multi, rules_indexes):
                 # common regex might be triggered for the same target
                 if rule.required_regex:
                     if rule.required_regex in matched_regex:
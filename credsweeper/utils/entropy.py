@@ -0,0 +1,61 @@
+import math
+from collections import Counter
+from typing import Collection, Iterable, List, Union
+
+
+class Entropy:
+    """Entropy of short strings and bytes with counting of symbols.
+
+    Shannon entropy is evaluated as log2(n) - sum(c * log2(c)) / n for counts c of symbols in data of size n,
+    so only the counts are required and the logarithms of small integers are taken from precalculated tables.
+
+    """
+
+    TABLE_SIZE = 1 << 10
+    # log2(x) and x * log2(x) for integers, 0 for 0
+    LOG2_TABLE: List[float] = [0.] + [math.log2(x) for x in range(1, TABLE_SIZE)]
+    X_LOG2_X_TABLE: List[float] = [0.] + [x * math.log2(x) for x in range(1, TABLE_SIZE)]
+
+    @staticmethod
+    def get_counts(data: Union[str, bytes]) -> Collection[int]:
+        """Returns numbers of occurrences of each unique symbol in the data"""
+        return Counter(data).values()
+
+    @staticmethod
+    def log2(x: int) -> float:
+        """Returns log2 of positive integer"""
+        return Entropy.LOG2_TABLE[x] if x < Entropy.TABLE_SIZE else math.log2(x)
+
+    @staticmethod
+    def get_shannon_entropy_by_counts(counts: Collection[int], size: int) -> float:
+        """Returns Shannon entropy for counts of symbols in data of the size"""
+        if 0 >= size:
+            return 0.
+        if size < Entropy.TABLE_SIZE:
+            table = Entropy.X_LOG2_X_TABLE
+            sum_x_log2_x = sum(table[x] for x in counts)
+        else:
+            sum_x_log2_x = sum(x * math.log2(x) for x in counts)
+        entropy = Entropy.log2(size) - sum_x_log2_x / size
+        # rounding error may produce negative value for data with single symbol
+        return max(0., entropy)
+
+    @staticmethod
+    def get_renyi_entropy_by_counts(counts: Collection[int], size: int, alpha: float) -> float:
+        """Returns Renyi entropy of order alpha (not 1) for counts of symbols in data of the size"""
+        if 0 >= size:
+            return 0.
+        sum_probabilities = sum(x**alpha for x in counts) / size**alpha
+        return math.log2(sum_probabilities) / (1 - alpha)
+
+    @staticmethod
+    def get_shannon_entropy(data: Union[str, bytes]) -> float:
+        """Returns Shannon entropy of the data"""
+        if not data:
+            return 0.
+        return Entropy.get_shannon_entropy_by_counts(Entropy.get_counts(data), len(data))
+
+    @staticmethod
+    def get_shannon_entropy_many(values: Iterable[Union[str, bytes]]) -> List[float]:
+        """Returns Shannon entropy for each value"""
+        return [Entropy.get_shannon_entropy(x) for x in values]
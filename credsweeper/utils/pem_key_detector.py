@@ -4,7 +4,7 @@ import re
 import string
 from typing import List
 
-from credsweeper.common.constants import PEM_BEGIN_PATTERN, PEM_END_PATTERN, Chars
+from credsweeper.common.constants import PEM_BEGIN_PATTERN, PEM_END_PATTERN, Chars, PEM_MAX_LINES
 from credsweeper.config.config import Config
 from credsweeper.credentials.line_data import LineData
 from credsweeper.file_handler.analysis_target import AnalysisTarget
@@ -49,7 +49,7 @@ class PemKeyDetector:
         line_data.append(first_line)
         # protection check for case when first line starts from 0
         start_pos = target.line_pos if 0 <= target.line_pos else 0
-        finish_pos = min(start_pos + 200, target.lines_len)
+        finish_pos = min(start_pos + PEM_MAX_LINES, target.lines_len)
         begin_pattern_not_passed = True
         for line_pos in range(start_pos, finish_pos):
             line = target.lines[line_pos]
@@ -0,0 +1,95 @@
+import re
+from typing import List, Union
+
+
+class Sniffer:
+    """Cheap checks of data prefix and byte classes to select parsers before the parsing.
+
+    Each check rejects only data which the parser cannot accept, so skipped parsers do not change scan results.
+
+    """
+
+    JSON = "json"
+    NDJSON = "ndjson"
+    PYTHON = "python"
+    YAML = "yaml"
+
+    UTF_16_BOMS = (b"\xff\xfe", b"\xfe\xff")
+
+    # header lines which are recognized in patch parser - a patch without header produces no files
+    PATCH_HEADER_PATTERN = re.compile(rb"(?:^|[\n\r\v\f\x1c\x1d\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9])"
+                                      rb"(?:--- |\+\+\+ |\*\*\* |=== |diff|[Ii]ndex|RCS file: )")
+    # whitespaces, backslashes of escaped line feeds and symbols of standard and urlsafe base64 alphabet
+    NOT_BASE64_PATTERN = re.compile(rb"[^0-9A-Za-z+/=\-_\\\s]")
+
+    NOT_SPACE_PATTERN = re.compile(r"\S")
+    # a JSON value may start from the symbols
+    JSON_FIRST_SYMBOLS = "{[\"-0123456789tfn"
+    # YAML mapping or sequence starts from a key with colon or the symbols
+    YAML_FIRST_SYMBOLS = "-?[{&!*\"'"
+    YAML_MULTILINE_SYMBOLS = "\"'[{|>"
+    YAML_LINE_PATTERN = re.compile("[^\r\n\x85\u2028\u2029]+")
+
+    @staticmethod
+    def is_utf_16(data: Union[bytes, bytearray]) -> bool:
+        """Returns True for data with UTF-16 byte order mark - bytes checks are not applicable for the data"""
+        return data.startswith(Sniffer.UTF_16_BOMS)
+
+    @staticmethod
+    def is_patch(data: Union[bytes, bytearray]) -> bool:
+        """Returns True when the data has a line which may be a header of patch"""
+        return Sniffer.is_utf_16(data) or bool(Sniffer.PATCH_HEADER_PATTERN.search(data))
+
+    @staticmethod
+    def is_base64(data: Union[bytes, bytearray]) -> bool:
+        """Returns True when the data has only symbols which are used in base64 encoded text"""
+        return Sniffer.is_utf_16(data) or not Sniffer.NOT_BASE64_PATTERN.search(data)
+
+    @staticmethod
+    def is_yaml(text: str) -> bool:
+        """Returns True when first significant lines of text may start YAML mapping or sequence.
+
+        A plain key in the first line must be followed by an indented line or a key in the same column,
+        otherwise the parser fails or produces a scalar.
+
+        """
+        key_found = False
+        for line_match in Sniffer.YAML_LINE_PATTERN.finditer(text):
+            line = line_match.group()
+            stripped = line.strip().lstrip('\ufeff')
+            if stripped.startswith("--- ") and not key_found:
+                # document start marker with content in the same line
+                stripped = stripped[4:].lstrip()
+            if not stripped or stripped.startswith(('#', '%')) or stripped in ("---", "..."):
+                # comments, directives and markers
+                continue
+            if key_found:
+                return line[0] in " \t" or stripped[0] in Sniffer.YAML_FIRST_SYMBOLS or ':' in stripped
+            if stripped[0] in Sniffer.YAML_FIRST_SYMBOLS:
+                return True
+            if ':' not in stripped:
+                return False
+            if any(x in stripped for x in Sniffer.YAML_MULTILINE_SYMBOLS):
+                # quoted, flow or block scalar value may continue in next lines
+                return True
+            key_found = True
+        return key_found
+
+    @staticmethod
+    def get_structure_formats(text: str) -> List[str]:
+        """Returns formats in order of priority which may represent the text as a structure"""
+        formats: List[str] = []
+        first_match = Sniffer.NOT_SPACE_PATTERN.search(text)
+        first_symbol = first_match.group() if first_match else ''
+        is_multiline = 2 < text.count('\n') or 2 < text.count('\r')
+        if '{' in text and '}' in text and '"' in text and ':' in text:
+            if first_symbol in ('{', '['):
+                formats.append(Sniffer.JSON)
+            if first_symbol and first_symbol in Sniffer.JSON_FIRST_SYMBOLS:
+                formats.append(Sniffer.NDJSON)
+        # search only in sources with strings
+        if (';' in text or is_multiline) and ('"' in text or "'" in text):
+            formats.append(Sniffer.PYTHON)
+        if ':' in text and is_multiline and Sniffer.is_yaml(text):
+            formats.append(Sniffer.YAML)
+        return formats
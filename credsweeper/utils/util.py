@@ -1,5 +1,6 @@
 import ast
 import base64
+import codecs
 import contextlib
 import json
 import logging
@@ -7,12 +8,12 @@ import math
 import os
 import random
 import re
+import stat
 import string
 import tarfile
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Optional, Union
+from typing import Any, Dict, List, Tuple, Optional, Union, Iterable
 
-import numpy as np
 import yaml
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import padding
@@ -29,7 +30,8 @@ from cryptography.hazmat.primitives.serialization.pkcs12 import load_key_and_cer
 from lxml import etree
 
 from credsweeper.common.constants import AVAILABLE_ENCODINGS, \
-    DEFAULT_ENCODING, LATIN_1, CHUNK_SIZE, MAX_LINE_LENGTH, CHUNK_STEP_SIZE, ASCII
+    DEFAULT_ENCODING, LATIN_1, CHUNK_SIZE, MAX_LINE_LENGTH, CHUNK_STEP_SIZE, ASCII, UTF_8, UTF_16
+from credsweeper.utils.entropy import Entropy
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +45,22 @@ class Util:
         _, extension = os.path.splitext(str(file_path))
         return extension.lower() if lower else extension
 
+    @staticmethod
+    def is_trusted_file(file_path: Union[str, Path]) -> bool:
+        """Returns True when the file is owned by current user and cannot be written by other users.
+        Only such files may keep pickled data, because unpickling of untrusted data executes arbitrary code.
+        The ownership is not checked on platforms without POSIX user ids.
+
+        Raises:
+            OSError: the file does not exist or is not accessible
+
+        """
+        file_stat = os.stat(file_path)
+        if hasattr(os, "getuid"):
+            if file_stat.st_uid != os.getuid() or file_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+                return False
+        return True
+
     @staticmethod
     def get_regex_combine_or(re_strs: List[str]) -> str:
         """Routine combination for regex 'or'"""
@@ -57,16 +75,32 @@ class Util:
 
         return result
 
+    @staticmethod
+    def get_trie_regex(words: Iterable[str]) -> str:
+        """Builds regex from trie of the words. Greedy quantifiers provide the longest match at a position"""
+        trie: Dict[str, dict] = {}
+        for word in words:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            # empty key marks the end of a word
+            node[''] = {}
+
+        def trie_to_regex(node: Dict[str, dict]) -> str:
+            branches = [f"{re.escape(char)}{trie_to_regex(child)}" for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            if 1 == len(branches) and '' not in node:
+                return branches[0]
+            regex = f"(?:{'|'.join(branches)})"
+            return f"{regex}?" if '' in node else regex
+
+        return trie_to_regex(trie)
+
     @staticmethod
     def get_shannon_entropy(data: Union[str, bytes]) -> float:
         """Borrowed from http://blog.dkbza.org/2007/05/scanning-data-for-entropy-anomalies.html."""
-        if not data:
-            return 0.
-        size = len(data)
-        _uniq, counts = np.unique(list(data), return_counts=True)
-        probabilities = counts / size
-        entropy = float(-np.sum(probabilities * np.log2(probabilities)))
-        return entropy
+        return Entropy.get_shannon_entropy(data)
 
     # Precalculated data for speedup
     MIN_DATA_ENTROPY: Dict[int, float] = {
@@ -194,6 +228,10 @@ class Util:
         data = Util.read_data(path)
         return Util.decode_bytes(data, encodings)
 
+    # strict decoding of the encodings is always reversible, so round trip check is skipped
+    REVERSIBLE_ENCODINGS = {UTF_8, LATIN_1, ASCII}
+    UTF_16_BOMS = (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+
     @staticmethod
     def decode_text(content: bytes, encodings: Optional[List[str]] = None) -> Optional[str]:
         """Decode content using different encodings.
@@ -221,10 +259,14 @@ class Util:
                     # so skip this encoding when checking binaries
                     logger.warning("Binary file detected %s", repr(content[:8]))
                     break
-                text = content.decode(encoding, errors="strict")
-                if content != text.encode(encoding, errors="strict"):
+                if UTF_16 == encoding and not content.startswith(Util.UTF_16_BOMS):
+                    # the round trip check fails without BOM, so decoding is skipped
+                    raise UnicodeError
+                decoded = content.decode(encoding, errors="strict")
+                if encoding not in Util.REVERSIBLE_ENCODINGS and content != decoded.encode(encoding, errors="strict"):
                     # the check helps to detect a real encoding
                     raise UnicodeError
+                text = decoded
                 break
             except UnicodeError:
                 binary_suggest = True
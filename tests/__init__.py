@@ -39,3 +39,9 @@ SAMPLE_DOCX = SAMPLES_PATH / "sample.docx"
 SAMPLE_PY = SAMPLES_PATH / "sample.py"
 SAMPLE_DEB = SAMPLES_PATH / "sample.deb"
 SAMPLE_SQLITE = SAMPLES_PATH / "sample.sqlite"
+
+
+def get_candidate_values(candidates) -> list:
+    """Returns sorted rule name, line number, value and info of first line data of the candidates to compare scans"""
+    return sorted((x.rule_name, x.line_data_list[0].line_num, x.line_data_list[0].value, x.line_data_list[0].info)
+                  for x in candidates)
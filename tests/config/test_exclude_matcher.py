@@ -0,0 +1,92 @@
+import re
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
+from credsweeper.app import CredSweeper
+from credsweeper.config.exclude_matcher import ExcludeMatcher
+
+
+class ExcludeMatcherTest(TestCase):
+
+    def setUp(self):
+        self.config = SimpleNamespace(not_allowed_path_pattern=re.compile(r".*\.css$", flags=re.IGNORECASE),
+                                      exclude_patterns=[
+                                          re.compile(r".*/magic/.*"),
+                                          re.compile(r".*(number|digit)\.txt"),
+                                          re.compile(r".*\.min\..*", flags=re.IGNORECASE),
+                                      ],
+                                      exclude_paths=[f"/dir{i}/" for i in range(1000)] + ["/.git/", "/.github/"],
+                                      exclude_extensions=[".so"],
+                                      exclude_containers=[".gz"],
+                                      exclude_documents=[".pdf"])
+
+    def test_get_p(self) -> None:
+        config = CredSweeper().config
+        matcher = config.exclude_matcher
+        self.assertIs(matcher, config.exclude_matcher)
+        self.assertIs(matcher, ExcludeMatcher.get(config))
+        # the rules cannot be changed in place
+        with self.assertRaises(AttributeError):
+            config.exclude_paths.append("/tmp/")
+        # replaced attribute of config produces new matcher
+        config.exclude_paths = ("/tmp/", )
+        self.assertIsNot(matcher, config.exclude_matcher)
+        self.assertIs(config.exclude_matcher, ExcludeMatcher.get(config))
+        self.assertTrue(ExcludeMatcher.get(config).check_file("/tmp/dummy.py", 0, False))
+        # other objects with the attributes get new matcher
+        self.assertIsNot(ExcludeMatcher.get(self.config), ExcludeMatcher.get(self.config))
+        self.assertTrue(ExcludeMatcher.get(self.config).check_file("/home/.git/config", 0, False))
+
+    def test_check_file_p(self) -> None:
+        matcher = ExcludeMatcher(self.config)
+        self.assertTrue(matcher.check_file("tmp/dummy.CSS", 3, True))
+        self.assertTrue(matcher.check_file("tmp/magic/dummy.py", 3, True))
+        self.assertTrue(matcher.check_file("tmp/digit.txt", 3, True))
+        self.assertTrue(matcher.check_file("tmp/Number.txt", 3, True))
+        self.assertTrue(matcher.check_file("C:\\tmp\\jquery.MIN.js", 3, True))
+        self.assertTrue(matcher.check_file("/home/dir999/dummy.py", 3, True))
+        self.assertTrue(matcher.check_file("/home/.git/config", 3, True))
+        self.assertTrue(matcher.check_file("/home/.github/dummy.py", 3, True))
+        self.assertTrue(matcher.check_file("dummy.so", 3, True))
+        self.assertTrue(matcher.check_file("dummy.gz", 0, True))
+        self.assertTrue(matcher.check_file("dummy.pdf", 0, False))
+
+    def test_check_file_n(self) -> None:
+        matcher = ExcludeMatcher(self.config)
+        self.assertFalse(matcher.check_file("tmp/magic.py", 0, False))
+        self.assertFalse(matcher.check_file("/home/dir1000/dummy.py", 0, False))
+        # exclude paths are case-sensitive
+        self.assertFalse(matcher.check_file("/home/.GIT/config", 0, False))
+        self.assertFalse(matcher.check_file("/home/.gitignore", 0, False))
+        self.assertFalse(matcher.check_file("dummy.gz", 3, False))
+        self.assertFalse(matcher.check_file("dummy.pdf", 0, True))
+
+    def test_check_dir_p(self) -> None:
+        matcher = ExcludeMatcher(self.config)
+        self.assertTrue(matcher.check_dir("tmp/Magic"))
+        self.assertTrue(matcher.check_dir("/home/dir0"))
+        self.assertTrue(matcher.check_dir("C:\\home\\.git\\"))
+        # cached result
+        self.assertTrue(matcher.check_dir("/home/dir0"))
+
+    def test_check_dir_n(self) -> None:
+        matcher = ExcludeMatcher(self.config)
+        # the pattern with end anchor may not match files in the directory
+        self.assertFalse(matcher.check_dir("tmp/dummy.css"))
+        self.assertFalse(matcher.check_dir("tmp/number"))
+        self.assertFalse(matcher.check_dir("/home/dir1000"))
+
+    def test_check_dir_cache_p(self) -> None:
+        matcher = ExcludeMatcher(self.config)
+        with patch.object(ExcludeMatcher, "DIR_CACHE_SIZE", 4), \
+                patch.object(ExcludeMatcher, "_ExcludeMatcher__check_dir", return_value=False) as mocked_check:
+            self.assertFalse(matcher.check_dir("/home/hot"))
+            for i in range(10):
+                self.assertFalse(matcher.check_dir(f"/home/cold{i}"))
+                # the hot directory stays in the cache after overflow with other directories
+                self.assertFalse(matcher.check_dir("/home/hot"))
+            self.assertEqual(11, mocked_check.call_count)
+            # least recently used directory was evicted
+            self.assertFalse(matcher.check_dir("/home/cold0"))
+            self.assertEqual(12, mocked_check.call_count)
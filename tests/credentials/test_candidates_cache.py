@@ -0,0 +1,75 @@
+import os
+import stat
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from credsweeper.app import CredSweeper
+from credsweeper.credentials.candidates_cache import CandidatesCache
+from credsweeper.file_handler.string_content_provider import StringContentProvider
+
+
+class TestCandidatesCache(unittest.TestCase):
+
+    def setUp(self):
+        cred_sweeper = CredSweeper()
+        self.checksum = cred_sweeper.checksum
+        self.candidates = cred_sweeper.scanner.scan(StringContentProvider(["password = 'Xdj@jcN834b'"]))
+        self.assertEqual(1, len(self.candidates))
+
+    def test_put_get_p(self):
+        cache = CandidatesCache(self.checksum)
+        self.assertIsNone(cache.get("blob"))
+        cache.put("blob", self.candidates)
+        cache.put("clean", [])
+        self.assertIn("blob", cache)
+        self.assertEqual(2, len(cache))
+        self.assertListEqual([], cache.get("clean"))
+        replay = cache.get("blob")
+        self.assertEqual(1, len(replay))
+        self.assertIsNot(self.candidates[0], replay[0])
+        self.assertTrue(self.candidates[0].compare(replay[0]))
+        # post processing of replayed candidates does not change the stored
+        replay[0].ml_probability = 0.5
+        self.assertIsNone(cache.get("blob")[0].ml_probability)
+
+    def test_save_load_p(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = os.path.join(tmp_dir, "cache")
+            cache = CandidatesCache(self.checksum)
+            cache.put("blob", self.candidates)
+            cache.save(cache_path)
+            loaded_cache = CandidatesCache(self.checksum)
+            self.assertTrue(loaded_cache.load(cache_path))
+            self.assertTrue(self.candidates[0].compare(loaded_cache.get("blob")[0]))
+
+    def test_save_load_n(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = os.path.join(tmp_dir, "cache")
+            self.assertFalse(CandidatesCache(self.checksum).load(cache_path))
+            cache = CandidatesCache(self.checksum)
+            cache.put("blob", self.candidates)
+            cache.save(cache_path)
+            # other rules or config
+            other_cache = CandidatesCache("other")
+            self.assertFalse(other_cache.load(cache_path))
+            self.assertEqual(0, len(other_cache))
+            with open(cache_path, "wb") as f:
+                f.write(b"garbage")
+            self.assertFalse(CandidatesCache(self.checksum).load(cache_path))
+
+    def test_untrusted_load_n(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = os.path.join(tmp_dir, "cache")
+            cache = CandidatesCache(self.checksum)
+            cache.put("blob", self.candidates)
+            cache.save(cache_path)
+            self.assertFalse(os.stat(cache_path).st_mode & (stat.S_IWGRP | stat.S_IWOTH))
+            os.chmod(cache_path, 0o666)
+            with patch("pickle.load") as mocked_load:
+                self.assertFalse(CandidatesCache(self.checksum).load(cache_path))
+                mocked_load.assert_not_called()
+            os.chmod(cache_path, 0o600)
+            with patch("os.getuid", return_value=os.getuid() + 1):
+                self.assertFalse(CandidatesCache(self.checksum).load(cache_path))
+            self.assertTrue(CandidatesCache(self.checksum).load(cache_path))
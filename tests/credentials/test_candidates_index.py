@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from credsweeper.app import CredSweeper
+from credsweeper.credentials.candidates_index import CandidatesIndex
+from credsweeper.file_handler.text_content_provider import TextContentProvider
+
+
+class TestCandidatesIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.cred_sweeper = CredSweeper()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.index_path = os.path.join(self.tmp_dir.name, "index.sqlite")
+        self.file_path = os.path.join(self.tmp_dir.name, "file.txt")
+        with open(self.file_path, "w") as f:
+            f.write("password = 'Xdj@jcN834b'")
+        self.candidates = self.cred_sweeper.scanner.scan(TextContentProvider(self.file_path))
+        self.assertEqual(1, len(self.candidates))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_get_candidates_p(self):
+        index = CandidatesIndex(self.index_path, self.cred_sweeper.checksum)
+        stat = index.get_stat(self.file_path)
+        self.assertIsNone(index.get_candidates(self.file_path, stat))
+        self.assertTrue(index.put_candidates(self.file_path, stat, self.candidates))
+        index.close()
+        index = CandidatesIndex(self.index_path, self.cred_sweeper.checksum)
+        self.assertEqual(1, len(index))
+        candidates = index.get_candidates(self.file_path, stat)
+        self.assertTrue(self.candidates[0].compare(candidates[0]))
+        # modification time is changed but the content is the same
+        os.utime(self.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        candidates = index.get_candidates(self.file_path, index.get_stat(self.file_path))
+        self.assertTrue(self.candidates[0].compare(candidates[0]))
+        index.close()
+
+    def test_get_candidates_n(self):
+        index = CandidatesIndex(self.index_path, self.cred_sweeper.checksum)
+        stat = index.get_stat(self.file_path)
+        self.assertTrue(index.put_candidates(self.file_path, stat, self.candidates))
+        # the same size but other content
+        with open(self.file_path, "w") as f:
+            f.write("password = 'Xdj@jcN834X'")
+        os.utime(self.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        new_stat = index.get_stat(self.file_path)
+        self.assertEqual(stat.st_size, new_stat.st_size)
+        self.assertIsNone(index.get_candidates(self.file_path, new_stat))
+        # the file was changed during scan
+        self.assertFalse(index.put_candidates(self.file_path, stat, self.candidates))
+        self.assertIsNone(index.get_stat(self.tmp_dir.name))
+        index.close()
+        # other checksum clears the index
+        index = CandidatesIndex(self.index_path, "other")
+        self.assertEqual(0, len(index))
+        index.close()
+
+    def test_untrusted_index_n(self):
+        index = CandidatesIndex(self.index_path, self.cred_sweeper.checksum)
+        stat = index.get_stat(self.file_path)
+        self.assertTrue(index.put_candidates(self.file_path, stat, self.candidates))
+        index.close()
+        os.chmod(self.index_path, 0o666)
+        index = CandidatesIndex(self.index_path, self.cred_sweeper.checksum)
+        with patch("pickle.loads") as mocked_loads:
+            self.assertIsNone(index.get_candidates(self.file_path, stat))
+            mocked_loads.assert_not_called()
+        index.close()
+        os.chmod(self.index_path, 0o600)
+        with patch("os.getuid", return_value=os.getuid() + 1):
+            index = CandidatesIndex(self.index_path, self.cred_sweeper.checksum)
+        self.assertIsNone(index.get_candidates(self.file_path, stat))
+        index.close()
+        index = CandidatesIndex(self.index_path, self.cred_sweeper.checksum)
+        self.assertIsNotNone(index.get_candidates(self.file_path, stat))
+        index.close()
@@ -29,3 +29,19 @@ class TestCredentialManager:
         groups = cred_sweeper.credential_manager.group_credentials()
         # Assert that no credentials can be grouped in tested cases
         assert len(groups) == len(detections)
+
+    def test_add_credential_p(self):
+        cred_sweeper = CredSweeper()
+        provider = StringContentProvider(["password = 'mybstscrt'", "password = 'mybstscrt'"])
+        detections = cred_sweeper.scanner.scan(provider)
+        assert len(detections) == 2
+        manager = cred_sweeper.credential_manager
+        assert all(manager.add_credential(x) for x in detections)
+        # the same candidates are duplicates
+        assert not any(manager.add_credential(x) for x in detections)
+        assert manager.len_credentials() == 2
+        manager.remove_credential(detections[0])
+        assert manager.add_credential(detections[0])
+        manager.clear_credentials()
+        assert manager.add_credential(detections[1])
+        assert manager.len_credentials() == 1
@@ -0,0 +1,134 @@
+import os
+import pickle
+import tempfile
+import unittest
+import zipfile
+from unittest.mock import patch
+
+from credsweeper.app import CredSweeper
+from credsweeper.credentials.digest_cache import DigestCache
+from credsweeper.deep_scanner.deep_scanner import DeepScanner
+from credsweeper.file_handler.descriptor import Descriptor
+from credsweeper.file_handler.files_provider import FilesProvider
+from credsweeper.file_handler.string_content_provider import StringContentProvider
+
+DATA = b"password = 'Xdj@jcN834b'"
+
+
+class TestDigestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.descriptor = Descriptor("app.zip", ".conf", "FILE:app.zip|ZIP:a/app.conf")
+        self.other_descriptor = Descriptor("app.zip", ".conf", "FILE:app.zip|ZIP:b/app.conf")
+        provider = StringContentProvider([DATA.decode()], file_path="app.zip", info=f"{self.descriptor.info}|RAW")
+        self.candidates = CredSweeper().scanner.scan(provider)
+        self.assertEqual(1, len(self.candidates))
+
+    def test_put_get_p(self):
+        cache = DigestCache(1 << 20)
+        key = cache.get_key(DATA, self.descriptor, 3)
+        self.assertEqual(key, cache.get_key(DATA, self.other_descriptor, 3))
+        self.assertIsNone(cache.get(key, self.other_descriptor, 100))
+        cache.put(key, self.descriptor, 100, self.candidates)
+        self.assertEqual(1, len(cache))
+        replay = cache.get(key, self.other_descriptor, 100)
+        self.assertEqual(1, len(replay))
+        self.assertIsNot(self.candidates[0], replay[0])
+        # the candidate is replayed with info of the other member
+        self.assertEqual("FILE:app.zip|ZIP:b/app.conf|RAW", replay[0].line_data_list[0].info)
+        self.assertEqual("FILE:app.zip|ZIP:a/app.conf|RAW", self.candidates[0].line_data_list[0].info)
+        self.assertEqual(self.candidates[0].line_data_list[0].value, replay[0].line_data_list[0].value)
+        # a scan with smaller limit does not find more, but bigger limit might
+        self.assertIsNotNone(cache.get(key, self.other_descriptor, 10))
+        self.assertIsNone(cache.get(key, self.other_descriptor, 1000))
+        # items are not sent to other processes
+        self.assertEqual(0, len(pickle.loads(pickle.dumps(cache))))
+        cache.clear()
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.size)
+
+    def test_get_key_n(self):
+        cache = DigestCache(1 << 20)
+        key = cache.get_key(DATA, self.descriptor, 3)
+        self.assertNotEqual(key, cache.get_key(DATA, self.descriptor, 2))
+        self.assertNotEqual(key, cache.get_key(DATA, Descriptor("other.zip", ".conf", self.descriptor.info), 3))
+        self.assertNotEqual(key, cache.get_key(DATA, Descriptor("app.zip", ".py", self.descriptor.info), 3))
+        # too small data is not scanned at all
+        self.assertIsNone(cache.get_key(b"x", self.descriptor, 3))
+        self.assertIsNone(DigestCache(0).get_key(DATA, self.descriptor, 3))
+
+    def test_eviction_p(self):
+        cache = DigestCache(3 * DigestCache.ITEM_SIZE)
+        keys = [cache.get_key(DATA + bytes([i]), self.descriptor, 3) for i in range(4)]
+        for key in keys[:3]:
+            cache.put(key, self.descriptor, 100, [])
+        # the first key becomes recently used
+        self.assertListEqual([], cache.get(keys[0], self.descriptor, 100))
+        cache.put(keys[3], self.descriptor, 100, [])
+        self.assertEqual(3, len(cache))
+        self.assertEqual(3 * DigestCache.ITEM_SIZE, cache.size)
+        self.assertIsNone(cache.get(keys[1], self.descriptor, 100))
+        self.assertIsNotNone(cache.get(keys[0], self.descriptor, 100))
+        # oversize item is not stored
+        cache.put(keys[1], self.descriptor, 100, self.candidates * 10)
+        self.assertIsNone(cache.get(keys[1], self.descriptor, 100))
+        self.assertEqual(3, len(cache))
+
+    def test_member_scan_p(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "app.jar")
+            with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as zf:
+                for i in range(4):
+                    zf.writestr(f"conf{i}/app.properties", DATA)
+                    zf.writestr(f"conf{i}/app.yaml", DATA)
+            results = []
+            for capacity in (0, 1 << 20):
+                cred_sweeper = CredSweeper(ml_threshold=0, depth=3)
+                cred_sweeper.config.digest_cache_size = capacity
+                cred_sweeper.deep_scanner = DeepScanner(cred_sweeper.config, cred_sweeper.scanner)
+                with patch.object(DeepScanner, "recursive_scan", side_effect=DeepScanner.recursive_scan,
+                                  autospec=True) as mocked_scan:
+                    cred_sweeper.run(FilesProvider([file_path]))
+                results.append((mocked_scan.call_count,
+                                sorted((x.line_data_list[0].value, x.line_data_list[0].info)
+                                       for x in cred_sweeper.credential_manager.get_credentials())))
+            self.assertEqual(8, len(results[0][1]))
+            self.assertListEqual(results[0][1], results[1][1])
+            # identical members are scanned once
+            self.assertLess(results[1][0], results[0][0])
+
+    def test_start_run_p(self):
+        cache = DigestCache(1 << 20)
+        key = cache.get_key(DATA, self.descriptor, 3)
+        cache.start_run(1)
+        cache.put(key, self.descriptor, 100, self.candidates)
+        # next batch of the same run keeps the items
+        cache.start_run(1)
+        self.assertEqual(1, len(cache))
+        cache.start_run(2)
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.size)
+
+    def test_pool_batch_scan_p(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "app.jar")
+            with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as zf:
+                for i in range(2):
+                    zf.writestr(f"conf{i}/app.properties", DATA)
+            cred_sweeper = CredSweeper(ml_threshold=0, depth=3)
+            providers = FilesProvider([file_path]).get_scannable_files(cred_sweeper.config)
+            # the instance is kept in the process as in a process of persistent pool
+            with patch("signal.signal"):
+                CredSweeper.pool_initializer({}, cred_sweeper)
+            try:
+                candidates, _, _ = CredSweeper.pool_batch_scan(1, providers)
+                self.assertEqual(2, len(candidates))
+                self.assertLess(0, len(cred_sweeper.deep_scanner.digest_cache))
+                CredSweeper.pool_batch_scan(1, [])
+                self.assertLess(0, len(cred_sweeper.deep_scanner.digest_cache))
+                # the items of previous run are not replayed in next scan
+                CredSweeper.pool_batch_scan(2, [])
+                self.assertEqual(0, len(cred_sweeper.deep_scanner.digest_cache))
+            finally:
+                with patch("signal.signal"):
+                    CredSweeper.pool_initializer({}, None)
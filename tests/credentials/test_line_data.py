@@ -1,3 +1,4 @@
+import pickle
 import re
 import string
 import unittest
@@ -136,6 +137,23 @@ class TestLineDataStartEnd(unittest.TestCase):
         self.assertEqual(MAX_LINE_LENGTH, line_data.value_start)
         self.assertEqual(1 + MAX_LINE_LENGTH, line_data.value_end)
 
+    def test_missing_groups_start_end_n(self) -> None:
+        """Check positions of groups which are missing or not matched in the pattern"""
+        line_data = LineData(None, "key=0123456789", 0, 1, "", "", "",
+                             re.compile(r"(?P<variable>key)(?P<separator>:)?=(?P<value>[3-7]+)?"))
+        self.assertEqual("key", line_data.variable)
+        self.assertEqual((-1, -1), (line_data.separator_start, line_data.separator_end))
+        self.assertIsNone(line_data.value)
+        self.assertEqual((-1, -1), (line_data.value_start, line_data.value_end))
+        self.assertIsNone(line_data.key)
+        self.assertIsNone(line_data.wrap)
+        line_data = LineData(None, "0123456789", 0, 1, "", "", "", re.compile(r"(?P<value>[3-7]+)"))
+        self.assertIsNone(line_data.variable)
+        self.assertEqual((LineData.EXCEPTION_POSITION, LineData.EXCEPTION_POSITION),
+                         (line_data.variable_start, line_data.variable_end))
+        self.assertEqual((LineData.EXCEPTION_POSITION, LineData.EXCEPTION_POSITION),
+                         (line_data.separator_start, line_data.separator_end))
+
     def test_part_url_sanitize_p(self) -> None:
         line_data = LineData(None,
                              "39084?token=3487263-2384579834-234732875-345&key=DnBeiGdgy6253fytfdDHGg&hasToBeFound=2",
@@ -216,3 +234,20 @@ class TestLineDataStartEnd(unittest.TestCase):
             "",
             LineData(None, "[{(extra-cleaned-value password=}}]})]}}])", 0, 1, "", "", "",
                      re.compile(r".*(?P<variable>password)(?P<separator>=)(?P<value>.+)")).value)
+
+    def test_lazy_sanitize_p(self) -> None:
+        line_data = LineData(None, "curl -u user --password=Xdj@jcN834b -X POST", 0, 1, "", "", "",
+                             re.compile(r"(?P<variable>--password)(?P<separator>=)(?P<value>.+)"))
+        self.assertFalse(hasattr(line_data, "__dict__"))
+        # sanitization is performed on first access
+        self.assertFalse(line_data._LineData__sanitized)
+        self.assertEqual("Xdj@jcN834b -X POST", line_data._LineData__value)
+        self.assertEqual("Xdj@jcN834b", line_data.value)
+        self.assertTrue(line_data._LineData__sanitized)
+        self.assertEqual("password", line_data.variable)
+        self.assertEqual(24, line_data.value_start)
+        self.assertEqual(35, line_data.value_end)
+        # the copy keeps sanitized fields
+        line_data_copy = pickle.loads(pickle.dumps(line_data))
+        self.assertEqual(line_data.value, line_data_copy.value)
+        self.assertEqual(line_data.value_end, line_data_copy.value_end)
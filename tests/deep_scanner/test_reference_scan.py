@@ -0,0 +1,156 @@
+import gzip
+import os
+import pickle
+import shutil
+import tarfile
+import tempfile
+import unittest
+import zipfile
+
+from credsweeper.app import CredSweeper
+from credsweeper.file_handler.member_content_provider import MemberContentProvider
+from credsweeper.file_handler.text_content_provider import TextContentProvider
+from tests import SAMPLES_PATH, SAMPLE_ZIP, get_candidate_values
+
+SAMPLE_NAMES = ["password.gradle", "sample.py", "key.php", "token.toml", "test.html", "url_cred.js"]
+
+
+class TestReferenceScan(unittest.TestCase):
+
+    @staticmethod
+    def pack_samples(path: str) -> None:
+        """Packs sample files and nested zip archive into ZIP, TAR or gzipped TAR archive by extension of the path"""
+        sample_paths = [SAMPLES_PATH / x for x in SAMPLE_NAMES] + [SAMPLE_ZIP]
+        if path.endswith(".gz"):
+            TestReferenceScan.pack_samples(path[:-3])
+            with open(path[:-3], "rb") as f_in, gzip.open(path, "wb") as f_out:
+                shutil.copyfileobj(f_in, f_out)
+            os.remove(path[:-3])
+        elif path.endswith(".zip") or path.endswith(".jar"):
+            with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+                for sample_path in sample_paths:
+                    zf.write(sample_path, f"samples/{sample_path.name}")
+        else:
+            with tarfile.open(path, "w") as tf:
+                for sample_path in sample_paths:
+                    tf.add(sample_path, f"samples/{sample_path.name}")
+
+    def assert_split_scan(self, file_path: str, fanout_size: int) -> list:
+        """Checks that scan of the parts finds the same as scan of whole file and returns the parts"""
+        cred_sweeper = CredSweeper(ml_threshold=0, depth=5)
+        content_provider = TextContentProvider(file_path)
+        expected = get_candidate_values(cred_sweeper.deep_scanner.scan(content_provider, 5))
+        self.assertLess(len(SAMPLE_NAMES), len(expected))
+        cred_sweeper.config.fanout_size = fanout_size
+        member_providers = cred_sweeper.deep_scanner.get_member_providers(content_provider, 5, 4)
+        self.assertLess(1, len(member_providers))
+        candidates = []
+        for member_provider in member_providers:
+            # the reference is sent to a process of pool
+            member_provider = pickle.loads(pickle.dumps(member_provider))
+            candidates.extend(cred_sweeper.deep_scanner.scan(member_provider, 5))
+        self.assertListEqual(expected, get_candidate_values(candidates))
+        return member_providers
+
+    def test_get_member_providers_p(self) -> None:
+        for name in ["sample.tar", "sample.zip"]:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                file_path = os.path.join(tmp_dir, name)
+                self.pack_samples(file_path)
+                # nested archives are smaller than fanout size
+                member_providers = self.assert_split_scan(file_path, SAMPLE_ZIP.stat().st_size + 1)
+                self.assertSetEqual({()}, set(x.chain for x in member_providers))
+                # the parts cover all members without gaps
+                if name.endswith(".zip"):
+                    self.assertListEqual(list(range(1 + len(SAMPLE_NAMES))),
+                                         [i for x in member_providers for i in x.members])
+                else:
+                    with tarfile.open(file_path) as tf:
+                        self.assertListEqual([x.offset for x in tf.getmembers()],
+                                             [i for x in member_providers for i in x.members])
+
+    def test_get_member_providers_nested_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.pack_samples(os.path.join(tmp_dir, "app.jar"))
+            self.pack_samples(os.path.join(tmp_dir, "layer.tar.gz"))
+            file_path = os.path.join(tmp_dir, "release.zip")
+            with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as zf:
+                zf.write(os.path.join(tmp_dir, "app.jar"), "lib/app.jar")
+                zf.write(os.path.join(tmp_dir, "layer.tar.gz"), "layer.tar.gz")
+                zf.write(SAMPLES_PATH / "password.gradle", "password.gradle")
+            member_providers = self.assert_split_scan(file_path, SAMPLE_ZIP.stat().st_size + 1)
+            # members of big nested archives are split instead of the archives
+            self.assertSetEqual({(), (("ZIP", "lib/app.jar"), ), (("ZIP", "layer.tar.gz"), ("GZIP", file_path))},
+                                set(x.chain for x in member_providers))
+            self.assertSetEqual({"ZIP", "TAR"}, set(x.container for x in member_providers))
+
+    def test_get_member_providers_gzip_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "sample.tar.gz")
+            self.pack_samples(file_path)
+            member_providers = self.assert_split_scan(file_path, 1)
+            # members of nested zip archive are split too
+            self.assertIn((("GZIP", file_path[:-3]), ), set(x.chain for x in member_providers))
+            self.assertIn((("GZIP", file_path[:-3]), ("TAR", "samples/pem_key.zip")),
+                          set(x.chain for x in member_providers))
+
+    def test_get_member_providers_n(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "sample.tar")
+            self.pack_samples(file_path)
+            cred_sweeper = CredSweeper(ml_threshold=0, depth=3)
+            content_provider = TextContentProvider(file_path)
+            # the archive is smaller than default fanout size
+            self.assertIsNone(cred_sweeper.deep_scanner.get_member_providers(content_provider, 3, 4))
+            cred_sweeper.config.fanout_size = 1
+            self.assertIsNone(cred_sweeper.deep_scanner.get_member_providers(content_provider, 0, 4))
+            self.assertIsNone(cred_sweeper.deep_scanner.get_member_providers(content_provider, 3, 1))
+            self.assertIsNotNone(cred_sweeper.deep_scanner.get_member_providers(content_provider, 3, 4))
+            # nested archives are not split without levels of recursion for their members
+            member_providers = cred_sweeper.deep_scanner.get_member_providers(content_provider, 1, 4)
+            self.assertSetEqual({()}, set(x.chain for x in member_providers))
+            # office document is not split
+            docx_path = str(SAMPLES_PATH / "sample.docx")
+            self.assertIsNone(cred_sweeper.deep_scanner.get_member_providers(TextContentProvider(docx_path), 3, 4))
+
+    def test_reference_scan_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "sample.tar")
+            self.pack_samples(file_path)
+            cred_sweeper = CredSweeper(ml_threshold=0, depth=3)
+            expected = [
+                x for x in get_candidate_values(cred_sweeper.deep_scanner.scan(TextContentProvider(file_path), 3))
+                if "|TAR:samples/pem_key.zip|ZIP:cred/pem_key.zip|" in x[3]
+            ]
+            self.assertLess(0, len(expected))
+            with zipfile.ZipFile(SAMPLE_ZIP) as zf:
+                index = [x.filename for x in zf.infolist()].index("cred/pem_key.zip")
+            member_provider = MemberContentProvider(file_path=file_path,
+                                                    info=f"FILE:{file_path}",
+                                                    chain=(("TAR", "samples/pem_key.zip"), ),
+                                                    container="ZIP",
+                                                    members=(index, ))
+            self.assertListEqual(expected, get_candidate_values(cred_sweeper.deep_scanner.scan(member_provider, 3)))
+            # each member of the chain takes a level of recursion
+            self.assertListEqual([], cred_sweeper.deep_scanner.scan(member_provider, 1))
+
+    def test_reference_scan_n(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "sample.zip")
+            self.pack_samples(file_path)
+            cred_sweeper = CredSweeper(ml_threshold=0, depth=3)
+            # wrong container type of the file
+            member_provider = MemberContentProvider(file_path=file_path,
+                                                    info=f"FILE:{file_path}",
+                                                    container="TAR",
+                                                    members=(0, ))
+            self.assertListEqual([], cred_sweeper.deep_scanner.scan(member_provider, 3))
+            self.assertIsNone(member_provider.data)
+            self.assertListEqual([], list(member_provider.yield_analysis_target(0)))
+            # missed member of the chain
+            member_provider = MemberContentProvider(file_path=file_path,
+                                                    info=f"FILE:{file_path}",
+                                                    chain=(("ZIP", "missed.zip"), ),
+                                                    container="ZIP",
+                                                    members=(0, ))
+            self.assertListEqual([], cred_sweeper.deep_scanner.scan(member_provider, 3))
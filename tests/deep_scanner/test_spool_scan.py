@@ -0,0 +1,78 @@
+import bz2
+import io
+import os
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from unittest.mock import patch, PropertyMock
+
+from credsweeper.app import CredSweeper
+from credsweeper.deep_scanner.deep_scanner import DeepScanner
+from credsweeper.file_handler.files_provider import FilesProvider
+from credsweeper.file_handler.spooled_content_provider import SpooledContentProvider
+from tests import get_candidate_values
+
+TEXT = b"\n".join([b"plain line without secrets"] * 100 + [b"password = 'Xdj@jcN834b'"] * 2)
+
+
+class TestSpoolScan(unittest.TestCase):
+
+    @staticmethod
+    def make_archive(path: str) -> None:
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("nested/app.conf", TEXT)
+        with tarfile.open(path, "w:gz") as tf:
+            for name, data in (("app.log", TEXT), ("nested.zip", zip_buffer.getvalue()), ("app.log.bz2",
+                                                                                          bz2.compress(TEXT))):
+                tar_info = tarfile.TarInfo(name)
+                tar_info.size = len(data)
+                tf.addfile(tar_info, io.BytesIO(data))
+
+    @staticmethod
+    def get_values(cred_sweeper: CredSweeper, path: str):
+        cred_sweeper.run(FilesProvider([path]))
+        return get_candidate_values(cred_sweeper.credential_manager.get_credentials())
+
+    def test_spool_scan_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "sample.tar.gz")
+            self.make_archive(file_path)
+            expected = self.get_values(CredSweeper(ml_threshold=0, depth=5), file_path)
+            self.assertEqual(6, len(expected))
+            cred_sweeper = CredSweeper(ml_threshold=0, depth=5)
+            # all members and the archive are bigger than the spool size
+            cred_sweeper.config.spool_size = 64
+            with patch.object(SpooledContentProvider, "data", new_callable=PropertyMock) as mocked_data:
+                self.assertListEqual(expected, self.get_values(cred_sweeper, file_path))
+                mocked_data.assert_not_called()
+            # temporary files are removed after the scan
+            self.assertListEqual([], [x for x in os.listdir(tempfile.gettempdir()) if x.startswith("credsweeper_")])
+
+    def test_spool_scan_long_extension_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "sample.zip")
+            with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as zf:
+                zf.writestr(f"app.{'x' * 300}", TEXT)
+                zf.writestr("app.log", TEXT)
+            cred_sweeper = CredSweeper(ml_threshold=0, depth=3)
+            cred_sweeper.config.spool_size = 64
+            # the oversize member with too long extension for a file name is spooled too
+            self.assertEqual(4, len(self.get_values(cred_sweeper, file_path)))
+
+    def test_spool_scan_limit_n(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "sample.tar.gz")
+            self.make_archive(file_path)
+            cred_sweeper = CredSweeper(ml_threshold=0, depth=5, size_limit="1KiB")
+            cred_sweeper.config.spool_size = 64
+            self.assertListEqual([], self.get_values(cred_sweeper, file_path))
+
+    def test_is_spool_container_p(self) -> None:
+        self.assertTrue(DeepScanner.is_spool_container(b"PK\003\004", ".jar"))
+        self.assertTrue(DeepScanner.is_spool_container(bz2.compress(TEXT), ""))
+
+    def test_is_spool_container_n(self) -> None:
+        self.assertFalse(DeepScanner.is_spool_container(b"PK\003\004", ".docx"))
+        self.assertFalse(DeepScanner.is_spool_container(TEXT, ".tar"))
@@ -40,6 +40,36 @@ class DataContentProviderTest(unittest.TestCase):
             self.assertFalse(content_provider.represent_as_encoded(), param)
             self.assertFalse(content_provider.decoded)
 
+    def test_represent_as_structure_p(self) -> None:
+        for param in [
+            b'{"password": "Xdj@jcN834b"}',  # json
+            b'{"password": "Xdj@jcN834b"}\n{"token": "Xdj@jcN834b"}\n',  # ndjson
+            b"password = 'Xdj@jcN834b'\ntoken = 'Xdj@jcN834b'\nkey = 'Xdj@jcN834b'\n",  # python
+            b"password: Xdj@jcN834b\ntoken: Xdj@jcN834b\nkey: [ Xdj@jcN834b ]\n",  # yaml
+        ]:  # yapf: disable
+            content_provider = DataContentProvider(data=param)
+            self.assertTrue(content_provider.represent_as_structure(), param)
+            self.assertTrue(content_provider.structure, param)
+
+    def test_represent_as_structure_budget_n(self) -> None:
+        data = b"password: Xdj@jcN834b\ntoken: Xdj@jcN834b\nkey: [ Xdj@jcN834b ]\n"
+        with self.assertLogs("credsweeper.file_handler.data_content_provider", level="INFO") as logs:
+            self.assertIsNone(DataContentProvider(data=data).represent_as_structure(size_budget=len(data) - 1))
+        self.assertIn("not parsed as structure", logs.output[0])
+        # the text within the budget is still parsed
+        self.assertTrue(DataContentProvider(data=data).represent_as_structure(size_budget=len(data)))
+        # the time budget is exceeded before first event of yaml parser
+        content_provider = DataContentProvider(data=data)
+        self.assertIsNone(content_provider.represent_as_structure(time_budget=-1))
+        self.assertIsNone(content_provider.structure)
+        ndjson_data = b'{"password": "Xdj@jcN834b"}\n{"token": "Xdj@jcN834b"}\n'
+        self.assertIsNone(DataContentProvider(data=ndjson_data).represent_as_structure(time_budget=-1))
+        # sniffing rejects the text without parsing
+        with patch.object(DataContentProvider, "_load_yaml") as mocked_load:
+            content_provider = DataContentProvider(data=b"plain text\nkey: value\nnext: value\n")
+            self.assertIsNone(content_provider.represent_as_structure())
+            mocked_load.assert_not_called()
+
     def test_wrong_xml_n(self) -> None:
         content_provider1 = DataContentProvider(data=b"")
         with patch('logging.Logger.debug') as mocked_logger:
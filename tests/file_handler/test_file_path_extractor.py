@@ -86,6 +86,32 @@ class TestFilePathExtractor(unittest.TestCase):
         expected_path = os.path.join(tmp_dir, "src", "dir", "file.cpp")
         self.assertEqual(expected_path, filtered_files[0])
 
+    def test_apply_gitignore_nested_n(self) -> None:
+        """Evaluate that files are checked with the nearest repository and tracked files are not ignored"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            repo = git.Repo.init(tmp_dir)
+            with open(os.path.join(tmp_dir, ".gitignore"), "w") as f:
+                f.write("*.txt\n")
+            tracked_path = os.path.join(tmp_dir, "tracked.txt")
+            with open(tracked_path, "w") as f:
+                f.write(AZ_STRING)
+            repo.index.add([tracked_path], force=True)
+            sub_dir = os.path.join(tmp_dir, "sub")
+            git.Repo.init(sub_dir)
+            with open(os.path.join(sub_dir, ".gitignore"), "w") as f:
+                f.write("*.log\n")
+            files = [
+                tracked_path,
+                os.path.join(tmp_dir, "file.txt"),
+                os.path.join(tmp_dir, "file.log"),
+                os.path.join(sub_dir, "file.txt"),
+                os.path.join(sub_dir, "dir", "file.log"),
+            ]
+            filtered_files = FilePathExtractor.apply_gitignore(files)
+            self.assertListEqual([files[0], files[2], files[3]], filtered_files)
+            self.assertFalse(FilePathExtractor.is_valid_path(files[1]))
+            self.assertTrue(FilePathExtractor.is_valid_path(files[3]))
+
     def assert_true_check_exclude_file(self, paths: List[str]):
         for i in paths:
             self.assertTrue(FilePathExtractor.check_exclude_file(self.config, i), i)
@@ -195,3 +221,41 @@ class TestFilePathExtractor(unittest.TestCase):
             paths = FilePathExtractor.get_file_paths(self.config, tmp_dir)
             self.assertEqual(1, len(paths))
             self.assertEqual(target_path, paths[0])
+
+    def test_check_exclude_dir_p(self) -> None:
+        self.config.exclude_paths = ["/.git/"]
+        self.config.exclude_patterns = [re.compile(r".*magic.*number.*")]
+        self.assertTrue(FilePathExtractor.check_exclude_dir(self.config, "C:\\.git"))
+        self.assertTrue(FilePathExtractor.check_exclude_dir(self.config, "./.git/"))
+        self.assertTrue(FilePathExtractor.check_exclude_dir(self.config, "tmp/Magic/Number"))
+        self.assertTrue(FilePathExtractor.check_exclude_dir(self.config, "tmp/dummy.css"))
+
+    def test_check_exclude_dir_n(self) -> None:
+        self.config.exclude_paths = ["/.git/"]
+        self.config.exclude_patterns = [re.compile(r".*magic.*number$"), re.compile(r".*magic(?!number)")]
+        self.config.exclude_extensions = [".so"]
+        self.assertFalse(FilePathExtractor.check_exclude_dir(self.config, "tmp/.gitignore"))
+        self.assertFalse(FilePathExtractor.check_exclude_dir(self.config, "tmp/dummy.so"))
+        # the patterns may not match files in the directory
+        self.assertFalse(FilePathExtractor.check_exclude_dir(self.config, "tmp/magic"))
+        self.assertFalse(FilePathExtractor.check_exclude_dir(self.config, "tmp/magic/number"))
+
+    def test_yield_file_paths_p(self) -> None:
+        self.config.exclude_paths = ["/.git/"]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for sub_dir in ["a", "a/b", "a/b/c", "d", ".git", ".git/objects"]:
+                os.mkdir(os.path.join(tmp_dir, sub_dir))
+                for name in ["1.txt", "2.py", "3.css"]:
+                    with open(os.path.join(tmp_dir, sub_dir, name), "w") as f:
+                        f.write(AZ_STRING)
+            expected = [
+                os.path.join(root, name) for root, _, files in os.walk(tmp_dir) for name in files
+                if not FilePathExtractor.check_exclude_file(self.config, os.path.join(root, name))
+            ]
+            self.assertEqual(8, len(expected))
+            with mock.patch("os.scandir", side_effect=os.scandir) as mock_scandir:
+                paths = FilePathExtractor.yield_file_paths(self.config, tmp_dir)
+                self.assertEqual(expected[0], next(paths))
+                self.assertListEqual(expected[1:], list(paths))
+            # excluded directories are not listed
+            self.assertEqual(5, mock_scandir.call_count)
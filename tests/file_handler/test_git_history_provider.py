@@ -0,0 +1,85 @@
+import os
+import subprocess
+import tempfile
+import time
+import unittest
+
+from credsweeper.app import CredSweeper
+from credsweeper.file_handler.git_blob_content_provider import GitBlobContentProvider
+from credsweeper.file_handler.git_cat_file import GitCatFile
+from credsweeper.file_handler.git_history_provider import GitHistoryProvider
+
+
+class TestGitHistoryProvider(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.repo_path = self.tmp_dir.name
+        self.git("init", "-q", "-b", "master")
+        self.commit("key.txt", "password = 'Xdj@jcN834b'\n")
+        self.commit("key.txt", "none\n")
+        self.git("checkout", "-q", "-b", "other")
+        # the same blob in other branch and path
+        self.commit("key.txt", "password = 'Xdj@jcN834b'\n")
+        self.commit("image.png", "password = 'Xdj@jcN834c'\n")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def git(self, *args: str) -> str:
+        return subprocess.run(["git", "-C", self.repo_path, "-c", "user.name=Test", "-c", "user.email=t@e.st", *args],
+                              check=True,
+                              capture_output=True).stdout.decode()
+
+    def commit(self, file_name: str, text: str) -> None:
+        with open(os.path.join(self.repo_path, file_name), "w") as f:
+            f.write(text)
+        self.git("add", file_name)
+        self.git("commit", "-q", "-m", file_name)
+
+    def test_get_scannable_files_p(self) -> None:
+        cred_sweeper = CredSweeper()
+        providers = GitHistoryProvider([self.repo_path]).get_scannable_files(cred_sweeper.config)
+        # second blob of key.txt is too short, image.png is excluded by extension, first blob is unique
+        self.assertEqual(1, len(providers))
+        provider = providers[0]
+        self.assertIsInstance(provider, GitBlobContentProvider)
+        self.assertEqual("key.txt", provider.file_path)
+        self.assertEqual(f"BLOB:{provider.blob_sha1}", provider.info)
+        self.assertEqual(25, provider.data_size)
+        self.assertEqual(b"password = 'Xdj@jcN834b'\n", provider.data)
+        self.assertListEqual(["password = 'Xdj@jcN834b'", ""], provider.lines)
+        # the blob is not kept after scan with --thrifty
+        provider.free()
+        self.assertNotIn("data", provider.__dict__)
+        self.assertNotIn("lines", provider.__dict__)
+
+    def test_run_p(self) -> None:
+        cred_sweeper = CredSweeper(ml_threshold=0)
+        self.assertEqual(1, cred_sweeper.run(GitHistoryProvider([self.repo_path], refs=["master", "other"])))
+        line_data = cred_sweeper.credential_manager.get_credentials()[0].line_data_list[0]
+        self.assertEqual("key.txt", line_data.path)
+        self.assertEqual("Xdj@jcN834b", line_data.value)
+
+    def test_get_scannable_files_n(self) -> None:
+        cred_sweeper = CredSweeper()
+        self.assertListEqual([], GitHistoryProvider([self.tmp_dir.name + "_"]).get_scannable_files(cred_sweeper.config))
+        provider = GitBlobContentProvider(self.repo_path, "0" * 40, 10, "missing")
+        self.assertIsNone(provider.data)
+
+    def test_git_cat_file_n(self) -> None:
+        blob_sha1 = self.git("rev-parse", "master:key.txt").strip()
+        git_cat_file = GitCatFile.get(self.repo_path)
+        self.assertEqual(b"none\n", git_cat_file.read(blob_sha1))
+        # the process is killed e.g. by OOM killer
+        git_cat_file._GitCatFile__process.kill()
+        git_cat_file._GitCatFile__process.wait()
+        self.assertIsNone(git_cat_file.read(blob_sha1))
+        # the broken instance is dropped and next read starts new process
+        self.assertIsNot(git_cat_file, GitCatFile.get(self.repo_path))
+        self.assertEqual(b"none\n", GitCatFile.get(self.repo_path).read(blob_sha1))
+        # the process exits immediately for wrong path of repository
+        missed_repo = GitCatFile.get(self.tmp_dir.name + "_")
+        time.sleep(1)
+        self.assertIsNone(missed_repo.read(blob_sha1))
+        self.assertIsNone(GitBlobContentProvider(self.tmp_dir.name + "_", blob_sha1, 5, "key.txt").data)
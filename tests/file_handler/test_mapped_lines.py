@@ -0,0 +1,58 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+from credsweeper.file_handler.mapped_lines import MappedLines
+from credsweeper.utils.util import Util
+
+
+class TestMappedLines(unittest.TestCase):
+
+    def test_open_file_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "test_open_file_p.txt")
+            for data in [
+                    b"first\r\nsecond\rthird\n\n\r\rlast",
+                    b"\n\r\n\r",
+                    "password = 'Ёж'\r\n\ttoken:  x ".encode(),
+                    b"caf\xe9 password\r\nlatin-1",
+            ]:
+                with open(file_path, "wb") as f:
+                    f.write(data)
+                lines = MappedLines.open_file(file_path)
+                self.assertIsInstance(lines, MappedLines)
+                expected = Util.decode_bytes(data)
+                self.assertListEqual(expected, list(lines))
+                self.assertEqual(expected[-1], lines[-1])
+                self.assertListEqual(expected[1:3], lines[1:3])
+                self.assertTrue(all(len(x.strip()) <= y for x, y in zip(expected, lines.sizes)))
+                self.assertListEqual(expected, pickle.loads(pickle.dumps(lines)))
+                for line in expected:
+                    self.assertEqual(expected.index(line), lines.index(line))
+                    if line in expected[1:]:
+                        self.assertEqual(expected.index(line, 1), lines.index(line, 1))
+                with self.assertRaises(ValueError):
+                    lines.index("not in lines")
+                with self.assertRaises(ValueError):
+                    lines.index("\u0416")
+                lines.close()
+
+    def test_open_file_n(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "test_open_file_n.bin")
+            with open(file_path, "wb") as f:
+                f.write(b"\x80\0\0\xff" * 100)
+            self.assertListEqual([], MappedLines.open_file(file_path))
+            with open(file_path, "wb") as f:
+                f.write("password\n".encode("utf_16"))
+            # UTF-16 is decoded with the whole content
+            self.assertIsNone(MappedLines.open_file(file_path))
+            with open(file_path, "wb"):
+                pass
+            self.assertIsNone(MappedLines.open_file(file_path))
+        self.assertIsNone(MappedLines.open_file(os.path.join(tmp_dir, "missing")))
+        lines = MappedLines.open_file(__file__)
+        with self.assertRaises(IndexError):
+            _ = lines[len(lines)]
+        lines.close()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from credsweeper.file_handler.stream_lines import StreamLines
+from credsweeper.utils.util import Util
+
+
+class TestStreamLines(unittest.TestCase):
+
+    def test_open_file_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "test_open_file_p.txt")
+            for data in [
+                    b"first\r\nsecond\rthird\n\n\r\rlast",
+                    b"\n\r\n\r",
+                    "password = 'Ёж'\r\n\ttoken:  x ".encode(),
+                    b"caf\xe9 password\r\nlatin-1\n",
+            ]:
+                with open(file_path, "wb") as f:
+                    f.write(data)
+                lines = StreamLines.open_file(file_path)
+                self.assertIsInstance(lines, StreamLines)
+                expected = Util.decode_bytes(data)
+                self.assertEqual(len(expected), len(lines))
+                self.assertEqual(expected[1], lines[1])
+                self.assertEqual(expected.index(expected[1]), lines.index(expected[1]))
+                self.assertListEqual(expected, list(lines))
+                self.assertEqual(expected[-1], lines[-1])
+                lines.close()
+
+    def test_window_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "test_window_p.txt")
+            lines_count = 10 * StreamLines.BLOCK_SIZE // 100
+            with open(file_path, "w") as f:
+                for i in range(lines_count):
+                    f.write(f"{i:099}\r\n")
+            lines = StreamLines.open_file(file_path)
+            self.assertEqual(1 + lines_count, len(lines))
+            for i in range(0, lines_count, 1000):
+                # look ahead and behind from the current line
+                self.assertEqual(f"{i + StreamLines.LOOK_AHEAD:099}", lines[i + StreamLines.LOOK_AHEAD])
+                if StreamLines.LOOK_BEHIND <= i:
+                    self.assertEqual(f"{i - StreamLines.LOOK_BEHIND:099}", lines[i - StreamLines.LOOK_BEHIND])
+                self.assertEqual(f"{i:099}", lines[i])
+            self.assertEqual("", lines[-1])
+            with self.assertRaises(IndexError):
+                _ = lines[0]
+            with self.assertRaises(ValueError):
+                lines.index(f"{0:099}")
+            lines.close()
+
+    @patch.object(StreamLines, "LINE_LIMIT", 100)
+    def test_long_line_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "test_long_line_p.txt")
+            with open(file_path, "w") as f:
+                f.write(f"first\n{'x' * 1000}password\r\n{'y' * 100}\nlast")
+            lines = StreamLines.open_file(file_path)
+            self.assertEqual(4, len(lines))
+            with self.assertLogs("credsweeper.file_handler.stream_lines", level="WARNING") as logs:
+                self.assertEqual('x' * 100, lines[1])
+            self.assertIn("908 characters are skipped", logs.output[0])
+            # the line of exactly the limit is not cut and the numeration of next lines is kept
+            self.assertEqual('y' * 100, lines[2])
+            self.assertEqual("last", lines[3])
+            lines.close()
+
+    def test_open_file_n(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "test_open_file_n.bin")
+            with open(file_path, "wb") as f:
+                f.write(b"\x80\0\0\xff" * 100)
+            self.assertListEqual([], StreamLines.open_file(file_path))
+            with open(file_path, "wb") as f:
+                f.write("password\n".encode("utf_16"))
+            # UTF-16 is decoded with the whole content
+            self.assertIsNone(StreamLines.open_file(file_path))
+            with open(file_path, "wb"):
+                pass
+            self.assertListEqual([], StreamLines.open_file(file_path))
+        self.assertIsNone(StreamLines.open_file(os.path.join(tmp_dir, "missing")))
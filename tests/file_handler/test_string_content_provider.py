@@ -28,6 +28,23 @@ class TestStringContentProvider(unittest.TestCase):
         self.assertEqual(42, analysis_targets[0].line_num)
         self.assertEqual(-1, analysis_targets[1].line_num)
 
+    def test_analysis_target_lines_p(self) -> None:
+        lines = ["  Line One\t", "password='In_Line_2'"]
+        content_provider = StringContentProvider(lines)
+        target = next(content_provider.yield_analysis_target(0))
+        self.assertFalse(hasattr(target, "__dict__"))
+        self.assertEqual("Line One", target.line_strip)
+        self.assertEqual(8, target.line_strip_len)
+        self.assertEqual("  line one\t", target.line_lower)
+        self.assertEqual("line one", target.line_lower_strip)
+        self.assertIs(target.line_lower, target.line_lower)
+        self.assertEqual(2, target.lines_len)
+        # chunked target keeps own line
+        target = AnalysisTarget(1, lines, [1, 2], DUMMY_DESCRIPTOR, line="In_Line", offset=10)
+        self.assertEqual("in_line", target.line_lower_strip)
+        self.assertEqual(10, target.offset)
+        self.assertEqual(2, target.line_num)
+
     def test_get_analysis_target_n(self) -> None:
         """Negative cases check"""
         # empty list
@@ -1,9 +1,11 @@
 import os
 import tempfile
 import unittest
+from unittest import mock
 
 from credsweeper.file_handler.analysis_target import AnalysisTarget
 from credsweeper.file_handler.descriptor import Descriptor
+from credsweeper.file_handler.mapped_lines import MappedLines
 from credsweeper.file_handler.text_content_provider import TextContentProvider
 from tests import SAMPLES_PATH
 
@@ -75,3 +77,22 @@ class TestTextContentProvider(unittest.TestCase):
         self.assertListEqual([], provider.lines)
         provider.free()
         provider.free()
+
+    def test_mapped_lines_p(self) -> None:
+        target_path = SAMPLES_PATH / "password.patch"
+        expected = [(x.line_pos, x.line) for x in TextContentProvider(target_path).yield_analysis_target(8)]
+        with mock.patch("credsweeper.file_handler.text_content_provider.MIN_MMAP_SIZE", 1):
+            provider = TextContentProvider(target_path)
+            self.assertIsInstance(provider.lines, MappedLines)
+            self.assertListEqual(expected, [(x.line_pos, x.line) for x in provider.yield_analysis_target(8)])
+            provider.free()
+            self.assertNotIn("lines", provider.__dict__)
+
+    def test_stream_lines_p(self) -> None:
+        target_path = SAMPLES_PATH / "password.patch"
+        expected = [(x.line_pos, x.line_num, x.line) for x in TextContentProvider(target_path).yield_analysis_target(8)]
+        with mock.patch("credsweeper.file_handler.text_content_provider.MIN_STREAM_SIZE", 1):
+            provider = TextContentProvider(target_path)
+            targets = [(x.line_pos, x.line_num, x.line) for x in provider.yield_analysis_target(8)]
+            self.assertListEqual(expected, targets)
+            self.assertNotIn("lines", provider.__dict__)
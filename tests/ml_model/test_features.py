@@ -1,3 +1,4 @@
+import copy
 import re
 from unittest import TestCase
 
@@ -5,7 +6,7 @@ from credsweeper.app import APP_PATH
 from credsweeper.common.constants import Severity, MAX_LINE_LENGTH
 from credsweeper.credentials.candidate import Candidate, LineData
 from credsweeper.ml_model.features import SearchInAttribute, WordInPath, MorphemeDense, EntropyEvaluation, \
-    LengthOfAttribute, WordInPreamble, WordInTransition
+    LengthOfAttribute, WordInPreamble, WordInTransition, RuleName, FileExtension
 from credsweeper.ml_model.features.has_html_tag import HasHtmlTag
 from credsweeper.ml_model.features.is_secret_numeric import IsSecretNumeric
 from credsweeper.ml_model.features.word_in_postamble import WordInPostamble
@@ -98,6 +99,24 @@ class TestFeatures(TestCase):
     def test_word_in_path_p(self):
         self.assertListEqual([[1, 1, 0, 0]], WordInPath(["/src", "/path", "small", "the"])([self.candidate]).tolist())
 
+    def test_extract_many_p(self):
+        other_candidate = copy.deepcopy(self.candidate)
+        other_candidate.rule_name = "Password"
+        other_candidate.line_data_list[0].path = "other/main.py"
+        other_candidate.line_data_list[0].file_type = ".PY"
+        other_candidate.line_data_list[0].value = ""
+        candidates = [self.candidate, other_candidate, self.candidate]
+        for feature in [EntropyEvaluation(), LengthOfAttribute("value"), MorphemeDense(), HasHtmlTag()]:
+            expected = [feature([x]).reshape(-1).tolist() for x in candidates]
+            self.assertListEqual(expected, feature.extract_many(candidates).tolist(), feature)
+        for feature in [
+                WordInPath(["/src", "/other", "the"]),
+                FileExtension([".ext", ".py"]),
+                RuleName(["Password", "rule", "Token"])
+        ]:
+            expected = [feature([x])[0].tolist() for x in candidates]
+            self.assertListEqual(expected, feature.extract_many(candidates).tolist(), feature)
+
     def test_word_in_value_empty_n(self):
         self.line_data.value = ""
         self.assertListEqual([[0, 0, 0, 0]], WordInValue(["aaa", "bbb", "ccc", "ddd"]).extract(self.candidate).tolist())
@@ -0,0 +1,35 @@
+import os
+import tempfile
+import unittest
+
+from credsweeper.ml_model.ml_cache import MlCache
+
+
+class TestMlCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp_dir.name, "ml_cache.sqlite")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_ml_cache_p(self):
+        ml_cache = MlCache(self.cache_path, "model:config")
+        self.assertDictEqual({}, ml_cache.get_many(["a", "b"]))
+        ml_cache.put_many({"a": 0.25, "b": 0.999975323677063})
+        ml_cache.close()
+        ml_cache = MlCache(self.cache_path, "model:config")
+        self.assertEqual(2, len(ml_cache))
+        self.assertDictEqual({"a": 0.25, "b": 0.999975323677063}, ml_cache.get_many(["a", "b", "c"]))
+        ml_cache.close()
+
+    def test_ml_cache_n(self):
+        ml_cache = MlCache(self.cache_path, "model:config")
+        ml_cache.put_many({"a": 0.5})
+        ml_cache.close()
+        # other model or config clears the cache
+        ml_cache = MlCache(self.cache_path, "other:config")
+        self.assertEqual(0, len(ml_cache))
+        self.assertDictEqual({}, ml_cache.get_many(["a"]))
+        ml_cache.close()
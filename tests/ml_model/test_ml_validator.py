@@ -1,6 +1,9 @@
 import copy
+import os
 import re
+import tempfile
 import unittest
+from unittest.mock import patch
 from typing import Tuple
 
 import numpy as np
@@ -11,6 +14,7 @@ from credsweeper.config.config import Config
 from credsweeper.credentials.candidate import Candidate
 from credsweeper.credentials.candidate_key import CandidateKey
 from credsweeper.credentials.line_data import LineData
+from credsweeper.ml_model.ml_cache import MlCache
 from credsweeper.ml_model.ml_validator import MlValidator
 from credsweeper.utils.util import Util
 from tests import NEGLIGIBLE_ML_THRESHOLD, AZ_STRING
@@ -126,6 +130,54 @@ class TestMlValidator(unittest.TestCase):
         is_cred_batch, probability_batch = self.ml_validator.validate_groups(sample_as_batch, 2)
         self.assertAlmostEqual(0.9986655712127686, probability_batch[0], delta=NEGLIGIBLE_ML_THRESHOLD)
 
+    def test_validate_groups_ml_cache_p(self):
+        candidate = Candidate.get_dummy_candidate(self.config, "main.py", ".py", "info", "Password")
+        candidate.line_data_list[0].line = 'password="Ahga%$FiQ@Ei8"'
+        candidate.line_data_list[0].variable = "password"
+        candidate.line_data_list[0].value_start = 10
+        candidate.line_data_list[0].value_end = 23
+        candidate.line_data_list[0].value = "Ahga%$FiQ@Ei8"
+        # the same line in other directory has the same model inputs
+        vendored_candidate = copy.deepcopy(candidate)
+        vendored_candidate.line_data_list[0].path = "vendor/lib/main.py"
+        other_candidate = copy.deepcopy(candidate)
+        other_candidate.line_data_list[0].path = "main.txt"
+        other_candidate.line_data_list[0].file_type = ".txt"
+        self.assertEqual(self.ml_validator.get_group_key([candidate]),
+                         self.ml_validator.get_group_key([vendored_candidate]))
+        self.assertNotEqual(self.ml_validator.get_group_key([candidate]),
+                            self.ml_validator.get_group_key([other_candidate]))
+        group_list = [(CandidateKey(x.line_data_list[0]), [x]) for x in [candidate, other_candidate]]
+        expected_decision, expected_probability = self.ml_validator.validate_groups(group_list, 16)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ml_cache = MlCache(os.path.join(tmp_dir, "ml_cache.sqlite"), self.ml_validator.checksum)
+            decision, probability = self.ml_validator.validate_groups(group_list, 16, ml_cache)
+            self.assertListEqual(expected_probability.tolist(), probability.tolist())
+            self.assertEqual(2, len(ml_cache))
+            group_list.append((CandidateKey(vendored_candidate.line_data_list[0]), [vendored_candidate]))
+            with patch.object(MlValidator, "_call_model") as mocked_call_model:
+                decision, probability = self.ml_validator.validate_groups(group_list, 16, ml_cache)
+                mocked_call_model.assert_not_called()
+            self.assertListEqual(expected_probability.tolist() + [expected_probability[0]], probability.tolist())
+            self.assertListEqual(expected_decision.tolist() + [expected_decision[0]], decision.tolist())
+            ml_cache.close()
+
+    def test_predict_p(self):
+        self.assertEqual(16, MlValidator.get_batch_size(1))
+        self.assertEqual(100, MlValidator.get_batch_size(800))
+        self.assertEqual(256, MlValidator.get_batch_size(1 << 20))
+        ml_validator = MlValidator(threshold=ThresholdPreset.medium, ml_threads=1)
+        candidate = Candidate.get_dummy_candidate(self.config, "main.py", ".py", "info", "Password")
+        candidate.line_data_list[0].line = 'password="Ahga%$FiQ@Ei8"'
+        candidate.line_data_list[0].variable = "password"
+        candidate.line_data_list[0].value_start = 10
+        candidate.line_data_list[0].value_end = 23
+        candidate.line_data_list[0].value = "Ahga%$FiQ@Ei8"
+        probability = ml_validator.predict([[candidate]] * 3)
+        self.assertEqual(1, ml_validator.session.get_session_options().intra_op_num_threads)
+        for expected, actual in zip(self.ml_validator.predict([[candidate]] * 3, 2), probability):
+            self.assertAlmostEqual(expected, actual, delta=NEGLIGIBLE_ML_THRESHOLD)
+
     def test_extract_features_n(self):
         candidate1 = Candidate.get_dummy_candidate(self.config, "___.x3", ".x3", "", "")
         candidate1.line_data_list[0].line = ''
@@ -196,6 +248,42 @@ class TestMlValidator(unittest.TestCase):
             self.assertLessEqual(0.0, i)
             self.assertGreaterEqual(1.0, i)
 
+    def test_get_batch_features_p(self):
+        candidate1 = Candidate.get_dummy_candidate(self.config, "main.py", ".py", "info", "Password")
+        candidate1.line_data_list[0].line = '    password="Ahga%$FiQ@Ei8"  # \udcff'
+        candidate1.line_data_list[0].variable = "password"
+        candidate1.line_data_list[0].value_start = 14
+        candidate1.line_data_list[0].value_end = 27
+        candidate1.line_data_list[0].value = "Ahga%$FiQ@Ei8"
+        candidate2 = copy.deepcopy(candidate1)
+        candidate2.rule_name = "Secret"
+        candidate2.line_data_list[0].variable = None
+        candidate3 = Candidate.get_dummy_candidate(self.config, "main.txt", ".txt", "info", "Token")
+        candidate3.line_data_list[0].line = f"token = {AZ_STRING * 10}"
+        candidate3.line_data_list[0].variable = "token"
+        candidate3.line_data_list[0].value_start = 8
+        candidate3.line_data_list[0].value_end = 8 + 10 * len(AZ_STRING)
+        candidate3.line_data_list[0].value = AZ_STRING * 10
+        groups = [[candidate2, candidate1], [candidate3]]
+        batch_features = self.ml_validator.get_batch_features(groups)
+        for n, group in enumerate(groups):
+            group_features = self.ml_validator.get_group_features(group)
+            for batch_input, group_input in zip(batch_features, group_features):
+                self.assertEqual(len(groups), batch_input.shape[0])
+                self.assertListEqual(group_input.tolist(), batch_input[n:n + 1].tolist())
+        self.assertListEqual(
+            self.ml_validator.encode_line(candidate3.line_data_list[0].line, 8).tolist(), batch_features[0][1].tolist())
+        self.assertListEqual(self.ml_validator.encode_value("password").tolist(), batch_features[1][0].tolist())
+
+    def test_encode_many_p(self):
+        texts = [AZ_STRING, None, "", "\xFE\xFF \n\t`\0", "\udcff\U0001F600"]
+        encoded = self.ml_validator.encode_many(texts, MIN_DATA_LEN)
+        self.assertEqual((len(texts), MIN_DATA_LEN, self.ml_validator.num_classes), encoded.shape)
+        for n, text in enumerate(texts):
+            self.assertListEqual(self.ml_validator.encode(text, MIN_DATA_LEN).tolist(), encoded[n].tolist())
+        # unknown characters are encoded with FAKE_CHAR
+        self.assertListEqual([1, 1], np.argmax(encoded[4][:2], axis=1).tolist())
+
     def test_encode_n(self):
         self.assertEqual(0, np.count_nonzero(self.ml_validator.encode(None, 0)))
         self.assertEqual(0, np.count_nonzero(self.ml_validator.encode("", 10)))
@@ -0,0 +1,51 @@
+import unittest
+
+from credsweeper.app import APP_PATH
+from credsweeper.common.constants import Severity
+from credsweeper.config.config import Config
+from credsweeper.rules.rule import Rule
+from credsweeper.scanner.rules_prefilter import RulesPrefilter
+from credsweeper.utils.util import Util
+
+
+class TestRulesPrefilter(unittest.TestCase):
+
+    def setUp(self):
+        config_dict = Util.json_load(APP_PATH / "secret" / "config.json")
+        config_dict["use_filters"] = True
+        config_dict["find_by_ext"] = False
+        config_dict["depth"] = 0
+        config_dict["doc"] = False
+        config_dict["size_limit"] = None
+        config_dict["severity"] = Severity.INFO
+        config = Config(config_dict)
+        self.rules = [Rule(config, x) for x in Util.yaml_load(APP_PATH / "rules" / "config.yaml")]
+
+    def test_get_trie_regex_p(self):
+        self.assertEqual("p(?:ass(?:word)?|w)", RulesPrefilter.get_trie_regex(["pw", "password", "pass"]))
+        self.assertEqual("a(?:bc)?", RulesPrefilter.get_trie_regex(["a", "abc"]))
+        self.assertEqual("\\.", RulesPrefilter.get_trie_regex(["."]))
+
+    def test_rules_prefilter_n(self):
+        prefilter = RulesPrefilter([])
+        self.assertSetEqual(set(), prefilter.get_substrings("password"))
+        self.assertFalse(prefilter.has_substring("password"))
+        self.assertListEqual([], prefilter.get_rules("password"))
+
+    def test_get_substrings_p(self):
+        prefilter = RulesPrefilter(x for x in self.rules if x.rule_name in ("Password", "Secret"))
+        self.assertSetEqual({"pass", "secret"}, prefilter.get_substrings("password_secret"))
+        self.assertSetEqual({"pw", "secret"}, prefilter.get_substrings("secretpw"))
+        self.assertTrue(prefilter.has_substring("password_secret"))
+        self.assertFalse(prefilter.has_substring("nothing"))
+
+    def test_get_rules_p(self):
+        prefilter = RulesPrefilter(self.rules)
+        for line in ["password = 'qwerty'", "PASSWORD = x", "the sword of apiKey", "", "#define AKIA SECRET"]:
+            lower = line.strip().lower()
+            expected = [
+                i for i, rule in enumerate(self.rules)
+                if not rule.has_required_substrings or any(x in lower for x in rule.required_substrings)
+            ]
+            self.assertListEqual(expected, prefilter.get_rules(lower), line)
+            self.assertTrue(prefilter.rules_without_substrings.issubset(prefilter.get_rules(lower)))
@@ -203,6 +203,7 @@ class TestApp(TestCase):
                    " | --git PATH" \
                    ")" \
                    " [--ref REF]" \
+                   " [--blob_cache PATH]" \
                    " [--rules PATH]" \
                    " [--severity SEVERITY]" \
                    " [--config PATH]" \
@@ -217,8 +218,13 @@ class TestApp(TestCase):
                    " [--ml_config PATH]" \
                    " [--ml_model PATH]" \
                    " [--ml_providers STR] " \
+                   " [--ml_cache PATH]" \
+                   " [--ml_threads POSITIVE_INT]" \
                    " [--jobs POSITIVE_INT]" \
                    " [--thrifty | --no-thrifty]" \
+                   " [--incremental PATH]" \
+                   " [--filter_profile PATH]" \
+                   " [--filter_order PATH]" \
                    " [--skip_ignored]" \
                    " [--error | --no-error]" \
                    " [--save-json [PATH]]" \
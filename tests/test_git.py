@@ -272,6 +272,7 @@ class TestGit(unittest.TestCase):
                              path=[self.temp_dir_path],
                              git=None,
                              ref=None,
+                             blob_cache=None,
                              diff_path=None,
                              error=False,
                              json_filename=json_filename,
@@ -281,6 +282,11 @@ class TestGit(unittest.TestCase):
                              sort_output=True,
                              rule_path=None,
                              jobs=1,
+                             incremental=None,
+                             filter_profile=None,
+                             filter_order=None,
+                             ml_cache=None,
+                             ml_threads=None,
                              no_filters=False,
                              log_config_path=None,
                              ml_threshold=0,
@@ -308,6 +314,7 @@ class TestGit(unittest.TestCase):
                              path=None,
                              git=self.temp_dir_path,
                              ref="b7b09c8cdec2904dbb6f77eec2aa6abaef975252",
+                             blob_cache=None,
                              diff_path=None,
                              error=False,
                              json_filename=json_filename,
@@ -317,6 +324,11 @@ class TestGit(unittest.TestCase):
                              sort_output=True,
                              rule_path=None,
                              jobs=1,
+                             incremental=None,
+                             filter_profile=None,
+                             filter_order=None,
+                             ml_cache=None,
+                             ml_threads=None,
                              no_filters=False,
                              log_config_path=None,
                              ml_threshold=0,
@@ -340,3 +352,54 @@ class TestGit(unittest.TestCase):
             self.assertTrue(os.path.exists(full_report_filename))
             full_report = Util.json_load(full_report_filename)
             self.assertLessEqual(1, len(full_report))
+
+    @mock.patch("credsweeper.__main__.get_arguments")
+    def test_git_blob_cache_p(self, mock_get_arguments) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_filename = os.path.join(tmp_dir, "report.json")
+            blob_cache = os.path.join(tmp_dir, "blob.cache")
+            args_mock = Mock(log='warning',
+                             config_path=None,
+                             path=None,
+                             git=self.temp_dir_path,
+                             ref="b7b09c8cdec2904dbb6f77eec2aa6abaef975252",
+                             blob_cache=blob_cache,
+                             diff_path=None,
+                             error=False,
+                             json_filename=json_filename,
+                             xlsx_filename=None,
+                             subtext=False,
+                             hashed=False,
+                             sort_output=True,
+                             rule_path=None,
+                             jobs=1,
+                             incremental=None,
+                             filter_profile=None,
+                             filter_order=None,
+                             ml_cache=None,
+                             ml_threads=None,
+                             no_filters=False,
+                             log_config_path=None,
+                             ml_threshold=0,
+                             ml_batch_size=16,
+                             ml_config=None,
+                             ml_model=None,
+                             ml_providers=None,
+                             depth=0,
+                             doc=False,
+                             size_limit="1G",
+                             find_by_ext=False,
+                             denylist_path=None,
+                             severity=Severity.INFO.value)
+            mock_get_arguments.return_value = args_mock
+            self.assertEqual(EXIT_SUCCESS, app_main.main())
+            self.assertTrue(os.path.exists(blob_cache))
+            full_report_filename = os.path.join(tmp_dir, "report.9d3df94e8257240aa2b98dee47dc17992c0b7476.json")
+            full_report = Util.json_load(full_report_filename)
+            self.assertLessEqual(1, len(full_report))
+            os.remove(full_report_filename)
+            # the blob is known from the cache - no scan but the same report
+            with mock.patch("credsweeper.app.CredSweeper.scan") as mocked_scan:
+                self.assertEqual(EXIT_SUCCESS, app_main.main())
+                mocked_scan.assert_not_called()
+            self.assertListEqual(full_report, Util.json_load(full_report_filename))
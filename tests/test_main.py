@@ -1,12 +1,16 @@
 import io
+import json
 import logging
+import multiprocessing.pool
 import os
+import pickle
 import random
 import shutil
 import string
 import tempfile
 import unittest
 import uuid
+import zipfile
 from argparse import ArgumentTypeError
 from pathlib import Path
 from typing import List, Any, Dict
@@ -25,6 +29,7 @@ from credsweeper.common.constants import ThresholdPreset, Severity, MIN_DATA_LEN
 from credsweeper.file_handler.abstract_provider import AbstractProvider
 from credsweeper.file_handler.files_provider import FilesProvider
 from credsweeper.file_handler.text_content_provider import TextContentProvider
+from credsweeper.ml_model.ml_validator import MlValidator
 from credsweeper.utils.util import Util
 from tests import SAMPLES_FILTERED_COUNT, SAMPLES_POST_CRED_COUNT, SAMPLES_PATH, TESTS_PATH, SAMPLES_IN_DEEP_1, \
     SAMPLES_IN_DEEP_3, SAMPLES_IN_DEEP_2, NEGLIGIBLE_ML_THRESHOLD, AZ_DATA, SAMPLE_HTML, SAMPLE_DOCX, SAMPLE_TAR, \
@@ -158,6 +163,11 @@ class TestMain(unittest.TestCase):
                              hashed=False,
                              rule_path=None,
                              jobs=1,
+                             incremental=None,
+                             filter_profile=None,
+                             filter_order=None,
+                             ml_cache=None,
+                             ml_threads=None,
                              ml_threshold=0.0,
                              ml_batch_size=1,
                              depth=0,
@@ -194,6 +204,11 @@ class TestMain(unittest.TestCase):
                              sort_output=False,
                              rule_path=None,
                              jobs=1,
+                             incremental=None,
+                             filter_profile=None,
+                             filter_order=None,
+                             ml_cache=None,
+                             ml_threads=None,
                              ml_threshold=0.0,
                              ml_batch_size=1,
                              depth=9,
@@ -246,6 +261,11 @@ class TestMain(unittest.TestCase):
                              sort_output=True,
                              rule_path=None,
                              jobs=1,
+                             incremental=None,
+                             filter_profile=None,
+                             filter_order=None,
+                             ml_cache=None,
+                             ml_threads=None,
                              ml_threshold=0,
                              ml_batch_size=16,
                              ml_config=None,
@@ -449,6 +469,152 @@ class TestMain(unittest.TestCase):
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    def test_multi_jobs_fan_out_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "bundle.jar")
+            with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as zf:
+                for i in range(10, 26):
+                    zf.writestr(f"conf/app{i}.properties", f"password = 'Xdj@jcN834b{i}'\n")
+            cred_sweeper = CredSweeper(ml_threshold=0, depth=3)
+            cred_sweeper.run(content_provider=FilesProvider([file_path]))
+            expected = sorted(x.line_data_list[0].info for x in cred_sweeper.credential_manager.get_credentials())
+            self.assertEqual(16, len(expected))
+            cred_sweeper = CredSweeper(ml_threshold=0, depth=3, pool_count=2)
+            cred_sweeper.config.fanout_size = 1
+            with patch('logging.Logger.info') as mocked_logger:
+                cred_sweeper.run(content_provider=FilesProvider([file_path]))
+                # the single archive is scanned in parallel by parts of members
+                mocked_logger.assert_any_call(f"{file_path}: 16 members are split into 16 parts")
+                mocked_logger.assert_any_call("Scan in 2 processes for 16 providers")
+            self.assertListEqual(
+                expected, sorted(x.line_data_list[0].info for x in cred_sweeper.credential_manager.get_credentials()))
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def test_json_stream_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # the report is written after scan because of sorting
+            sorted_json = os.path.join(tmp_dir, "sorted.json")
+            cred_sweeper = CredSweeper(json_filename=sorted_json, sort_output=True, ml_threshold=0)
+            cred_sweeper.run(content_provider=FilesProvider([SAMPLES_PATH]))
+            # the report is written during scan in random order
+            stream_json = os.path.join(tmp_dir, "stream.json")
+            cred_sweeper = CredSweeper(json_filename=stream_json, pool_count=2, ml_threshold=0)
+            cred_sweeper.run(content_provider=FilesProvider([SAMPLES_PATH]))
+            sorted_report = Util.json_load(sorted_json)
+            stream_report = Util.json_load(stream_json)
+            self.assertEqual(SAMPLES_FILTERED_COUNT, len(stream_report))
+            self.assertEqual(cred_sweeper.credential_manager.len_credentials(), len(stream_report))
+            self.assertListEqual(sorted(json.dumps(x) for x in sorted_report),
+                                 sorted(json.dumps(x) for x in stream_report))
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def test_persistent_pool_p(self) -> None:
+        providers = [StringContentProvider([f"password = 'Xdj@jcN834b{i}'"], file_path=f"{i}.txt") for i in range(3)]
+        cred_sweeper = CredSweeper(pool_count=2, ml_threshold=0)
+        with patch("multiprocessing.pool.Pool.__init__", side_effect=multiprocessing.pool.Pool.__init__,
+                   autospec=True) as mocked_pool:
+            with cred_sweeper.persistent_pool():
+                for _ in range(3):
+                    cred_sweeper.credential_manager.clear_credentials()
+                    cred_sweeper.scan(providers)
+                    self.assertEqual(3, cred_sweeper.credential_manager.len_credentials())
+            mocked_pool.assert_called_once()
+        # the pool is not kept after the context
+        with patch("multiprocessing.pool.Pool.__init__", side_effect=multiprocessing.pool.Pool.__init__,
+                   autospec=True) as mocked_pool:
+            cred_sweeper.credential_manager.clear_credentials()
+            cred_sweeper.scan(providers)
+            self.assertEqual(3, cred_sweeper.credential_manager.len_credentials())
+            mocked_pool.assert_called_once()
+
+    def test_parallel_ml_p(self) -> None:
+        providers = [
+            StringContentProvider([f"password = 'Xdj@jcN834b{i}'", f"token = 'Akd{i}8sdjJd83jnxc'"],
+                                  file_path=f"{i}.py") for i in range(8)
+        ]
+        cred_sweeper = CredSweeper(pool_count=2, ml_threshold=0.0001, ml_batch_size=4)
+        cred_sweeper.scan(providers)
+        # the candidates are not sent to the pool processes with the instance
+        self.assertIsNone(pickle.loads(pickle.dumps(cred_sweeper)).credential_manager)
+        with patch("credsweeper.app.MIN_ML_GROUPS_PER_JOB", 4):
+            with patch.object(MlValidator, "predict") as mocked_predict:
+                with cred_sweeper.persistent_pool():
+                    cred_sweeper.post_processing()
+                # 2 shards of 2 batches are processed in the pool processes only
+                mocked_predict.assert_not_called()
+            parallel_result = {
+                (x.line_data_list[0].path, x.line_data_list[0].value): x.ml_probability
+                for x in cred_sweeper.credential_manager.get_credentials()
+            }
+        self.assertEqual(16, len(parallel_result))
+        cred_sweeper = CredSweeper(pool_count=1, ml_threshold=0.0001, ml_batch_size=4)
+        cred_sweeper.scan(providers)
+        cred_sweeper.post_processing()
+        for candidate in cred_sweeper.credential_manager.get_credentials():
+            self.assertAlmostEqual(parallel_result[(candidate.line_data_list[0].path,
+                                                    candidate.line_data_list[0].value)],
+                                   candidate.ml_probability,
+                                   delta=NEGLIGIBLE_ML_THRESHOLD)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def test_incremental_p(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            index_path = os.path.join(tmp_dir, "index.sqlite")
+            data_dir = os.path.join(tmp_dir, "data")
+            os.mkdir(data_dir)
+            for i in range(3):
+                with open(os.path.join(data_dir, f"{i}.txt"), "w") as f:
+                    f.write(f"password = 'Xdj@jcN834b{i}'")
+            content_provider = FilesProvider([data_dir])
+            cred_sweeper = CredSweeper(ml_threshold=0, incremental=index_path)
+            with patch.object(CredSweeper, "scan", side_effect=cred_sweeper.scan) as mocked_scan:
+                self.assertEqual(3, cred_sweeper.run(content_provider=content_provider))
+                self.assertEqual(3, len(mocked_scan.call_args.args[0]))
+            # nothing to scan - all candidates are from the index
+            with patch.object(CredSweeper, "scan", side_effect=cred_sweeper.scan) as mocked_scan:
+                self.assertEqual(3, cred_sweeper.run(content_provider=content_provider))
+                mocked_scan.assert_not_called()
+            with open(os.path.join(data_dir, "1.txt"), "w") as f:
+                f.write("password = 'Xdj@jcN834bX' # changed")
+            with patch.object(CredSweeper, "scan", side_effect=cred_sweeper.scan) as mocked_scan:
+                self.assertEqual(3, cred_sweeper.run(content_provider=content_provider))
+                self.assertEqual(1, len(mocked_scan.call_args.args[0]))
+            self.assertSetEqual({"Xdj@jcN834b0", "Xdj@jcN834bX", "Xdj@jcN834b2"},
+                                set(x.line_data_list[0].value
+                                    for x in cred_sweeper.credential_manager.get_credentials()))
+            # other config invalidates the index
+            cred_sweeper = CredSweeper(ml_threshold=0, incremental=index_path, depth=1)
+            with patch.object(CredSweeper, "scan", side_effect=cred_sweeper.scan) as mocked_scan:
+                self.assertEqual(3, cred_sweeper.run(content_provider=content_provider))
+                self.assertEqual(3, len(mocked_scan.call_args.args[0]))
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def test_get_scan_batches_p(self) -> None:
+        providers = [ByteContentProvider(b'x' * 1000, file_path="huge")]
+        providers.extend(ByteContentProvider(b'x' * 10, file_path=f"tiny_{i}") for i in range(50))
+        providers.append(TextContentProvider(("memory", io.BytesIO(b'x' * 500))))
+        self.assertEqual(500, providers[-1].data_size)
+        batches = CredSweeper.get_scan_batches(providers, 2)
+        # the largest providers are scheduled first and each of them in own batch
+        self.assertEqual(["huge"], [x.file_path for x in batches[0]])
+        self.assertEqual(["memory"], [x.file_path for x in batches[1]])
+        self.assertLess(2 * 2, len(batches))
+        self.assertListEqual(sorted(x.file_path for x in providers), sorted(y.file_path for x in batches for y in x))
+
+    def test_get_scan_batches_n(self) -> None:
+        self.assertListEqual([], CredSweeper.get_scan_batches([], 3))
+        # providers without size estimation are split by count
+        providers = [StringContentProvider([]) for _ in range(100)]
+        batches = CredSweeper.get_scan_batches(providers, 3)
+        self.assertEqual(20, len(batches))
+        self.assertTrue(all(5 == len(x) for x in batches))
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
     def test_find_by_ext_n(self) -> None:
         # test for finding files by extension
         with tempfile.TemporaryDirectory() as tmp_dir:
@@ -557,7 +723,7 @@ class TestMain(unittest.TestCase):
             with patch('logging.Logger.error') as mocked_logger:
                 cred_sweeper.run(content_provider=content_provider)
                 mocked_logger.assert_called_with(
-                    f"{test_filename}:Compressed data ended before the end-of-stream marker was reached")
+                    f"{test_filename}:Compressed file ended before the end-of-stream marker was reached")
             self.assertEqual(0, cred_sweeper.credential_manager.len_credentials())
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
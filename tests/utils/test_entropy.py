@@ -0,0 +1,35 @@
+import math
+import string
+import unittest
+
+from credsweeper.utils.entropy import Entropy
+from tests import AZ_STRING
+
+
+class TestEntropy(unittest.TestCase):
+
+    def test_get_shannon_entropy_n(self):
+        self.assertEqual(0, Entropy.get_shannon_entropy(""))
+        self.assertEqual(0, Entropy.get_shannon_entropy(b""))
+        self.assertEqual(0, Entropy.get_shannon_entropy("x" * 10000))
+        self.assertEqual(0, Entropy.get_shannon_entropy_by_counts([], 0))
+
+    def test_get_shannon_entropy_p(self):
+        self.assertEqual(math.log2(99), Entropy.get_shannon_entropy(string.printable[1:]))
+        self.assertEqual(2.0, Entropy.get_shannon_entropy(b"\0\1\2\3"))
+        self.assertAlmostEqual(4.431965045349459, Entropy.get_shannon_entropy(AZ_STRING), delta=1e-12)
+        # the tables are not used for long data
+        long_data = string.digits * Entropy.TABLE_SIZE
+        self.assertAlmostEqual(math.log2(10), Entropy.get_shannon_entropy(long_data), delta=1e-12)
+        self.assertListEqual([0., 1., math.log2(10)], Entropy.get_shannon_entropy_many(["", "01", string.digits]))
+
+    def test_get_renyi_entropy_p(self):
+        counts = Entropy.get_counts("aabc")
+        self.assertListEqual([2, 1, 1], sorted(counts, reverse=True))
+        # all orders of entropy are equal to hartley entropy for uniform distribution
+        self.assertAlmostEqual(4.0, Entropy.get_renyi_entropy_by_counts([1] * 16, 16, 0.5), delta=1e-12)
+        self.assertAlmostEqual(4.0, Entropy.get_renyi_entropy_by_counts([1] * 16, 16, 2), delta=1e-12)
+        # collision entropy is less than shannon entropy for non-uniform distribution
+        self.assertLess(Entropy.get_renyi_entropy_by_counts(counts, 4, 2), Entropy.get_shannon_entropy("aabc"))
+        self.assertLess(Entropy.get_shannon_entropy("aabc"), Entropy.get_renyi_entropy_by_counts(counts, 4, 0.5))
+        self.assertEqual(0, Entropy.get_renyi_entropy_by_counts([], 0, 2))
@@ -0,0 +1,48 @@
+import unittest
+
+from credsweeper.utils.sniffer import Sniffer
+
+
+class TestSniffer(unittest.TestCase):
+
+    def test_is_patch_p(self):
+        self.assertTrue(Sniffer.is_patch(b"diff --git a/x b/x\n--- a/x\n+++ b/x\n@@ -1 +1 @@\n-a\n+b\n"))
+        self.assertTrue(Sniffer.is_patch(b"From: dummy\r\n--- a/x\t2024\r\n"))
+        self.assertTrue(Sniffer.is_patch("diff".encode("utf_16")))
+
+    def test_is_patch_n(self):
+        self.assertFalse(Sniffer.is_patch(b"@@ -1 +1 @@\n-a\n+b\n"))
+        self.assertFalse(Sniffer.is_patch(b"the different line\n---\n"))
+
+    def test_is_base64_p(self):
+        self.assertTrue(Sniffer.is_base64(b"\t12345\r\n\t67890  ==\n"))
+        self.assertTrue(Sniffer.is_base64(b"QUtJQTBPTjdW\\nMkRSNTdQTDNKWE0-_"))
+
+    def test_is_base64_n(self):
+        self.assertFalse(Sniffer.is_base64(b"MY PASSWORD IS!"))
+        self.assertFalse(Sniffer.is_base64("QUtJQTBPTjdW ".encode()))
+
+    def test_is_yaml_p(self):
+        self.assertTrue(Sniffer.is_yaml("# comment\n---\nkey: value\nnext: value\n"))
+        self.assertTrue(Sniffer.is_yaml("%YAML 1.2\n--- - item\n"))
+        self.assertTrue(Sniffer.is_yaml("key:\n  value\n"))
+        self.assertTrue(Sniffer.is_yaml("key: 'multi\nline'\n"))
+        self.assertTrue(Sniffer.is_yaml("\ufeffkey: value"))
+
+    def test_is_yaml_n(self):
+        self.assertFalse(Sniffer.is_yaml(""))
+        self.assertFalse(Sniffer.is_yaml("# comment only\n\n"))
+        self.assertFalse(Sniffer.is_yaml("plain text\nkey: value\n"))
+        self.assertFalse(Sniffer.is_yaml("/* SPDX-License-Identifier: MIT */\n#include <x.h>\nint x;\n"))
+
+    def test_get_structure_formats_p(self):
+        self.assertListEqual([Sniffer.JSON, Sniffer.NDJSON], Sniffer.get_structure_formats(' {"key": "value"}'))
+        self.assertListEqual([Sniffer.NDJSON, Sniffer.PYTHON, Sniffer.YAML],
+                             Sniffer.get_structure_formats('"a"\n{"key": "value"}\n{"key": "value"}\n\n'))
+        self.assertListEqual([Sniffer.PYTHON, Sniffer.YAML],
+                             Sniffer.get_structure_formats("a: 'b'\nc: 'd'\ne: 'f'\ng: 'h'\n"))
+
+    def test_get_structure_formats_n(self):
+        self.assertListEqual([], Sniffer.get_structure_formats(""))
+        self.assertListEqual([], Sniffer.get_structure_formats("key: value"))
+        self.assertListEqual([Sniffer.PYTHON], Sniffer.get_structure_formats("int main() {\n\n\n\"x\";\n}\n"))
@@ -12,7 +12,7 @@ from xmlrpc.client import MAXINT
 from lxml.etree import XMLSyntaxError
 
 from credsweeper.common.constants import Chars, DEFAULT_ENCODING, UTF_8, MAX_LINE_LENGTH, CHUNK_STEP_SIZE, CHUNK_SIZE, \
-    OVERLAP_SIZE, UTF_16
+    OVERLAP_SIZE, UTF_16, LATIN_1, ASCII
 from credsweeper.utils.util import Util
 from tests import AZ_DATA, AZ_STRING, SAMPLES_PATH
 
@@ -190,10 +190,10 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(3.321928094887362, Util.get_shannon_entropy(string.ascii_uppercase[:10]))
         self.assertEqual(6.0, Util.get_shannon_entropy(Chars.BASE64STD_CHARS.value))
         self.assertEqual(6.0, Util.get_shannon_entropy(Chars.BASE64URL_CHARS.value))
-        self.assertEqual(6.0223678130284535, Util.get_shannon_entropy(Chars.BASE64URLPAD_CHARS.value))
+        self.assertEqual(6.022367813028454, Util.get_shannon_entropy(Chars.BASE64URLPAD_CHARS.value))
         self.assertEqual(6.643856189774724, Util.get_shannon_entropy(string.printable))
-        self.assertEqual(6.62935662007961, Util.get_shannon_entropy(string.printable[:-1]))
-        self.assertEqual(6.62935662007961, Util.get_shannon_entropy(string.printable[1:]))
+        self.assertEqual(6.6293566200796095, Util.get_shannon_entropy(string.printable[:-1]))
+        self.assertEqual(6.6293566200796095, Util.get_shannon_entropy(string.printable[1:]))
 
     def test_util_read_file_n(self):
         with tempfile.TemporaryDirectory() as tmp_dir:
@@ -370,6 +370,21 @@ class TestUtils(unittest.TestCase):
             assert 0 < len(read_lines)
             assert read_lines == test_lines
 
+    def test_decode_text_p(self):
+        self.assertEqual(AZ_STRING, Util.decode_text(AZ_DATA))
+        self.assertEqual(self.DEUTSCH_PANGRAM, Util.decode_text(self.DEUTSCH_PANGRAM.encode(UTF_8)))
+        self.assertEqual(self.DEUTSCH_PANGRAM, Util.decode_text(self.DEUTSCH_PANGRAM.encode(UTF_16)))
+        self.assertEqual(self.DEUTSCH_PANGRAM, Util.decode_text(self.DEUTSCH_PANGRAM.encode(LATIN_1)))
+        self.assertEqual(AZ_STRING, Util.decode_text(AZ_DATA, [ASCII]))
+
+    def test_decode_text_n(self):
+        # UTF-16 requires BOM
+        self.assertIsNone(Util.decode_text(self.DEUTSCH_PANGRAM.encode("utf_16_le"), [UTF_16]))
+        # binary data is not decoded even if it looks like UTF-16
+        self.assertIsNone(Util.decode_text(b"\0\0\x81\x82\x83\x84"))
+        self.assertIsNone(Util.decode_text(b"\xdca", [UTF_16]))
+        self.assertIsNone(Util.decode_text(self.DEUTSCH_PANGRAM.encode(LATIN_1), [UTF_8, ASCII]))
+
     def test_is_known_p(self):
         # 00000000  7f 45 4c 46 02 01 01 00  00 00 00 00 00 00 00 00  |.ELF............|
         data = bytearray(b"\x7fELF\x02\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00")